@@ -0,0 +1 @@
+# Reproducible performance benchmarks against local page corpora
\ No newline at end of file
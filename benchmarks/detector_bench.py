@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark and regression gate for VideoFormatDetector.detect_streaming_platform.
+
+Reports pages/s and peak bytes allocated per page (tracemalloc) over a fixture
+corpus. Throughput is also expressed relative to html.parser on the same
+pages, which keeps the baseline comparable across machines; the gate fails
+(exit status 1) when that relative throughput drops below the baseline by
+more than the tolerance.
+"""
+import sys
+import os
+import argparse
+import json
+import platform
+import time
+import tracemalloc
+from datetime import datetime
+from typing import Dict, Any, List, Tuple
+
+# Add src to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from bs4 import BeautifulSoup
+
+from src.utils.helpers import VideoFormatDetector
+from benchmarks.fixtures import SyntheticCorpus, DirectoryCorpus
+
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(__file__), 'baselines', 'detector.json')
+
+
+def load_pages(corpus, count: int) -> List[Tuple[str, bytes]]:
+    """First count hearing pages of a corpus (all pages for captured corpora)."""
+    urls = corpus.hearing_urls() if hasattr(corpus, 'hearing_urls') else corpus.urls()
+    pages = []
+    for url in urls:
+        if len(pages) >= count:
+            break
+        pages.append((url, corpus.get(url)))
+    return pages
+
+
+def time_best(func, repeat: int) -> float:
+    """Best wall time of repeat runs."""
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def measure_allocations(soups: List[BeautifulSoup], urls: List[str]) -> Dict[str, float]:
+    """Mean peak and retained bytes allocated by one detector call."""
+    peak_total = 0
+    retained_total = 0
+    tracemalloc.start()
+    try:
+        for soup, url in zip(soups, urls):
+            before, _ = tracemalloc.get_traced_memory()
+            tracemalloc.reset_peak()
+            formats = VideoFormatDetector.detect_streaming_platform(soup, url)
+            current, peak = tracemalloc.get_traced_memory()
+            peak_total += peak - before
+            retained_total += current - before
+            del formats
+    finally:
+        tracemalloc.stop()
+    return {
+        'peak_bytes_per_page': round(peak_total / len(soups), 1),
+        'retained_bytes_per_page': round(retained_total / len(soups), 1),
+    }
+
+
+def run(pages: List[Tuple[str, bytes]], repeat: int) -> Dict[str, Any]:
+    """Benchmark the detector over pre-parsed pages."""
+    urls = [url for url, _ in pages]
+    contents = [content for _, content in pages]
+    soups = [BeautifulSoup(content, 'html.parser') for content in contents]
+
+    def detect_all():
+        for soup, url in zip(soups, urls):
+            VideoFormatDetector.detect_streaming_platform(soup, url)
+
+    def parse_all():
+        for content in contents:
+            BeautifulSoup(content, 'html.parser')
+
+    detect_seconds = time_best(detect_all, repeat)
+    parse_seconds = time_best(parse_all, repeat)
+    formats = sum(len(VideoFormatDetector.detect_streaming_platform(s, u)) for s, u in zip(soups, urls))
+
+    return {
+        'pages': len(pages),
+        'formats_found': formats,
+        'pages_per_second': round(len(pages) / detect_seconds, 1),
+        'us_per_page': round(1e6 * detect_seconds / len(pages), 2),
+        'parse_pages_per_second': round(len(pages) / parse_seconds, 1),
+        'relative_throughput': round(parse_seconds / detect_seconds, 3),
+        **measure_allocations(soups, urls),
+    }
+
+
+def check_regression(result: Dict[str, Any], baseline: Dict[str, Any], tolerance: float) -> List[str]:
+    """Return failure messages when throughput fell more than tolerance below the baseline."""
+    failures = []
+    floor = baseline['relative_throughput'] * (1 - tolerance)
+    if result['relative_throughput'] < floor:
+        failures.append(
+            f"relative throughput {result['relative_throughput']:.3f} is below "
+            f"{floor:.3f} (baseline {baseline['relative_throughput']:.3f} - {tolerance:.0%})"
+        )
+    # Same corpus, different answers: the speed comparison is meaningless
+    if result['pages'] == baseline.get('pages') and result['formats_found'] != baseline.get('formats_found'):
+        failures.append(
+            f"detected {result['formats_found']} formats, baseline found {baseline['formats_found']}"
+        )
+    return failures
+
+
+def main():
+    """Run the detector benchmark and optionally gate on the baseline."""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--pages', type=int, default=500, help='hearing pages to benchmark')
+    parser.add_argument('--corpus', help='directory of captured pages (index.json) instead of synthetic pages')
+    parser.add_argument('--repeat', type=int, default=5, help='timed runs; the best is reported')
+    parser.add_argument('--baseline', default=DEFAULT_BASELINE, help='baseline JSON file')
+    parser.add_argument('--tolerance', type=float, default=0.2, help='allowed fractional throughput drop')
+    parser.add_argument('--check', action='store_true', help='exit 1 if throughput regressed against the baseline')
+    parser.add_argument('--update-baseline', action='store_true', help='write this run as the new baseline')
+    args = parser.parse_args()
+
+    corpus = DirectoryCorpus(args.corpus) if args.corpus else SyntheticCorpus(pages=max(args.pages * 2, 1000))
+    result = run(load_pages(corpus, args.pages), args.repeat)
+
+    print(f"Detector: {result['pages']} pages, {result['formats_found']} formats")
+    print(f"  {result['pages_per_second']:>10.1f} pages/s ({result['us_per_page']} us/page)")
+    print(f"  {result['relative_throughput']:>10.3f} x html.parser throughput")
+    print(f"  {result['peak_bytes_per_page'] / 1024:>10.1f} KiB peak allocated per page, "
+          f"{result['retained_bytes_per_page'] / 1024:.1f} KiB retained")
+
+    if args.update_baseline:
+        os.makedirs(os.path.dirname(os.path.abspath(args.baseline)), exist_ok=True)
+        with open(args.baseline, 'w') as f:
+            json.dump({**result, 'timestamp': datetime.now().isoformat(),
+                       'python': platform.python_version()}, f, indent=2)
+            f.write('\n')
+        print(f"Baseline written to {args.baseline}")
+        return
+
+    if not os.path.exists(args.baseline):
+        print(f"No baseline at {args.baseline}")
+        sys.exit(1 if args.check else 0)
+
+    with open(args.baseline, 'r') as f:
+        baseline = json.load(f)
+    failures = check_regression(result, baseline, args.tolerance)
+    for failure in failures:
+        print(f"REGRESSION: {failure}")
+    if not failures:
+        print(f"OK: within {args.tolerance:.0%} of baseline ({baseline['relative_throughput']:.3f})")
+    if failures and args.check:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,252 @@
+"""
+Page corpora for benchmarks: synthetic committee/hearing sites or captured pages.
+
+The synthetic corpus mirrors the structure the scrapers walk (chamber listing,
+committee sites, subcommittee pages, hearing pages with a mix of players) and
+is generated deterministically from the URL, so 10k-page corpora cost no
+memory until a page is requested. HLS and DASH manifests referenced by the
+players are served too, so manifest analysis is exercised.
+"""
+import hashlib
+import json
+import os
+import random
+from typing import Dict, Iterator, List, Optional, Tuple
+
+
+HOUSE_LISTING_URL = 'http://www.house.gov/committees'
+SENATE_LISTING_URL = 'http://www.senate.gov/committees/'
+STREAM_HOST = 'stream.example.gov'
+
+# Committee topics; none contain words the House listing filter skips ('home', 'view', ...)
+TOPICS = [
+    'Agriculture', 'Appropriations', 'Armed Services', 'Budget', 'Education and Workforce',
+    'Energy and Commerce', 'Ethics', 'Financial Services', 'Foreign Affairs', 'Climate Crisis',
+    'Administration', 'Judiciary', 'Natural Resources', 'Oversight', 'Rules', 'Science, Space, and Technology',
+    'Small Business', 'Transportation and Infrastructure', 'Veterans Affairs', 'Ways and Means', 'Intelligence',
+]
+
+# (weight, template) for the player embedded on a hearing page
+PLAYER_VARIANTS: List[Tuple[int, str]] = [
+    (30, '<iframe width="640" height="360" src="https://www.youtube.com/embed/{vid}" allowfullscreen></iframe>'),
+    (10, '<iframe src="https://player.vimeo.com/video/{num}" width="640" height="360"></iframe>'),
+    (10, '<video controls src="http://media.example.gov/hearings/{vid}.mp4"></video>'),
+    (20, '<div id="player"></div><script>jwplayer("player").setup({{"file": '
+         '"http://stream.example.gov/live/{vid}/playlist.m3u8", "width": "100%", "aspectratio": "16:9", '
+         '"tracks": [{{"file": "/captions/{vid}.vtt", "kind": "captions"}}]}});</script>'),
+    (10, '<video id="vjs-{vid}" class="video-js"></video><script>var player = videojs("vjs-{vid}", '
+         '{{"sources": [{{"src": "http://stream.example.gov/{vid}/manifest.mpd", "type": "application/dash+xml"}}]}});'
+         '</script>'),
+    (5, '<iframe src="https://video.example.gov/embed/{vid}"></iframe>'),
+    (15, '<p>Video will be available after the hearing.</p>'),
+]
+
+_NAV_LINKS = ''.join(
+    f'<li><a href="/about/{topic.lower().replace(" ", "-")}">About {topic}</a></li>' for topic in TOPICS
+)
+
+HLS_MASTER = (
+    '#EXTM3U\n'
+    '#EXT-X-STREAM-INF:BANDWIDTH=800000,RESOLUTION=640x360,CODECS="avc1.4d401e,mp4a.40.2"\n360p.m3u8\n'
+    '#EXT-X-STREAM-INF:BANDWIDTH=2800000,RESOLUTION=1280x720,CODECS="avc1.4d401f,mp4a.40.2"\n720p.m3u8\n'
+)
+
+HLS_MEDIA = (
+    '#EXTM3U\n#EXT-X-VERSION:3\n#EXT-X-TARGETDURATION:6\n'
+    + ''.join(f'#EXTINF:6.0,\nseg{i}.ts\n' for i in range(20))
+    + '#EXT-X-ENDLIST\n'
+)
+
+DASH_MPD = (
+    '<?xml version="1.0"?><MPD xmlns="urn:mpeg:dash:schema:mpd:2011" type="static" '
+    'mediaPresentationDuration="PT2H0M0S"><Period><AdaptationSet mimeType="video/mp4">'
+    '<Representation id="v1" bandwidth="2500000" width="1280" height="720" codecs="avc1.64001f"/>'
+    '</AdaptationSet><AdaptationSet mimeType="audio/mp4">'
+    '<Representation id="a1" bandwidth="128000" codecs="mp4a.40.2"/></AdaptationSet></Period></MPD>'
+)
+
+# Typical inline analytics/bundle script that detectors must skip over
+_BUNDLE_SCRIPT = '<script>' + ''.join(
+    f'function m{i}(a,b){{return a.filter(function(x){{return x.k!==b&&x.v>{i}}}).map(String)}};'
+    for i in range(400)
+) + '</script>'
+
+
+def _rng(url: str) -> random.Random:
+    """Deterministic random generator for a URL."""
+    return random.Random(int.from_bytes(hashlib.blake2b(url.encode('utf-8'), digest_size=8).digest(), 'big'))
+
+
+def _page(title: str, body: str, rng: random.Random) -> bytes:
+    """Wrap body content in a realistic page shell."""
+    filler = ''.join(
+        f'<p>{" ".join(rng.choice(TOPICS) for _ in range(12))}.</p>' for _ in range(rng.randint(10, 30))
+    )
+    return (
+        f'<!DOCTYPE html><html><head><title>{title}</title>'
+        f'<meta name="viewport" content="width=device-width">{_BUNDLE_SCRIPT}</head>'
+        f'<body><header><nav><ul>{_NAV_LINKS}</ul></nav></header>'
+        f'<main><h1>{title}</h1>{body}{filler}</main>'
+        f'<footer><a href="/privacy">Privacy</a> <a href="/accessibility">Accessibility</a></footer>'
+        f'</body></html>'
+    ).encode('utf-8')
+
+
+class SyntheticCorpus:
+    """Deterministic synthetic House and Senate sites sized to roughly ``pages`` pages."""
+
+    def __init__(self, pages: int = 1000, committees_per_chamber: int = 20,
+                 subcommittees_per_committee: int = 3):
+        """Size the sites so listing, committee, subcommittee and hearing pages total ~pages."""
+        self.committees_per_chamber = committees_per_chamber
+        self.subcommittees_per_committee = subcommittees_per_committee
+        committees = 2 * committees_per_chamber
+        sites = committees * (1 + subcommittees_per_committee)
+        self.hearings_per_site = max(1, (pages - 2 - sites) // sites)
+
+    @property
+    def page_count(self) -> int:
+        """Total number of distinct pages in the corpus."""
+        sites = 2 * self.committees_per_chamber * (1 + self.subcommittees_per_committee)
+        return 2 + sites * (1 + self.hearings_per_site)
+
+    def committee_url(self, chamber: str, index: int) -> str:
+        """URL of a committee site."""
+        return f'http://c{index}.{chamber}.gov/'
+
+    def hearing_urls(self) -> Iterator[str]:
+        """Every hearing page URL."""
+        for chamber in ('house', 'senate'):
+            for c in range(self.committees_per_chamber):
+                base = self.committee_url(chamber, c)
+                for site in [''] + [f'subcommittees/s{s}/' for s in range(self.subcommittees_per_committee)]:
+                    for h in range(self.hearings_per_site):
+                        yield f'{base}{site}hearings/h{h}'
+
+    def urls(self) -> Iterator[str]:
+        """Every page URL in the corpus."""
+        yield HOUSE_LISTING_URL
+        yield SENATE_LISTING_URL
+        for chamber in ('house', 'senate'):
+            for c in range(self.committees_per_chamber):
+                base = self.committee_url(chamber, c)
+                yield base
+                for s in range(self.subcommittees_per_committee):
+                    yield f'{base}subcommittees/s{s}/'
+        yield from self.hearing_urls()
+
+    def get(self, url: str) -> Optional[bytes]:
+        """Render the page at url, or None if it is not part of the corpus."""
+        rng = _rng(url)
+        if url == HOUSE_LISTING_URL:
+            return self._house_listing(rng)
+        if url == SENATE_LISTING_URL:
+            return self._senate_listing(rng)
+
+        host, _, path = url.partition('://')[2].partition('/')
+        if host == STREAM_HOST:
+            return self._manifest(path)
+        labels = host.split('.')
+        if len(labels) != 3 or not labels[0].startswith('c') or labels[1] not in ('house', 'senate'):
+            return None
+        committee = int(labels[0][1:])
+        if committee >= self.committees_per_chamber:
+            return None
+
+        parts = [p for p in path.split('/') if p]
+        if not parts:
+            return self._site(url, f'Committee {committee}', rng, with_subcommittees=True)
+        if parts[0] == 'subcommittees' and len(parts) == 2:
+            if int(parts[1][1:]) >= self.subcommittees_per_committee:
+                return None
+            return self._site(url, f'Subcommittee {parts[1]}', rng, with_subcommittees=False)
+        if parts[-2:-1] == ['hearings'] and int(parts[-1][1:]) < self.hearings_per_site:
+            return self._hearing(url, rng)
+        return None
+
+    def _manifest(self, path: str) -> Optional[bytes]:
+        if path.endswith('/playlist.m3u8'):
+            return HLS_MASTER.encode('utf-8')
+        if path.endswith('.m3u8'):
+            return HLS_MEDIA.encode('utf-8')
+        if path.endswith('.mpd'):
+            return DASH_MPD.encode('utf-8')
+        return None
+
+    def _house_listing(self, rng: random.Random) -> bytes:
+        links = ''.join(
+            f'<li><a href="{self.committee_url("house", c)}">{TOPICS[c % len(TOPICS)]} Committee {c}</a></li>'
+            for c in range(self.committees_per_chamber)
+        )
+        return _page('Committees', f'<ul class="committees">{links}</ul>', rng)
+
+    def _senate_listing(self, rng: random.Random) -> bytes:
+        rows = ''.join(
+            f'<tr><td><a href="{self.committee_url("senate", c)}">{TOPICS[c % len(TOPICS)]} Committee {c}</a></td>'
+            f'<td><a href="/senators/chair{c}">Chair {c}</a></td><td><a href="/senators/rank{c}">Ranking {c}</a></td></tr>'
+            for c in range(self.committees_per_chamber)
+        )
+        return _page('Committees', f'<table><tr><th>Committee</th><th>Chair</th><th>Ranking</th></tr>{rows}</table>', rng)
+
+    def _site(self, url: str, title: str, rng: random.Random, with_subcommittees: bool) -> bytes:
+        links = []
+        if with_subcommittees:
+            links.extend(
+                f'<li><a href="{url}subcommittees/s{s}/">Subcommittee on {rng.choice(TOPICS)}</a></li>'
+                for s in range(self.subcommittees_per_committee)
+            )
+        links.extend(
+            f'<li><a href="{url}hearings/h{h}">Hearing on {rng.choice(TOPICS)} '
+            f'{rng.randint(1, 12):02d}/{rng.randint(1, 28):02d}/2025</a></li>'
+            for h in range(self.hearings_per_site)
+        )
+        return _page(title, f'<ul>{"".join(links)}</ul>', rng)
+
+    def _hearing(self, url: str, rng: random.Random) -> bytes:
+        template = rng.choices([t for _, t in PLAYER_VARIANTS], weights=[w for w, _ in PLAYER_VARIANTS])[0]
+        vid = hashlib.md5(url.encode('utf-8')).hexdigest()[:11]
+        player = template.format(vid=vid, num=rng.randint(10**8, 10**9))
+        return _page(f'Hearing {url.rsplit("/", 1)[-1]}', f'<section class="hearing">{player}</section>', rng)
+
+
+class DirectoryCorpus:
+    """Captured pages on disk, listed in an ``index.json`` of URL -> file name."""
+
+    def __init__(self, root: str):
+        """Load the index of a captured corpus."""
+        self.root = root
+        with open(os.path.join(root, 'index.json'), 'r') as f:
+            self.index: Dict[str, str] = json.load(f)
+
+    @property
+    def page_count(self) -> int:
+        """Number of captured pages."""
+        return len(self.index)
+
+    def urls(self) -> Iterator[str]:
+        """Every captured URL."""
+        return iter(self.index)
+
+    def get(self, url: str) -> Optional[bytes]:
+        """Read a captured page."""
+        name = self.index.get(url)
+        if name is None:
+            return None
+        with open(os.path.join(self.root, name), 'rb') as f:
+            return f.read()
+
+
+def write_corpus(corpus, root: str, limit: Optional[int] = None) -> int:
+    """Materialise a corpus as a DirectoryCorpus (e.g. to pin fixtures); returns the page count."""
+    os.makedirs(root, exist_ok=True)
+    index = {}
+    for i, url in enumerate(corpus.urls()):
+        if limit is not None and i >= limit:
+            break
+        name = f'{i:06d}.html'
+        with open(os.path.join(root, name), 'wb') as f:
+            f.write(corpus.get(url))
+        index[url] = name
+    with open(os.path.join(root, 'index.json'), 'w') as f:
+        json.dump(index, f, indent=2)
+    return len(index)
@@ -0,0 +1,100 @@
+"""
+Local mock HTTP server that serves a page corpus with configurable latency.
+
+The server behaves as a plain HTTP forward proxy: scrapers keep requesting
+the corpus' absolute URLs (``http://c0.house.gov/...``) and the session's
+``proxies`` send every request here, so scraper code runs unmodified.
+"""
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict
+
+
+class _CorpusHandler(BaseHTTPRequestHandler):
+    """Answer GETs from the server's corpus."""
+
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self):
+        """Serve one page (or 404) after the configured delay."""
+        server = self.server
+        url = self.path if '://' in self.path else f"http://{self.headers.get('Host', 'localhost')}{self.path}"
+
+        delay = server.latency + (random.uniform(0, server.jitter) if server.jitter else 0.0)
+        if delay > 0:
+            time.sleep(delay)
+
+        body = server.corpus.get(url)
+        with server.stats_lock:
+            server.stats['requests'] += 1
+            if body is None:
+                server.stats['not_found'] += 1
+            else:
+                server.stats['bytes'] += len(body)
+
+        if body is None:
+            body = b'Not Found'
+            self.send_response(404)
+        else:
+            self.send_response(200)
+        self.send_header('Content-Type', 'text/html; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        """Keep benchmark output quiet."""
+        pass
+
+
+class MockServer:
+    """Threaded corpus server; use as a context manager."""
+
+    def __init__(self, corpus, latency: float = 0.0, jitter: float = 0.0, host: str = '127.0.0.1', port: int = 0):
+        """Serve corpus.get(url) with latency + uniform(0, jitter) seconds of delay per request."""
+        self.httpd = ThreadingHTTPServer((host, port), _CorpusHandler)
+        self.httpd.daemon_threads = True
+        self.httpd.corpus = corpus
+        self.httpd.latency = latency
+        self.httpd.jitter = jitter
+        self.httpd.stats = {'requests': 0, 'not_found': 0, 'bytes': 0}
+        self.httpd.stats_lock = threading.Lock()
+        self._thread = None
+
+    @property
+    def url(self) -> str:
+        """Base URL of the server."""
+        host, port = self.httpd.server_address[:2]
+        return f'http://{host}:{port}'
+
+    @property
+    def proxies(self) -> Dict[str, str]:
+        """requests-style proxies mapping that routes plain HTTP through the server."""
+        return {'http': self.url}
+
+    @property
+    def stats(self) -> Dict[str, int]:
+        """Request, 404 and byte counts so far."""
+        with self.httpd.stats_lock:
+            return dict(self.httpd.stats)
+
+    def start(self) -> 'MockServer':
+        """Start serving in a background thread."""
+        self._thread = threading.Thread(target=self.httpd.serve_forever, name='mock-server', daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        """Stop serving and close the socket."""
+        self.httpd.shutdown()
+        self.httpd.server_close()
+        if self._thread:
+            self._thread.join()
+
+    def __enter__(self) -> 'MockServer':
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb):
+        self.stop()
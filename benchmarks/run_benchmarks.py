@@ -0,0 +1,263 @@
+#!/usr/bin/env python3
+"""
+Benchmark crawl throughput, parsing, detection and database writes against a local corpus.
+
+Pages come from a synthetic corpus (or a directory of captured pages) served
+by a local mock server with configurable latency, so runs are reproducible
+and never touch house.gov or senate.gov.
+"""
+import sys
+import os
+import argparse
+import json
+import platform
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Dict, Any, List
+
+# Add src to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from bs4 import BeautifulSoup
+
+from src.database.database import CongressVideoDatabase
+from src.database.models import Committee, Hearing, VideoFormat
+from src.scrapers.house_scraper import HouseScraper
+from src.scrapers.senate_scraper import SenateScraper
+from src.utils.helpers import VideoFormatDetector
+from src.utils.metrics import MetricsRegistry
+from benchmarks.fixtures import SyntheticCorpus, DirectoryCorpus, HOUSE_LISTING_URL, SENATE_LISTING_URL
+from benchmarks.mock_server import MockServer
+
+
+SCRAPERS = {
+    'house': (HouseScraper, HOUSE_LISTING_URL),
+    'senate': (SenateScraper, SENATE_LISTING_URL),
+}
+
+# Crawl stages reported from the scraper's metrics registry
+CRAWL_STAGES = ('http_request_seconds', 'http_ttfb_seconds', 'parse_seconds', 'detect_seconds', 'manifest_seconds')
+
+
+def _rate(count: int, seconds: float) -> float:
+    """Items per second, guarding against a zero-length timing."""
+    return round(count / seconds, 2) if seconds > 0 else 0.0
+
+
+def _stage_summary(metrics: MetricsRegistry) -> Dict[str, Dict[str, Any]]:
+    """Count, total and mean seconds per crawl stage (label sets such as host merged)."""
+    stages = {}
+    for row in metrics.rows():
+        if row['kind'] != 'histogram' or row['name'] not in CRAWL_STAGES:
+            continue
+        stage = stages.setdefault(row['name'], {'count': 0, 'total_seconds': 0.0})
+        stage['count'] += row['count']
+        stage['total_seconds'] += row['sum']
+    for stage in stages.values():
+        stage['mean_ms'] = round(1000 * stage['total_seconds'] / stage['count'], 3) if stage['count'] else 0.0
+        stage['total_seconds'] = round(stage['total_seconds'], 4)
+    return stages
+
+
+def bench_crawl(chamber: str, server: MockServer, workers: int) -> Dict[str, Any]:
+    """Crawl one chamber's synthetic site end to end through the mock server."""
+    scraper_class, listing_url = SCRAPERS[chamber]
+    metrics = MetricsRegistry()
+    scraper = scraper_class(delay_range=(0, 0), max_retries=0, metrics=metrics)
+    scraper.session.proxies.update(server.proxies)
+    scraper.manifest_analyzer.session.proxies.update(server.proxies)
+    scraper.COMMITTEES_URL = listing_url
+    scraper.BASE_URL = listing_url.rsplit('/', 1)[0]
+
+    requests_before = server.stats['requests']
+    start = time.perf_counter()
+
+    committees = scraper.scrape_committees()
+    for committee_id, committee in enumerate(committees, 1):
+        committee.id = committee_id
+
+    def crawl_committee(committee: Committee) -> List[Hearing]:
+        subcommittees = scraper.scrape_committee_details(committee)
+        hearings = scraper.scrape_hearings(committee)
+        for subcommittee in subcommittees:
+            hearings.extend(scraper.scrape_hearings(committee, subcommittee))
+        return hearings
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        hearings = [h for batch in executor.map(crawl_committee, committees) for h in batch]
+        formats = [vf for batch in executor.map(scraper.scrape_hearing_video, hearings) for vf in batch]
+
+    elapsed = time.perf_counter() - start
+    pages = server.stats['requests'] - requests_before
+    return {
+        'committees': len(committees),
+        'hearings': len(hearings),
+        'video_formats': len(formats),
+        'requests': pages,
+        'failed_requests': metrics.counter('http_failed_requests_total'),
+        'seconds': round(elapsed, 3),
+        'pages_per_second': _rate(pages, elapsed),
+        'stages': _stage_summary(metrics),
+    }
+
+
+def bench_parse(pages: List[bytes]) -> Dict[str, Any]:
+    """Parse time per page with the scrapers' parser."""
+    start = time.perf_counter()
+    for content in pages:
+        BeautifulSoup(content, 'html.parser')
+    elapsed = time.perf_counter() - start
+    total_bytes = sum(len(content) for content in pages)
+    return {
+        'pages': len(pages),
+        'seconds': round(elapsed, 3),
+        'ms_per_page': round(1000 * elapsed / len(pages), 3) if pages else 0.0,
+        'mb_per_second': round(total_bytes / 1e6 / elapsed, 2) if elapsed > 0 else 0.0,
+    }
+
+
+def bench_detector(soups: List[BeautifulSoup], urls: List[str], repeat: int = 3) -> Dict[str, Any]:
+    """Detector throughput over pre-parsed pages (best of repeat runs)."""
+    best = None
+    found = 0
+    for _ in range(repeat):
+        start = time.perf_counter()
+        found = sum(len(VideoFormatDetector.detect_streaming_platform(soup, url)) for soup, url in zip(soups, urls))
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return {
+        'pages': len(soups),
+        'formats_found': found,
+        'seconds': round(best, 4),
+        'pages_per_second': _rate(len(soups), best),
+    }
+
+
+def bench_db_writes(soups: List[BeautifulSoup], urls: List[str], hearings_per_committee: int = 50) -> Dict[str, Any]:
+    """Insert rate per table into a fresh temporary database."""
+    metrics = MetricsRegistry()
+    with tempfile.TemporaryDirectory() as tmp:
+        db = CongressVideoDatabase(os.path.join(tmp, 'bench.db'), metrics=metrics)
+        committee_id = None
+        start = time.perf_counter()
+        for i, (soup, url) in enumerate(zip(soups, urls)):
+            if i % hearings_per_committee == 0:
+                committee_id = db.insert_committee(Committee(
+                    name=f'Benchmark Committee {i // hearings_per_committee}', chamber='house',
+                    official_url=url.rsplit('/hearings/', 1)[0]
+                ))
+            hearing_id = db.insert_hearing(Hearing(committee_id=committee_id, title=f'Hearing {i}',
+                                                   hearing_url=url, status='scheduled'))
+            for format_info in VideoFormatDetector.detect_streaming_platform(soup, url):
+                db.insert_video_format(VideoFormat(
+                    hearing_id=hearing_id,
+                    platform=format_info.get('platform', 'unknown'),
+                    video_id=format_info.get('video_id', ''),
+                    embed_code=format_info.get('embed_code', ''),
+                    streaming_url=format_info.get('streaming_url', ''),
+                    streaming_protocol=format_info.get('streaming_protocol', ''),
+                    player_type=format_info.get('player_type', 'unknown')
+                ))
+        elapsed = time.perf_counter() - start
+
+    tables = {}
+    for name, labels, count, total, p50, p95 in metrics.summary():
+        if name == 'db_write_seconds':
+            tables[labels['table']] = {
+                'rows': count,
+                'rows_per_second': _rate(count, total),
+                'p50': p50,
+                'p95': p95,
+            }
+    rows = sum(table['rows'] for table in tables.values())
+    return {'rows': rows, 'seconds': round(elapsed, 3), 'rows_per_second': _rate(rows, elapsed), 'tables': tables}
+
+
+def print_results(results: Dict[str, Any]):
+    """Print a short human-readable summary."""
+    config = results['config']
+    print(f"Corpus: {config['corpus_pages']} pages, latency {config['latency'] * 1000:.0f} ms, "
+          f"{config['workers']} workers")
+    for chamber, crawl in results.get('crawl', {}).items():
+        print(f"  crawl {chamber:<7} {crawl['requests']:>6} requests in {crawl['seconds']:>7.2f}s "
+              f"= {crawl['pages_per_second']:>8.1f} pages/s "
+              f"({crawl['hearings']} hearings, {crawl['video_formats']} formats, "
+              f"{crawl['failed_requests']:.0f} failed)")
+    if 'parse' in results:
+        parse = results['parse']
+        print(f"  parse          {parse['pages']:>6} pages {parse['ms_per_page']:>8.2f} ms/page "
+              f"({parse['mb_per_second']} MB/s)")
+    if 'detector' in results:
+        detector = results['detector']
+        print(f"  detector       {detector['pages']:>6} pages {detector['pages_per_second']:>8.1f} pages/s "
+              f"({detector['formats_found']} formats)")
+    if 'db' in results:
+        db = results['db']
+        print(f"  db writes      {db['rows']:>6} rows  {db['rows_per_second']:>8.1f} rows/s")
+        for table, stats in sorted(db['tables'].items()):
+            print(f"    {table:<14} {stats['rows']:>6} rows  {stats['rows_per_second']:>8.1f} rows/s")
+
+
+def main():
+    """Run the benchmark suite."""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--pages', type=int, default=1000, help='approximate synthetic corpus size (up to 10k+)')
+    parser.add_argument('--corpus', help='directory of captured pages (index.json) instead of a synthetic corpus')
+    parser.add_argument('--latency', type=float, default=0.0, help='mock server delay per request, in seconds')
+    parser.add_argument('--jitter', type=float, default=0.0, help='extra uniform random delay, in seconds')
+    parser.add_argument('--workers', type=int, default=8, help='concurrent crawl workers per chamber')
+    parser.add_argument('--sample', type=int, default=500, help='hearing pages used for parse/detector/db runs')
+    parser.add_argument('--only', action='append', choices=['crawl', 'parse', 'detector', 'db'],
+                        help='run only this benchmark (repeatable)')
+    parser.add_argument('--output', '-o', help='write results as JSON to this file')
+    args = parser.parse_args()
+
+    only = set(args.only or ['crawl', 'parse', 'detector', 'db'])
+    corpus = DirectoryCorpus(args.corpus) if args.corpus else SyntheticCorpus(pages=args.pages)
+
+    results: Dict[str, Any] = {
+        'timestamp': datetime.now().isoformat(),
+        'config': {
+            'corpus': args.corpus or 'synthetic',
+            'corpus_pages': corpus.page_count,
+            'latency': args.latency,
+            'jitter': args.jitter,
+            'workers': args.workers,
+            'sample': args.sample,
+            'python': platform.python_version(),
+        },
+    }
+
+    if 'crawl' in only:
+        if args.corpus:
+            print("Skipping crawl: captured corpora are only used for parse/detector/db benchmarks")
+        else:
+            results['crawl'] = {}
+            with MockServer(corpus, latency=args.latency, jitter=args.jitter) as server:
+                for chamber in SCRAPERS:
+                    print(f"Crawling {chamber} through {server.url}...")
+                    results['crawl'][chamber] = bench_crawl(chamber, server, args.workers)
+
+    if only & {'parse', 'detector', 'db'}:
+        urls = list(corpus.hearing_urls() if hasattr(corpus, 'hearing_urls') else corpus.urls())[:args.sample]
+        pages = [corpus.get(url) for url in urls]
+        if 'parse' in only:
+            results['parse'] = bench_parse(pages)
+        soups = [BeautifulSoup(content, 'html.parser') for content in pages]
+        if 'detector' in only:
+            results['detector'] = bench_detector(soups, urls)
+        if 'db' in only:
+            results['db'] = bench_db_writes(soups, urls)
+
+    print_results(results)
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=2)
+        print(f"Results written to {args.output}")
+
+
+if __name__ == '__main__':
+    main()
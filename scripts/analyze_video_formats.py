@@ -4,13 +4,14 @@ Analyze video formats found and organize by committee.
 """
 import sys
 import os
-import json
-from collections import defaultdict
+import itertools
 
 # Add src to path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
 
+from src.analysis import frames as analytics
 from src.database.database import CongressVideoDatabase
+from src.utils.snapshot import latest_snapshot, open_snapshot
 
 
 def analyze_video_formats():
@@ -23,79 +24,68 @@ def analyze_video_formats():
     
     # Get all data
     committees = db.get_committees()
-    hearings = db.get_hearings()
-    video_formats = db.get_video_formats()
+    hearing_frame = analytics.load_hearing_frame(db)
+    format_frame = analytics.load_format_frame(db)
+    # Each format arrives with its hearing and committee from a single joined query
+    format_rows = db.get_video_formats_with_context()
     
     print(f"\nDATABASE OVERVIEW:")
     print(f"- Committees: {len(committees)}")
-    print(f"- Hearings: {len(hearings)}")
-    print(f"- Video formats: {len(video_formats)}")
-    
-    # Create committee lookup
-    committee_lookup = {c.id: c for c in committees}
+    print(f"- Hearings: {len(hearing_frame)}")
+    print(f"- Video formats: {len(format_frame)}")
     
     # Analyze hearings by committee
-    hearings_by_committee = defaultdict(list)
-    for hearing in hearings:
-        if hearing.committee_id:
-            hearings_by_committee[hearing.committee_id].append(hearing)
+    hearings_by_committee = hearing_frame.groupby(['committee', 'chamber'], observed=True).size()
     
     print(f"\nHEARINGS BY COMMITTEE:")
-    for committee_id, committee_hearings in hearings_by_committee.items():
-        committee = committee_lookup.get(committee_id)
-        if committee:
-            print(f"- {committee.name} ({committee.chamber}): {len(committee_hearings)} hearings")
-    
-    # Analyze video formats
-    video_by_hearing = defaultdict(list)
-    for vf in video_formats:
-        if vf.hearing_id:
-            video_by_hearing[vf.hearing_id].append(vf)
+    for (committee_name, chamber), count in hearings_by_committee[hearings_by_committee > 0].items():
+        print(f"- {committee_name} ({chamber}): {count} hearings")
     
     print(f"\nVIDEO FORMATS DETECTED:")
-    platform_counts = defaultdict(int)
-    for vf in video_formats:
-        platform_counts[vf.platform] += 1
+    platform_counts = {platform: int(count) for platform, count
+                       in format_frame['platform'].value_counts().items() if count}
     
     for platform, count in platform_counts.items():
         print(f"- {platform}: {count} instances")
     
+    if not format_frame.empty:
+        print(f"\nSTREAMING PROTOCOL MIX BY CHAMBER:")
+        print(analytics.protocol_mix(format_frame).round(2).to_string())
+    
+    coverage = analytics.coverage_over_time(hearing_frame)
+    if not coverage.empty:
+        print(f"\nVIDEO COVERAGE BY MONTH:")
+        for month, row in coverage.iterrows():
+            print(f"- {month:%Y-%m}: {int(row['with_video'])}/{int(row['hearings'])} hearings ({row['coverage']:.0%})")
+    
     # Show detailed video format analysis
     print(f"\nDETAILED VIDEO FORMAT ANALYSIS:")
-    for vf in video_formats:
+    for vf, hearing, committee in format_rows:
         print(f"\nPlatform: {vf.platform}")
         print(f"  Player Type: {vf.player_type}")
         print(f"  Video ID: {vf.video_id}")
         print(f"  Streaming URL: {vf.streaming_url}")
         print(f"  Embed Code: {vf.embed_code[:100]}..." if vf.embed_code else "  Embed Code: None")
         
-        # Get associated hearing
-        hearing = next((h for h in hearings if h.id == vf.hearing_id), None)
-        if hearing:
-            committee = committee_lookup.get(hearing.committee_id)
-            if committee:
-                print(f"  Committee: {committee.name} ({committee.chamber})")
-                print(f"  Hearing: {hearing.title[:50]}...")
+        if hearing and committee:
+            print(f"  Committee: {committee.name} ({committee.chamber})")
+            print(f"  Hearing: {hearing.title[:50]}...")
     
     # Read raw data to see what was actually found
     print(f"\nRAW DATA ANALYSIS:")
     try:
-        latest_house_file = max([f for f in os.listdir(os.path.join(os.path.dirname(__file__), '..', 'data', 'raw')) if f.startswith('house_data_')])
-        latest_senate_file = max([f for f in os.listdir(os.path.join(os.path.dirname(__file__), '..', 'data', 'raw')) if f.startswith('senate_data_')])
-        
-        with open(os.path.join(os.path.dirname(__file__), '..', 'data', 'raw', latest_house_file), 'r') as f:
-            house_data = json.load(f)
-        
-        with open(os.path.join(os.path.dirname(__file__), '..', 'data', 'raw', latest_senate_file), 'r') as f:
-            senate_data = json.load(f)
+        data_dir = os.path.join(os.path.dirname(__file__), '..', 'data', 'raw')
+        house_snapshot = open_snapshot(latest_snapshot(data_dir, 'house_data_'))
+        senate_snapshot = open_snapshot(latest_snapshot(data_dir, 'senate_data_'))
         
-        print(f"House raw video formats: {len(house_data['video_formats'])}")
-        print(f"Senate raw video formats: {len(senate_data['video_formats'])}")
+        print(f"House raw video formats: {house_snapshot.count('video_formats')}")
+        print(f"Senate raw video formats: {senate_snapshot.count('video_formats')}")
         
-        # Show sample video formats from raw data
+        # Show sample video formats from raw data, reading only the video_formats sections
         print(f"\nSAMPLE RAW VIDEO FORMATS:")
-        all_raw_formats = house_data['video_formats'] + senate_data['video_formats']
-        for i, vf in enumerate(all_raw_formats[:5]):
+        all_raw_formats = itertools.chain(house_snapshot.iter_section('video_formats'),
+                                          senate_snapshot.iter_section('video_formats'))
+        for i, vf in enumerate(itertools.islice(all_raw_formats, 5)):
             print(f"\n{i+1}. Platform: {vf.get('platform', 'Unknown')}")
             print(f"   Player Type: {vf.get('player_type', 'Unknown')}")
             print(f"   Video ID: {vf.get('video_id', 'None')}")
@@ -145,9 +135,9 @@ def analyze_video_formats():
     
     return {
         'committees': len(committees),
-        'hearings': len(hearings), 
-        'video_formats': len(video_formats),
-        'platforms': dict(platform_counts),
+        'hearings': len(hearing_frame), 
+        'video_formats': len(format_frame),
+        'platforms': platform_counts,
         'house_committees': len(house_committees),
         'senate_committees': len(senate_committees)
     }
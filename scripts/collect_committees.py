@@ -4,7 +4,6 @@ Script to collect all committees, subcommittees, and hearings data from Congress
 """
 import sys
 import os
-import json
 from datetime import datetime
 from pathlib import Path
 
@@ -14,6 +13,35 @@ sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
 from src.database.database import CongressVideoDatabase
 from src.scrapers.house_scraper import HouseScraper
 from src.scrapers.senate_scraper import SenateScraper
+from src.utils.embed_capture import EmbedCapturePolicy, EmbedSideStore
+from src.utils.snapshot import SnapshotWriter
+from src.utils.metrics import METRICS
+
+
+SNAPSHOT_SECTIONS = ('committees', 'subcommittees', 'hearings', 'video_formats', 'scrape_logs')
+
+
+def save_snapshot(path, data):
+    """Write scraped records to a compressed JSON Lines snapshot, one indexed section per type."""
+    writer = SnapshotWriter(path)
+    for section in SNAPSHOT_SECTIONS:
+        # Records are serialised one at a time rather than as one large document
+        writer.write_section(section, (record.to_dict() for record in data.get(section, [])))
+
+
+def save_metrics(db, run_id, data_dir):
+    """Store this run's stage timings in the database and as Prometheus text."""
+    db.insert_metrics(run_id, METRICS.rows())
+    
+    metrics_file = os.path.join(data_dir, f'metrics_{run_id}.prom')
+    with open(metrics_file, 'w') as f:
+        f.write(METRICS.to_prometheus())
+    print(f"Metrics saved to: {metrics_file}")
+    
+    print("\nTime by stage (count, total, p50, p95):")
+    for name, labels, count, total, p50, p95 in METRICS.summary()[:15]:
+        label_text = ','.join(f"{k}={v}" for k, v in labels.items())
+        print(f"  {name}{{{label_text}}}: {count}x, {total:.2f}s, p50 {p50:.3f}s, p95 {p95:.3f}s")
 
 
 def main():
@@ -25,9 +53,13 @@ def main():
     db_path = os.path.join(os.path.dirname(__file__), '..', 'data', 'congress_video.db')
     db = CongressVideoDatabase(db_path)
     
+    # Keep only player setup snippets with formats; full script bodies go to a gzip side store
+    embed_store_dir = os.path.join(os.path.dirname(__file__), '..', 'data', 'raw', 'embed_store')
+    capture_policy = EmbedCapturePolicy(side_store=EmbedSideStore(embed_store_dir))
+    
     # Initialize scrapers
-    house_scraper = HouseScraper()
-    senate_scraper = SenateScraper()
+    house_scraper = HouseScraper(capture_policy=capture_policy)
+    senate_scraper = SenateScraper(capture_policy=capture_policy)
     
     # Collect House data
     print("\n=== Collecting House of Representatives Data ===")
@@ -150,33 +182,18 @@ def main():
     timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
     
     # Save House data
-    house_file = os.path.join(data_dir, f'house_data_{timestamp}.json')
-    with open(house_file, 'w') as f:
-        # Convert dataclasses to dictionaries for JSON serialization
-        json_data = {
-            'committees': [c.to_dict() for c in house_data['committees']],
-            'subcommittees': [s.to_dict() for s in house_data['subcommittees']],
-            'hearings': [h.to_dict() for h in house_data['hearings']],
-            'video_formats': [v.to_dict() for v in house_data['video_formats']],
-            'scrape_logs': [l.to_dict() for l in house_data['scrape_logs']]
-        }
-        json.dump(json_data, f, indent=2)
+    house_file = os.path.join(data_dir, f'house_data_{timestamp}.jsonl.gz')
+    save_snapshot(house_file, house_data)
     print(f"House data saved to: {house_file}")
     
     # Save Senate data
-    senate_file = os.path.join(data_dir, f'senate_data_{timestamp}.json')
-    with open(senate_file, 'w') as f:
-        # Convert dataclasses to dictionaries for JSON serialization
-        json_data = {
-            'committees': [c.to_dict() for c in senate_data['committees']],
-            'subcommittees': [s.to_dict() for s in senate_data['subcommittees']],
-            'hearings': [h.to_dict() for h in senate_data['hearings']],
-            'video_formats': [v.to_dict() for v in senate_data['video_formats']],
-            'scrape_logs': [l.to_dict() for l in senate_data['scrape_logs']]
-        }
-        json.dump(json_data, f, indent=2)
+    senate_file = os.path.join(data_dir, f'senate_data_{timestamp}.jsonl.gz')
+    save_snapshot(senate_file, senate_data)
     print(f"Senate data saved to: {senate_file}")
     
+    # Save per-stage timings for this run
+    save_metrics(db, timestamp, data_dir)
+    
     print(f"\nData collection completed: {datetime.now()}")
     print(f"Database saved to: {db_path}")
 
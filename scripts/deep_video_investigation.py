@@ -20,11 +20,26 @@ from selenium.webdriver.common.desired_capabilities import DesiredCapabilities
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
 
 from src.utils.helpers import WebScraper
+from src.utils.browser import MediaReadinessDetector, NetworkEventListener
+from src.media.manifest import ManifestAnalyzer, manifest_protocol
+from src.utils.http_probe import HTTPProber
+from src.utils.signatures import VIDEO_SIGNATURE_ENGINE
 
 
 class DeepVideoInvestigator:
     """Deep investigation tool for finding actual video formats and endpoints."""
     
+    COMMON_VIDEO_PATHS = [
+        '/hearings',
+        '/meetings',
+        '/video',
+        '/live',
+        '/webcast',
+        '/markup',
+        '/archive',
+        '/media'
+    ]
+    
     def __init__(self):
         """Initialize the investigator."""
         self.setup_selenium()
@@ -38,11 +53,12 @@ class DeepVideoInvestigator:
         options.add_argument('--disable-gpu')
         options.add_argument('--window-size=1920,1080')
         
-        # Enable performance and network logging
-        options.set_capability('goog:loggingPrefs', {
-            'performance': 'ALL',
-            'browser': 'ALL'
-        })
+        # Return from driver.get() at DOMContentLoaded; readiness is detected explicitly
+        options.page_load_strategy = 'eager'
+        
+        # Enable browser logging and network-only performance logging
+        options.set_capability('goog:loggingPrefs', {'browser': 'ALL'})
+        NetworkEventListener.configure_options(options)
         
         # Enable network domain for intercepting requests
         options.add_experimental_option('useAutomationExtension', False)
@@ -54,6 +70,8 @@ class DeepVideoInvestigator:
         # Enable network tracking
         self.driver.execute_cdp_cmd('Network.enable', {})
         self.driver.execute_cdp_cmd('Page.enable', {})
+        
+        self.readiness = MediaReadinessDetector(self.driver)
     
     def setup_session(self):
         """Set up requests session for direct HTTP analysis."""
@@ -61,6 +79,12 @@ class DeepVideoInvestigator:
         self.session.headers.update({
             'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
         })
+        
+        # Manifests are fetched (rate limited) and parsed; results are cached by URL and ETag
+        self.manifest_analyzer = ManifestAnalyzer(scraper=WebScraper())
+        
+        # Path probes share keep-alive connections and cache results per URL
+        self.prober = HTTPProber()
     
     def investigate_committee(self, committee_name, committee_url):
         """Deeply investigate a committee's video infrastructure."""
@@ -112,8 +136,9 @@ class DeepVideoInvestigator:
     def analyze_main_page(self, url):
         """Analyze the main committee page for video indicators."""
         try:
+            self.readiness.reset()
             self.driver.get(url)
-            time.sleep(5)
+            self.readiness.wait_for_media(timeout=5)
             
             page_source = self.driver.page_source
             
@@ -121,28 +146,18 @@ class DeepVideoInvestigator:
                 'video_players_detected': [],
                 'javascript_libraries': [],
                 'embedded_content': [],
-                'streaming_indicators': []
+                'streaming_indicators': [],
+                'video_formats': []
             }
             
-            # Look for video player indicators
-            video_indicators = [
-                'jwplayer', 'videojs', 'plyr', 'youtube', 'vimeo',
-                'brightcove', 'kaltura', 'wistia', 'panopto'
-            ]
-            
-            for indicator in video_indicators:
-                if indicator.lower() in page_source.lower():
-                    analysis['video_players_detected'].append(indicator)
-            
-            # Look for streaming format indicators
-            streaming_indicators = [
-                '.m3u8', '.mpd', '.mp4', '.webm', '.mov',
-                'hls', 'dash', 'rtmp', 'stream'
-            ]
-            
-            for indicator in streaming_indicators:
-                if indicator in page_source.lower():
-                    analysis['streaming_indicators'].append(indicator)
+            # One pass over the page for every player and stream signature
+            video_formats = VIDEO_SIGNATURE_ENGINE.video_formats(page_source, url)
+            for vf in video_formats:
+                names = (analysis['streaming_indicators'] if vf.player_type == 'stream'
+                         else analysis['video_players_detected'])
+                if vf.platform not in names:
+                    names.append(vf.platform)
+            analysis['video_formats'] = [vf.to_dict() for vf in video_formats]
             
             # Look for embedded content
             iframes = self.driver.find_elements(By.TAG_NAME, 'iframe')
@@ -162,7 +177,7 @@ class DeepVideoInvestigator:
         
         try:
             self.driver.get(base_url)
-            time.sleep(3)
+            self.readiness.wait_for_document(timeout=3)
             
             # Look for links that might lead to hearings
             hearing_keywords = [
@@ -198,7 +213,7 @@ class DeepVideoInvestigator:
             
             # Clear previous logs
             self.driver.get('about:blank')
-            time.sleep(1)
+            self.readiness.reset()
             
             # Start fresh network monitoring
             self.driver.execute_cdp_cmd('Network.clearBrowserCache', {})
@@ -206,8 +221,11 @@ class DeepVideoInvestigator:
             # Load the target page
             self.driver.get(url)
             
-            # Wait for page to fully load
-            time.sleep(10)
+            # Wait until the player is ready (at most 10s); stop loading the
+            # rest of the page once a manifest request has been seen
+            ready = self.readiness.wait_for_media(timeout=10, stop_on_manifest=True)
+            if ready:
+                print(f"     Player ready after {ready['elapsed']}s ({ready['signal']})")
             
             analysis = {
                 'formats': [],
@@ -216,53 +234,18 @@ class DeepVideoInvestigator:
                 'network_requests': []
             }
             
-            # Get performance logs to see network requests
-            logs = self.driver.get_log('performance')
-            
+            # Media responses captured from the CDP network stream
             video_requests = []
             audio_requests = []
             manifest_requests = []
             
-            for log in logs:
-                try:
-                    message = json.loads(log['message'])
-                    
-                    if message['message']['method'] == 'Network.responseReceived':
-                        response = message['message']['params']['response']
-                        request_url = response['url']
-                        mime_type = response.get('mimeType', '').lower()
-                        
-                        # Categorize requests
-                        if any(ext in request_url.lower() for ext in ['.mp4', '.webm', '.mov', '.avi']):
-                            video_requests.append({
-                                'url': request_url,
-                                'mime_type': mime_type,
-                                'type': 'video_file'
-                            })
-                        
-                        elif any(ext in request_url.lower() for ext in ['.mp3', '.aac', '.wav', '.m4a']):
-                            audio_requests.append({
-                                'url': request_url,
-                                'mime_type': mime_type,
-                                'type': 'audio_file'
-                            })
-                        
-                        elif any(ext in request_url.lower() for ext in ['.m3u8', '.mpd', '.f4m']):
-                            manifest_requests.append({
-                                'url': request_url,
-                                'mime_type': mime_type,
-                                'type': 'manifest'
-                            })
-                        
-                        elif 'video' in mime_type or 'audio' in mime_type:
-                            video_requests.append({
-                                'url': request_url,
-                                'mime_type': mime_type,
-                                'type': 'media_stream'
-                            })
-                
-                except:
-                    continue
+            for event in self.readiness.network_events():
+                if event['type'] == 'manifest':
+                    manifest_requests.append(event)
+                elif event['type'] == 'audio_file':
+                    audio_requests.append(event)
+                else:
+                    video_requests.append(event)
             
             # Analyze found requests
             analysis['network_requests'] = {
@@ -334,37 +317,65 @@ class DeepVideoInvestigator:
     
     def check_common_video_paths(self, base_url):
         """Check common video-related paths on the committee site."""
-        common_paths = [
-            '/hearings',
-            '/meetings',
-            '/video',
-            '/live',
-            '/webcast',
-            '/markup',
-            '/archive',
-            '/media'
-        ]
-        
-        found_paths = []
-        
-        for path in common_paths:
-            test_url = urljoin(base_url, path)
-            try:
-                response = self.session.head(test_url, timeout=10)
-                if response.status_code == 200:
-                    found_paths.append({
-                        'path': path,
-                        'url': test_url,
-                        'status': response.status_code
-                    })
-            except:
-                continue
+        results = self.prober.probe_paths([base_url], self.COMMON_VIDEO_PATHS)[base_url]
         
-        return found_paths
+        return [
+            {'path': path, 'url': result.url, 'status': result.status}
+            for path, result in zip(self.COMMON_VIDEO_PATHS, results)
+            if result.ok
+        ]
+    
+    def probe_all_sites(self, base_urls):
+        """Probe the common video paths of every committee site in one batch."""
+        start = time.perf_counter()
+        results = self.prober.probe_paths(base_urls, self.COMMON_VIDEO_PATHS)
+        found = sum(result.ok for site in results.values() for result in site)
+        print(f"Probed {len(base_urls) * len(self.COMMON_VIDEO_PATHS)} paths on {len(base_urls)} sites "
+              f"in {time.perf_counter() - start:.1f}s ({found} found)")
+        return results
     
-    def analyze_video_endpoint(self, endpoint_url):
+    def analyze_video_endpoints(self, endpoint_urls):
+        """Analyze a batch of endpoints, fetching their manifests concurrently."""
+        manifests = self.manifest_analyzer.analyze_many(
+            url for url in endpoint_urls if manifest_protocol(url)
+        )
+        return [self.analyze_video_endpoint(url, manifests.get(url)) for url in endpoint_urls]
+    
+    def analyze_video_endpoint(self, endpoint_url, manifest=None):
         """Analyze a specific video endpoint to determine format details."""
         try:
+            if manifest is None and manifest_protocol(endpoint_url):
+                manifest = self.manifest_analyzer.analyze(endpoint_url)
+            
+            if manifest is not None:
+                analysis = {
+                    'url': endpoint_url,
+                    'content_type': manifest.content_type or 'unknown',
+                    'format_details': {}
+                }
+                if manifest.error:
+                    analysis['error'] = manifest.error
+                    return analysis
+                
+                analysis['manifest'] = manifest.to_dict()
+                analysis['format_details'] = {
+                    'format': 'HLS' if manifest.protocol == 'hls' else 'DASH',
+                    'streaming_type': 'Live' if manifest.is_live else 'Adaptive',
+                    'protocol': 'HTTP',
+                    'renditions': len(manifest.renditions),
+                    'max_resolution': manifest.max_resolution or 'audio-only',
+                    'codecs': manifest.codecs,
+                    'bitrates': manifest.bitrates,
+                    'audio_only_variant': manifest.has_audio_only,
+                    'segment_duration': manifest.segment_duration,
+                    'total_duration': manifest.total_duration,
+                    'conversion_method': (
+                        'ffmpeg -i playlist.m3u8 -c copy output.mp4' if manifest.protocol == 'hls'
+                        else 'ffmpeg -i manifest.mpd -c copy output.mp4'
+                    )
+                }
+                return analysis
+            
             response = self.session.head(endpoint_url, timeout=10)
             
             analysis = {
@@ -375,26 +386,7 @@ class DeepVideoInvestigator:
                 'format_details': {}
             }
             
-            # Determine format from URL and headers
-            if '.m3u8' in endpoint_url:
-                analysis['format_details'] = {
-                    'format': 'HLS',
-                    'streaming_type': 'Adaptive',
-                    'protocol': 'HTTP',
-                    'apple_standard': True,
-                    'conversion_method': 'ffmpeg -i playlist.m3u8 -c copy output.mp4'
-                }
-            
-            elif '.mpd' in endpoint_url:
-                analysis['format_details'] = {
-                    'format': 'DASH',
-                    'streaming_type': 'Adaptive',
-                    'protocol': 'HTTP',
-                    'mpeg_standard': True,
-                    'conversion_method': 'youtube-dl or custom DASH parser'
-                }
-            
-            elif '.mp4' in endpoint_url:
+            if '.mp4' in endpoint_url:
                 analysis['format_details'] = {
                     'format': 'MP4',
                     'streaming_type': 'Progressive',
@@ -438,6 +430,9 @@ def main():
     all_results = []
     
     try:
+        # Probe every site's common paths up front; per-committee checks then hit the cache
+        investigator.probe_all_sites([committee['url'] for committee in target_committees])
+        
         for committee in target_committees:
             results = investigator.investigate_committee(committee['name'], committee['url'])
             all_results.append(results)
@@ -481,16 +476,22 @@ def main():
             
             if results['streaming_endpoints']:
                 print(f"  STREAMING ENDPOINTS ({len(results['streaming_endpoints'])}):")
-                for endpoint in results['streaming_endpoints'][:5]:  # Show first 5
+                endpoints = results['streaming_endpoints'][:5]  # Show first 5
+                
+                # Analyze the endpoints as one concurrent batch
+                results['endpoint_analysis'] = investigator.analyze_video_endpoints(endpoints)
+                for endpoint, analysis in zip(endpoints, results['endpoint_analysis']):
                     print(f"    - {endpoint}")
-                    
-                    # Analyze each endpoint
-                    analysis = investigator.analyze_video_endpoint(endpoint)
-                    if 'format_details' in analysis:
+                    if analysis.get('format_details'):
                         details = analysis['format_details']
                         print(f"      Format: {details.get('format', 'Unknown')}")
                         print(f"      Type: {details.get('streaming_type', 'Unknown')}")
+                        if 'renditions' in details:
+                            print(f"      Renditions: {details['renditions']} "
+                                  f"(max {details['max_resolution']}, codecs {', '.join(details['codecs']) or 'unknown'})")
                         print(f"      Conversion: {details.get('conversion_method', 'Unknown')}")
+                    elif analysis.get('error'):
+                        print(f"      Error: {analysis['error']}")
             
             if not results['video_formats_found'] and not results['streaming_endpoints']:
                 print(f"  ❌ No video content detected")
@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Diff two data snapshots (or two database files) and emit changes as JSON Lines.
+
+With no arguments, the two most recent snapshot timestamps in data/raw are
+compared (House and Senate files together).
+"""
+import sys
+import os
+import json
+import argparse
+import re
+from collections import Counter
+
+# Add src to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.utils.snapshot import find_snapshots
+from src.utils.snapshot_diff import SnapshotSource, DatabaseSource, diff_sources, DIFF_SECTIONS
+
+
+DATA_DIR = os.path.join(os.path.dirname(__file__), '..', 'data', 'raw')
+CHAMBER_PREFIXES = ('house_data_', 'senate_data_')
+
+
+def snapshot_timestamps(data_dir):
+    """Map each snapshot timestamp to its House/Senate files, oldest first."""
+    by_timestamp = {}
+    for prefix in CHAMBER_PREFIXES:
+        for path in find_snapshots(data_dir, prefix):
+            match = re.search(r'(\d{8}_\d{6})', os.path.basename(path))
+            if match:
+                by_timestamp.setdefault(match.group(1), {})[prefix] = path
+    return dict(sorted(by_timestamp.items()))
+
+
+def open_source(spec, data_dir):
+    """Open a diff side from a .db path, snapshot file path or snapshot timestamp."""
+    if spec.endswith('.db'):
+        try:
+            return DatabaseSource(spec)
+        except FileNotFoundError as e:
+            raise SystemExit(str(e))
+    if os.path.exists(spec):
+        return SnapshotSource([spec])
+
+    files = snapshot_timestamps(data_dir).get(spec)
+    if not files:
+        raise SystemExit(f"No snapshot found for {spec!r}")
+    return SnapshotSource(list(files.values()))
+
+
+def main():
+    """Diff two snapshots and write one JSON event per line."""
+    parser = argparse.ArgumentParser(description=__doc__.strip())
+    parser.add_argument('old', nargs='?', help='older side: .db file, snapshot file or timestamp (YYYYMMDD_HHMMSS)')
+    parser.add_argument('new', nargs='?', help='newer side: .db file, snapshot file or timestamp')
+    parser.add_argument('--data-dir', default=DATA_DIR, help='directory holding snapshots')
+    parser.add_argument('--section', action='append', choices=DIFF_SECTIONS,
+                        help='limit to a section (repeatable)')
+    parser.add_argument('--output', '-o', help='write events to this file instead of stdout')
+    args = parser.parse_args()
+
+    if args.old and args.new:
+        old, new = open_source(args.old, args.data_dir), open_source(args.new, args.data_dir)
+    elif not args.old:
+        timestamps = list(snapshot_timestamps(args.data_dir))
+        if len(timestamps) < 2:
+            raise SystemExit("Need at least two snapshots to diff")
+        old, new = open_source(timestamps[-2], args.data_dir), open_source(timestamps[-1], args.data_dir)
+    else:
+        parser.error("give both OLD and NEW, or neither")
+
+    print(f"Diffing {old} -> {new}", file=sys.stderr)
+
+    out = open(args.output, 'w') if args.output else sys.stdout
+    counts = Counter()
+    try:
+        for event in diff_sources(old, new, args.section):
+            counts[(event['section'], event['op'])] += 1
+            out.write(json.dumps(event, default=str) + '\n')
+    finally:
+        if args.output:
+            out.close()
+
+    print("\nSummary:", file=sys.stderr)
+    for section in args.section or DIFF_SECTIONS:
+        added, removed, changed = (counts[(section, op)] for op in ('added', 'removed', 'changed'))
+        print(f"  {section}: +{added} -{removed} ~{changed}", file=sys.stderr)
+
+
+if __name__ == '__main__':
+    main()
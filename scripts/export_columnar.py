@@ -0,0 +1,44 @@
+#!/usr/bin/env python3
+"""
+Export the index database as Parquet datasets partitioned by chamber and month.
+"""
+import sys
+import os
+import argparse
+
+# Add src to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.database.database import CongressVideoDatabase
+from src.analysis.export import export_parquet, PARTITION_COLUMNS
+
+
+def main():
+    """Export the database to Parquet."""
+    default_db = os.path.join(os.path.dirname(__file__), '..', 'data', 'congress_video.db')
+    default_output = os.path.join(os.path.dirname(__file__), '..', 'data', 'export', 'parquet')
+
+    parser = argparse.ArgumentParser(description=__doc__.strip())
+    parser.add_argument('--db', default=default_db, help='database file to export')
+    parser.add_argument('--output', '-o', default=default_output, help='output directory')
+    parser.add_argument('--table', action='append', choices=list(PARTITION_COLUMNS),
+                        help='export only this table (repeatable)')
+    parser.add_argument('--compression', default='zstd', help='Parquet compression codec')
+    args = parser.parse_args()
+
+    if not os.path.exists(args.db):
+        raise SystemExit(f"Database not found: {args.db}")
+
+    print(f"Exporting {args.db} to {args.output}")
+    # Read-only: exporting must never create, migrate or write to the source database
+    db = CongressVideoDatabase(args.db, read_only=True)
+    counts = export_parquet(db, args.output, tables=args.table, compression=args.compression)
+
+    for table, count in counts.items():
+        partitions = ', '.join(PARTITION_COLUMNS[table])
+        print(f"  {table}: {count} rows (partitioned by {partitions})")
+    print("Export complete")
+
+
+if __name__ == '__main__':
+    main()
@@ -6,150 +6,196 @@ import sys
 import os
 import json
 import re
+import argparse
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Optional, Tuple
 from urllib.parse import urlparse, parse_qs
-from collections import defaultdict
+from collections import defaultdict, Counter
 
 # Add src to path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
 
 from src.database.database import CongressVideoDatabase
+from src.utils.jwplayer import find_setup_configs, iter_config_sources
+from src.utils.snapshot import latest_snapshot, open_snapshot
 
 
-def extract_video_formats():
-    """Extract complete video format details."""
+@dataclass(frozen=True)
+class PlatformHandler:
+    """Conversion guidance for one platform: fixed notes plus optional per-record enrichment."""
+    notes: Tuple[str, ...]
+    enrich: Optional[Callable[[Dict[str, Any]], None]] = None
+
+
+def enrich_youtube(analysis):
+    """Add the YouTube video ID and watch URL."""
+    youtube_id = extract_youtube_id(analysis['streaming_url'] or analysis['embed_code'])
+    if youtube_id:
+        analysis['youtube_id'] = youtube_id
+        analysis['direct_url'] = f"https://www.youtube.com/watch?v={youtube_id}"
+        analysis['conversion_notes'].append(f"Direct YouTube URL: {analysis['direct_url']}")
+
+
+def enrich_jwplayer(analysis):
+    """Add the parsed JWPlayer setup config."""
+    jwplayer_config = extract_jwplayer_config(analysis['embed_code'])
+    if jwplayer_config:
+        analysis['jwplayer_config'] = jwplayer_config
+
+
+PLATFORM_HANDLERS: Dict[str, PlatformHandler] = {
+    'youtube': PlatformHandler(
+        notes=('YouTube: Use youtube-dl or yt-dlp for extraction',
+               'Audio format: Usually AAC or Opus',
+               'Quality options: 128kbps, 192kbps, 256kbps available'),
+        enrich=enrich_youtube
+    ),
+    'jwplayer': PlatformHandler(
+        notes=('JWPlayer: JavaScript-based, requires dynamic extraction',
+               'Audio format: Usually AAC or MP3',
+               'Extraction: May need Selenium or API calls'),
+        enrich=enrich_jwplayer
+    ),
+    'vimeo': PlatformHandler(
+        notes=('Vimeo: Use vimeo-dl or similar tools',
+               'Audio format: Usually AAC',
+               'Quality: Multiple bitrates available')
+    ),
+    'html5': PlatformHandler(
+        notes=('HTML5 Video: Direct MP4/WebM files',
+               'Audio extraction: Use ffmpeg directly',
+               'Format: Depends on source (AAC, MP3, Opus)')
+    ),
+    'custom': PlatformHandler(
+        notes=('Custom Player: Requires individual analysis',
+               'Extraction: May need reverse engineering',
+               'Format: Unknown - inspect network traffic')
+    ),
+}
+
+NO_HANDLER = PlatformHandler(notes=())
+
+
+def analyze_format(index, vf):
+    """Build the conversion analysis for one raw video format record."""
+    platform = vf.get('platform', 'unknown')
+    handler = PLATFORM_HANDLERS.get(platform, NO_HANDLER)
+    analysis = {
+        'index': index,
+        'platform': platform,
+        'player_type': vf.get('player_type', 'unknown'),
+        'video_id': vf.get('video_id', ''),
+        'streaming_url': vf.get('streaming_url', ''),
+        'embed_code': vf.get('embed_code', ''),
+        'hearing_id': vf.get('hearing_id'),
+        'technical_details': vf.get('technical_details', ''),
+        'accessibility_features': vf.get('accessibility_features', ''),
+        'conversion_notes': list(handler.notes)
+    }
+    if handler.enrich:
+        handler.enrich(analysis)
+    return analysis
+
+
+def iter_format_analysis(records):
+    """Analyze raw video format records one at a time."""
+    for i, vf in enumerate(records):
+        yield analyze_format(i + 1, vf)
+
+
+def print_format_analysis(vf):
+    """Print the detailed specification of one analyzed format."""
+    print(f"\n[{vf['index']}] PLATFORM: {vf['platform'].upper()}")
+    print(f"    Player Type: {vf['player_type']}")
+    print(f"    Video ID: {vf['video_id'] or 'N/A'}")
+    print(f"    Streaming URL: {vf['streaming_url'] or 'N/A'}")
+    
+    if vf.get('youtube_id'):
+        print(f"    YouTube ID: {vf['youtube_id']}")
+        print(f"    Direct URL: {vf['direct_url']}")
+    
+    if vf.get('jwplayer_config'):
+        print(f"    JWPlayer Config: {vf['jwplayer_config']}")
+    
+    if vf['embed_code']:
+        print(f"    Embed Code: {vf['embed_code'][:100]}...")
+    
+    if vf['conversion_notes']:
+        print(f"    CONVERSION NOTES:")
+        for note in vf['conversion_notes']:
+            print(f"      - {note}")
+    
+    print(f"    " + "-"*60)
+
+
+def extract_video_formats(quiet=False, jsonl_path=None):
+    """Extract complete video format details.
+    
+    With jsonl_path, each analyzed format is written to that file as it is
+    produced instead of being kept for the JSON report; quiet skips the
+    per-format listing.
+    """
     print("Extracting Video Formats for MP3 Conversion...")
     
     # Get raw data files
     data_dir = os.path.join(os.path.dirname(__file__), '..', 'data', 'raw')
     
-    # Find latest data files
-    house_files = [f for f in os.listdir(data_dir) if f.startswith('house_data_')]
-    senate_files = [f for f in os.listdir(data_dir) if f.startswith('senate_data_')]
+    # Find latest snapshots (compressed JSONL, or legacy JSON dumps)
+    latest_house_file = latest_snapshot(data_dir, 'house_data_')
+    latest_senate_file = latest_snapshot(data_dir, 'senate_data_')
     
-    if not house_files or not senate_files:
+    if not latest_house_file or not latest_senate_file:
         print("No data files found!")
         return
     
-    latest_house_file = max(house_files)
-    latest_senate_file = max(senate_files)
-    
-    print(f"Analyzing: {latest_house_file} and {latest_senate_file}")
-    
-    # Load raw data
-    with open(os.path.join(data_dir, latest_house_file), 'r') as f:
-        house_data = json.load(f)
+    print(f"Analyzing: {os.path.basename(latest_house_file)} and {os.path.basename(latest_senate_file)}")
     
-    with open(os.path.join(data_dir, latest_senate_file), 'r') as f:
-        senate_data = json.load(f)
+    snapshots = [open_snapshot(latest_house_file), open_snapshot(latest_senate_file)]
     
-    all_video_formats = house_data['video_formats'] + senate_data['video_formats']
-    all_hearings = house_data['hearings'] + senate_data['hearings']
-    all_committees = house_data['committees'] + senate_data['committees']
+    def iter_all(section):
+        for snapshot in snapshots:
+            yield from snapshot.iter_section(section)
     
-    print(f"\nFound {len(all_video_formats)} video format instances")
-    print(f"Found {len(all_hearings)} hearings")
-    print(f"Found {len(all_committees)} committees")
+    print(f"\nFound {sum(s.count('video_formats') for s in snapshots)} video format instances")
+    print(f"Found {sum(s.count('hearings') for s in snapshots)} hearings")
+    print(f"Found {sum(s.count('committees') for s in snapshots)} committees")
     
     # Create lookup tables
+    all_committees = list(iter_all('committees'))
     committee_lookup = {c['name']: c for c in all_committees}
     
-    # Analyze video formats
-    video_format_analysis = []
-    
-    for i, vf in enumerate(all_video_formats):
-        analysis = {
-            'index': i + 1,
-            'platform': vf.get('platform', 'unknown'),
-            'player_type': vf.get('player_type', 'unknown'),
-            'video_id': vf.get('video_id', ''),
-            'streaming_url': vf.get('streaming_url', ''),
-            'embed_code': vf.get('embed_code', ''),
-            'hearing_id': vf.get('hearing_id'),
-            'technical_details': vf.get('technical_details', ''),
-            'accessibility_features': vf.get('accessibility_features', ''),
-            'conversion_notes': []
-        }
-        
-        # Add platform-specific analysis
-        if analysis['platform'] == 'youtube':
-            analysis['conversion_notes'].append('YouTube: Use youtube-dl or yt-dlp for extraction')
-            analysis['conversion_notes'].append('Audio format: Usually AAC or Opus')
-            analysis['conversion_notes'].append('Quality options: 128kbps, 192kbps, 256kbps available')
-            
-            # Extract YouTube video ID
-            youtube_id = extract_youtube_id(analysis['streaming_url'] or analysis['embed_code'])
-            if youtube_id:
-                analysis['youtube_id'] = youtube_id
-                analysis['direct_url'] = f"https://www.youtube.com/watch?v={youtube_id}"
-                analysis['conversion_notes'].append(f'Direct YouTube URL: https://www.youtube.com/watch?v={youtube_id}')
-        
-        elif analysis['platform'] == 'jwplayer':
-            analysis['conversion_notes'].append('JWPlayer: JavaScript-based, requires dynamic extraction')
-            analysis['conversion_notes'].append('Audio format: Usually AAC or MP3')
-            analysis['conversion_notes'].append('Extraction: May need Selenium or API calls')
-            
-            # Try to extract JWPlayer config
-            jwplayer_config = extract_jwplayer_config(analysis['embed_code'])
-            if jwplayer_config:
-                analysis['jwplayer_config'] = jwplayer_config
-        
-        elif analysis['platform'] == 'vimeo':
-            analysis['conversion_notes'].append('Vimeo: Use vimeo-dl or similar tools')
-            analysis['conversion_notes'].append('Audio format: Usually AAC')
-            analysis['conversion_notes'].append('Quality: Multiple bitrates available')
-        
-        elif analysis['platform'] == 'html5':
-            analysis['conversion_notes'].append('HTML5 Video: Direct MP4/WebM files')
-            analysis['conversion_notes'].append('Audio extraction: Use ffmpeg directly')
-            analysis['conversion_notes'].append('Format: Depends on source (AAC, MP3, Opus)')
-        
-        elif analysis['platform'] == 'custom':
-            analysis['conversion_notes'].append('Custom Player: Requires individual analysis')
-            analysis['conversion_notes'].append('Extraction: May need reverse engineering')
-            analysis['conversion_notes'].append('Format: Unknown - inspect network traffic')
-        
-        video_format_analysis.append(analysis)
-    
-    # Generate comprehensive report
+    # Analyze video formats, streaming them to JSONL when requested
     print("\n" + "="*80)
     print("COMPLETE VIDEO FORMAT ANALYSIS FOR MP3 CONVERSION")
     print("="*80)
     
-    # Platform summary
-    platform_counts = defaultdict(int)
-    for vf in video_format_analysis:
-        platform_counts[vf['platform']] += 1
+    if not quiet:
+        print(f"\nDETAILED VIDEO FORMAT SPECIFICATIONS:")
+        print(f"{'='*80}")
+    
+    video_format_analysis = None if jsonl_path else []
+    platform_counts = Counter()
+    jsonl_file = open(jsonl_path, 'w') if jsonl_path else None
+    try:
+        for analysis in iter_format_analysis(iter_all('video_formats')):
+            platform_counts[analysis['platform']] += 1
+            if jsonl_file:
+                jsonl_file.write(json.dumps(analysis, default=str) + '\n')
+            else:
+                video_format_analysis.append(analysis)
+            if not quiet:
+                print_format_analysis(analysis)
+    finally:
+        if jsonl_file:
+            jsonl_file.close()
     
+    # Platform summary
     print(f"\nPLATFORM SUMMARY:")
     for platform, count in platform_counts.items():
         print(f"  {platform.upper()}: {count} instances")
     
-    # Detailed analysis
-    print(f"\nDETAILED VIDEO FORMAT SPECIFICATIONS:")
-    print(f"{'='*80}")
-    
-    for vf in video_format_analysis:
-        print(f"\n[{vf['index']}] PLATFORM: {vf['platform'].upper()}")
-        print(f"    Player Type: {vf['player_type']}")
-        print(f"    Video ID: {vf['video_id'] or 'N/A'}")
-        print(f"    Streaming URL: {vf['streaming_url'] or 'N/A'}")
-        
-        if vf.get('youtube_id'):
-            print(f"    YouTube ID: {vf['youtube_id']}")
-            print(f"    Direct URL: {vf['direct_url']}")
-        
-        if vf.get('jwplayer_config'):
-            print(f"    JWPlayer Config: {vf['jwplayer_config']}")
-        
-        if vf['embed_code']:
-            print(f"    Embed Code: {vf['embed_code'][:100]}...")
-        
-        if vf['conversion_notes']:
-            print(f"    CONVERSION NOTES:")
-            for note in vf['conversion_notes']:
-                print(f"      - {note}")
-        
-        print(f"    " + "-"*60)
+    if jsonl_path:
+        print(f"\nPer-format analysis written to: {jsonl_path}")
     
     # Committee-specific analysis
     print(f"\n" + "="*80)
@@ -159,7 +205,7 @@ def extract_video_formats():
     # Try to associate video formats with committees
     committee_video_map = defaultdict(list)
     
-    for hearing in all_hearings:
+    for hearing in iter_all('hearings'):
         hearing_url = hearing.get('hearing_url', '')
         if hearing_url:
             # Try to match hearing URL with committee
@@ -251,41 +297,48 @@ TECHNICAL ARCHITECTURE FOR YOUR MP3 CONVERTER:
     
     # Save detailed analysis to file
     output_file = os.path.join(os.path.dirname(__file__), '..', 'reports', 'video_formats_for_mp3_conversion.json')
+    report = {
+        'analysis_date': '2025-01-05',
+        'total_formats': sum(platform_counts.values()),
+        'platform_counts': dict(platform_counts),
+        'committee_video_map': dict(committee_video_map),
+        'conversion_recommendations': {
+            'youtube': 'yt-dlp -x --audio-format mp3 --audio-quality 192K',
+            'jwplayer': 'Selenium + JavaScript extraction + ffmpeg',
+            'vimeo': 'yt-dlp -x --audio-format mp3',
+            'html5': 'ffmpeg -i [URL] -vn -acodec mp3 -ab 192k',
+            'custom': 'Manual analysis required'
+        }
+    }
+    if jsonl_path:
+        # Per-format records live in the JSONL file rather than in this report
+        report['detailed_formats_jsonl'] = jsonl_path
+    else:
+        report['detailed_formats'] = video_format_analysis
+    
     with open(output_file, 'w') as f:
-        json.dump({
-            'analysis_date': '2025-01-05',
-            'total_formats': len(video_format_analysis),
-            'platform_counts': dict(platform_counts),
-            'detailed_formats': video_format_analysis,
-            'committee_video_map': dict(committee_video_map),
-            'conversion_recommendations': {
-                'youtube': 'yt-dlp -x --audio-format mp3 --audio-quality 192K',
-                'jwplayer': 'Selenium + JavaScript extraction + ffmpeg',
-                'vimeo': 'yt-dlp -x --audio-format mp3',
-                'html5': 'ffmpeg -i [URL] -vn -acodec mp3 -ab 192k',
-                'custom': 'Manual analysis required'
-            }
-        }, indent=2)
+        json.dump(report, f, indent=2)
     
     print(f"\nDetailed analysis saved to: {output_file}")
     
     return video_format_analysis
 
 
+YOUTUBE_ID_PATTERNS = [re.compile(pattern) for pattern in (
+    r'youtube\.com/embed/([a-zA-Z0-9_-]+)',
+    r'youtube\.com/watch\?v=([a-zA-Z0-9_-]+)',
+    r'youtu\.be/([a-zA-Z0-9_-]+)',
+    r'youtube-nocookie\.com/embed/([a-zA-Z0-9_-]+)'
+)]
+
+
 def extract_youtube_id(text):
     """Extract YouTube video ID from URL or embed code."""
     if not text:
         return None
     
-    patterns = [
-        r'youtube\.com/embed/([a-zA-Z0-9_-]+)',
-        r'youtube\.com/watch\?v=([a-zA-Z0-9_-]+)',
-        r'youtu\.be/([a-zA-Z0-9_-]+)',
-        r'youtube-nocookie\.com/embed/([a-zA-Z0-9_-]+)'
-    ]
-    
-    for pattern in patterns:
-        match = re.search(pattern, text)
+    for pattern in YOUTUBE_ID_PATTERNS:
+        match = pattern.search(text)
         if match:
             return match.group(1)
     
@@ -297,20 +350,29 @@ def extract_jwplayer_config(embed_code):
     if not embed_code:
         return None
     
-    # Look for JWPlayer setup calls
-    patterns = [
-        r'jwplayer\([^)]*\)\.setup\(([^}]+})\)',
-        r'playerInstance\.setup\(([^}]+})\)',
-        r'setup\(([^}]+})\)'
-    ]
-    
-    for pattern in patterns:
-        match = re.search(pattern, embed_code)
-        if match:
-            return match.group(1)[:200]  # Return first 200 chars
+    # Parse JWPlayer setup calls as JavaScript object literals
+    configs = find_setup_configs(embed_code)
+    if not configs:
+        return None
     
-    return None
+    config = configs[0]
+    return {
+        'sources': list(iter_config_sources(config)),
+        'keys': sorted(config.keys())
+    }
+
+
+def main():
+    """Parse arguments and run the extraction."""
+    parser = argparse.ArgumentParser(description=__doc__.strip())
+    parser.add_argument('--quiet', '-q', action='store_true',
+                        help='do not print every format; show summaries only')
+    parser.add_argument('--jsonl', metavar='PATH',
+                        help='stream each analyzed format to PATH as JSON Lines instead of keeping them in memory')
+    args = parser.parse_args()
+    
+    extract_video_formats(quiet=args.quiet, jsonl_path=args.jsonl)
 
 
 if __name__ == '__main__':
-    extract_video_formats()
\ No newline at end of file
+    main()
\ No newline at end of file
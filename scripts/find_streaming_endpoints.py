@@ -8,11 +8,27 @@ import time
 import json
 import re
 import requests
+from dataclasses import asdict
 from urllib.parse import urljoin, urlparse, parse_qs
 from selenium import webdriver
 from selenium.webdriver.common.by import By
 from selenium.webdriver.chrome.options import Options
 
+# Add src to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.scrapers.youtube import YouTubeHarvester, extract_video_ids, extract_stream_formats
+
+# One harvester (and connection pool) shared by every channel and video lookup, built on first use
+_harvester = None
+
+def get_harvester():
+    """Return the shared YouTube harvester, creating it on first use."""
+    global _harvester
+    if _harvester is None:
+        _harvester = YouTubeHarvester()
+    return _harvester
+
 def investigate_youtube_streams():
     """Find YouTube channels and streaming endpoints for Senate committees."""
     
@@ -38,121 +54,36 @@ def investigate_youtube_streams():
         }
     ]
     
-    results = []
-    
     for channel in youtube_channels:
         print(f"\n📺 Investigating: {channel['name']}")
         print(f"   Primary URL: {channel['url']}")
         print(f"   Alt URL: {channel['alt_url']}")
-        
-        # Check if channels exist and get streaming info
-        channel_info = check_youtube_channel(channel)
-        results.append(channel_info)
+    
+    # Check all channels and their recent videos concurrently
+    start = time.perf_counter()
+    results = get_harvester().check_channels(youtube_channels)
+    
+    for channel_info in results:
+        status = f"{len(channel_info['recent_videos'])} videos" if channel_info['exists'] else "not found"
+        print(f"   {channel_info['name']}: {status}")
+    print(f"   Checked {len(results)} channels in {time.perf_counter() - start:.1f}s")
     
     return results
 
 def check_youtube_channel(channel):
     """Check a YouTube channel for live streams and recent videos."""
     
-    session = requests.Session()
-    session.headers.update({
-        'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36'
-    })
-    
-    channel_info = {
-        'name': channel['name'],
-        'primary_url': channel['url'],
-        'alt_url': channel['alt_url'],
-        'exists': False,
-        'live_streams': [],
-        'recent_videos': [],
-        'video_formats': []
-    }
-    
-    # Try primary URL first
-    for url in [channel['url'], channel['alt_url']]:
-        try:
-            print(f"   Checking: {url}")
-            response = session.get(url, timeout=10)
-            
-            if response.status_code == 200:
-                channel_info['exists'] = True
-                print(f"   ✅ Channel exists!")
-                
-                # Look for video IDs in the page
-                video_ids = extract_youtube_video_ids(response.text)
-                
-                if video_ids:
-                    print(f"   Found {len(video_ids)} videos")
-                    
-                    # Check first few videos for format information
-                    for video_id in video_ids[:5]:
-                        video_info = analyze_youtube_video(video_id)
-                        if video_info:
-                            channel_info['recent_videos'].append(video_info)
-                            
-                            # If it's a live stream, add to live streams
-                            if video_info.get('is_live'):
-                                channel_info['live_streams'].append(video_info)
-                
-                break
-            else:
-                print(f"   ❌ Channel not found (status: {response.status_code})")
-                
-        except Exception as e:
-            print(f"   ❌ Error checking {url}: {e}")
-            continue
-    
-    return channel_info
+    return get_harvester().check_channels([channel])[0]
 
 def extract_youtube_video_ids(html_content):
     """Extract YouTube video IDs from HTML content."""
     
-    # Common patterns for YouTube video IDs
-    patterns = [
-        r'"videoId":"([a-zA-Z0-9_-]{11})"',
-        r'watch\?v=([a-zA-Z0-9_-]{11})',
-        r'embed/([a-zA-Z0-9_-]{11})',
-        r'"watch-time":"([a-zA-Z0-9_-]{11})"'
-    ]
-    
-    video_ids = set()
-    
-    for pattern in patterns:
-        matches = re.findall(pattern, html_content)
-        video_ids.update(matches)
-    
-    return list(video_ids)
+    return extract_video_ids(html_content)
 
 def analyze_youtube_video(video_id):
     """Analyze a specific YouTube video for format information."""
     
-    video_url = f"https://www.youtube.com/watch?v={video_id}"
-    
-    try:
-        session = requests.Session()
-        session.headers.update({
-            'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36'
-        })
-        
-        response = session.get(video_url, timeout=10)
-        
-        if response.status_code == 200:
-            video_info = {
-                'video_id': video_id,
-                'url': video_url,
-                'title': extract_video_title(response.text),
-                'is_live': 'isLive":true' in response.text or 'live":true' in response.text,
-                'formats': extract_video_formats(response.text),
-                'streaming_urls': extract_streaming_urls(response.text)
-            }
-            
-            return video_info
-    
-    except Exception as e:
-        print(f"   Error analyzing video {video_id}: {e}")
-    
-    return None
+    return get_harvester().fetch_video(video_id)
 
 def extract_video_title(html_content):
     """Extract video title from YouTube page."""
@@ -173,26 +104,8 @@ def extract_video_title(html_content):
 def extract_video_formats(html_content):
     """Extract video format information from YouTube page."""
     
-    formats = []
-    
-    # Look for format information in YouTube's player config
-    format_patterns = [
-        r'"itag":(\d+).*?"mimeType":"([^"]+)".*?"quality":"([^"]+)"',
-        r'"adaptiveFormats":\[(.*?)\]',
-        r'"formats":\[(.*?)\]'
-    ]
-    
-    for pattern in format_patterns:
-        matches = re.findall(pattern, html_content, re.DOTALL)
-        for match in matches:
-            if isinstance(match, tuple):
-                formats.append({
-                    'itag': match[0] if len(match) > 0 else 'unknown',
-                    'mime_type': match[1] if len(match) > 1 else 'unknown',
-                    'quality': match[2] if len(match) > 2 else 'unknown'
-                })
-    
-    return formats
+    # Only the player response's streamingData section is decoded
+    return [asdict(fmt) for fmt in extract_stream_formats(html_content)]
 
 def extract_streaming_urls(html_content):
     """Extract actual streaming URLs from YouTube page."""
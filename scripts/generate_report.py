@@ -8,7 +8,6 @@ import json
 import sqlite3
 from datetime import datetime
 from pathlib import Path
-from collections import defaultdict, Counter
 
 # Add src to path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
@@ -64,8 +63,9 @@ def generate_report():
         report_content.append("")
     
     # Detailed committee listings
-    house_committees = db.get_committees('house')
-    senate_committees = db.get_committees('senate')
+    committees = db.get_committees()
+    house_committees = [c for c in committees if c.chamber == 'house']
+    senate_committees = [c for c in committees if c.chamber == 'senate']
     
     report_content.append("## House of Representatives Committees")
     report_content.append("")
@@ -87,33 +87,28 @@ def generate_report():
         report_content.append(f"| {committee.name} | {code} | [{url}]({url}) |")
     report_content.append("")
     
-    # Video format analysis
-    video_formats = db.get_video_formats()
-    if video_formats:
+    # Video format analysis (aggregated in SQL)
+    platform_summary = db.get_platform_summary()
+    if platform_summary:
         report_content.append("## Video Format Analysis")
         report_content.append("")
         
-        # Platform analysis
-        platform_analysis = defaultdict(list)
-        for vf in video_formats:
-            platform_analysis[vf.platform].append(vf)
+        player_type_counts = db.get_player_type_counts()
         
-        for platform, formats in platform_analysis.items():
+        for summary in platform_summary:
+            platform = summary['platform']
             report_content.append(f"### {platform.title()} Platform")
             report_content.append("")
-            report_content.append(f"- **Total instances**: {len(formats)}")
+            report_content.append(f"- **Total instances**: {summary['total']}")
             
-            # Get unique streaming URLs
-            unique_urls = set(vf.streaming_url for vf in formats if vf.streaming_url)
-            if unique_urls:
-                report_content.append(f"- **Unique streaming URLs**: {len(unique_urls)}")
+            if summary['unique_streaming_urls']:
+                report_content.append(f"- **Unique streaming URLs**: {summary['unique_streaming_urls']}")
             
-            # Get player types
-            player_types = Counter(vf.player_type for vf in formats if vf.player_type)
+            player_types = player_type_counts.get(platform, [])
             if player_types:
                 report_content.append("- **Player types**:")
-                for player_type, count in player_types.most_common():
-                    report_content.append(f"  - {player_type}: {count}")
+                for entry in player_types:
+                    report_content.append(f"  - {entry['player_type']}: {entry['count']}")
             
             report_content.append("")
     
@@ -122,31 +117,20 @@ def generate_report():
     report_content.append("")
     
     # Analyze committee website patterns
-    house_domains = set()
-    senate_domains = set()
-    
-    for committee in house_committees:
-        if committee.official_url:
-            domain = committee.official_url.split('/')[2]
-            house_domains.add(domain)
-    
-    for committee in senate_committees:
-        if committee.official_url:
-            domain = committee.official_url.split('/')[2]
-            senate_domains.add(domain)
+    domain_counts = db.get_domain_counts()
     
     report_content.append("### Website Architecture")
     report_content.append("")
     report_content.append("**House of Representatives:**")
     report_content.append("- Uses decentralized committee websites")
     report_content.append("- Each committee has its own subdomain (e.g., agriculture.house.gov)")
-    report_content.append(f"- Total unique domains: {len(house_domains)}")
+    report_content.append(f"- Total unique domains: {domain_counts.get('house', 0)}")
     report_content.append("")
     
     report_content.append("**Senate:**")
     report_content.append("- Uses centralized committee directory")
     report_content.append("- Mixed approach with both senate.gov and external domains")
-    report_content.append(f"- Total unique domains: {len(senate_domains)}")
+    report_content.append(f"- Total unique domains: {domain_counts.get('senate', 0)}")
     report_content.append("")
     
     # Scraping challenges
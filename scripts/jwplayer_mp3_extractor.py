@@ -8,12 +8,10 @@ import os
 import time
 import json
 import re
-import subprocess
 import tempfile
 from urllib.parse import urljoin, urlparse
 from selenium import webdriver
 from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.chrome.options import Options
 
@@ -21,16 +19,28 @@ from selenium.webdriver.chrome.options import Options
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
 
 from src.database.database import CongressVideoDatabase
+from src.utils.browser import MediaReadinessDetector, NetworkEventListener
+from src.media.transcoder import TranscodeScheduler, TranscodeJob, TranscodeError
+from src.utils.jwplayer import StaticJWPlayerExtractor, extract_stream_from_html, looks_like_stream_url
 
 
 class JWPlayerMP3Extractor:
     """Specialized extractor for JWPlayer-based Congress hearings."""
     
     def __init__(self, headless=True):
-        """Initialize the extractor with Selenium WebDriver."""
-        self.driver = self.setup_selenium(headless)
+        """Initialize the extractor; the WebDriver is started only when needed."""
+        self.headless = headless
+        self.driver = None
+        self.readiness = None
+        self.static_extractor = StaticJWPlayerExtractor()
+        self._last_progress_report = {}
         self.output_dir = os.path.join(os.path.dirname(__file__), '..', 'extracted_audio')
         os.makedirs(self.output_dir, exist_ok=True)
+        self.scheduler = TranscodeScheduler(
+            on_progress=self._report_progress,
+            on_complete=self._write_metadata,
+            download_dir=os.path.join(self.output_dir, '.hls_downloads')
+        )
     
     def setup_selenium(self, headless=True):
         """Set up Selenium WebDriver for JavaScript execution."""
@@ -42,12 +52,14 @@ class JWPlayerMP3Extractor:
         options.add_argument('--disable-gpu')
         options.add_argument('--window-size=1920,1080')
         
+        # Return from driver.get() at DOMContentLoaded; readiness is detected explicitly
+        options.page_load_strategy = 'eager'
+        
         # Enable performance logging to catch network requests
         options.add_argument('--enable-logging')
         options.add_argument('--log-level=0')
         
-        caps = options.to_capabilities()
-        caps['goog:loggingPrefs'] = {'performance': 'ALL'}
+        NetworkEventListener.configure_options(options)
         
         try:
             driver = webdriver.Chrome(options=options)
@@ -57,22 +69,38 @@ class JWPlayerMP3Extractor:
             print("Make sure ChromeDriver is installed: pip install webdriver-manager")
             return None
     
-    def extract_jwplayer_config(self, url, timeout=30):
-        """Extract JWPlayer configuration from a webpage."""
+    def ensure_driver(self):
+        """Start the Selenium WebDriver on first use."""
         if not self.driver:
+            self.driver = self.setup_selenium(self.headless)
+            if self.driver:
+                self.readiness = MediaReadinessDetector(self.driver)
+        return self.driver
+    
+    def extract_static_config(self, url):
+        """Extract the JWPlayer stream from plain-HTTP HTML, without a browser."""
+        print(f"Fetching page: {url}")
+        try:
+            return self.static_extractor.extract(url)
+        except Exception as e:
+            print(f"Static extraction failed for {url}: {e}")
+            return None
+    
+    def extract_jwplayer_config(self, url, timeout=10):
+        """Extract JWPlayer configuration from a webpage using the browser; timeout bounds the player wait."""
+        if not self.ensure_driver():
             return None
         
         print(f"Loading page: {url}")
         try:
+            self.readiness.reset()
             self.driver.get(url)
             
-            # Wait for page to load
-            WebDriverWait(self.driver, timeout).until(
-                lambda d: d.execute_script("return document.readyState") == "complete"
-            )
-            
-            # Give additional time for JWPlayer to initialize
-            time.sleep(5)
+            # Wait for JWPlayer, a media element or a manifest request; stop loading
+            # the rest of the page (and growing the network log) once a manifest is seen
+            ready = self.readiness.wait_for_media(timeout=timeout, stop_on_manifest=True)
+            if ready:
+                print(f"Player ready after {ready['elapsed']}s ({ready['signal']})")
             
             # Try multiple methods to extract JWPlayer config
             config = self.try_extract_methods(url)
@@ -144,55 +172,25 @@ class JWPlayerMP3Extractor:
         return None
     
     def extract_from_page_source(self):
-        """Extract from page source by parsing JavaScript."""
-        page_source = self.driver.page_source
-        
-        # Look for JWPlayer setup calls
-        patterns = [
-            r'jwplayer\([^)]*\)\.setup\(({[^}]+})\)',
-            r'playerInstance\.setup\(({[^}]+})\)',
-            r'"sources":\s*(\[[^\]]+\])',
-            r"'sources':\s*(\[[^\]]+\])",
-            r'file":\s*"([^"]+)"',
-            r"file':\s*'([^']+)'"
-        ]
-        
-        for pattern in patterns:
-            matches = re.findall(pattern, page_source, re.DOTALL)
-            for match in matches:
-                if self.looks_like_stream_url(match):
-                    return {'method': 'page_source', 'url': match}
-        
-        return None
+        """Extract from the rendered page source by parsing JavaScript."""
+        result = extract_stream_from_html(self.driver.page_source, self.driver.current_url)
+        if result:
+            result['method'] = 'page_source'
+        return result
     
     def extract_from_network_logs(self):
-        """Extract from browser network logs."""
-        logs = self.driver.get_log('performance')
-        stream_urls = []
-        
-        for log in logs:
-            try:
-                message = json.loads(log['message'])
-                if message['message']['method'] == 'Network.responseReceived':
-                    response = message['message']['params']['response']
-                    url = response['url']
-                    mime_type = response.get('mimeType', '')
-                    
-                    # Look for video/audio streams
-                    if (any(ext in url.lower() for ext in ['.mp4', '.m3u8', '.ts', '.aac', '.mp3']) or
-                        'video' in mime_type.lower() or 'audio' in mime_type.lower()):
-                        stream_urls.append({
-                            'method': 'network_logs',
-                            'url': url,
-                            'mime_type': mime_type
-                        })
-            except:
-                continue
-        
-        if stream_urls:
-            return stream_urls[0]  # Return first found stream
+        """Extract from media responses captured on the CDP network stream."""
+        events = self.readiness.network_events()
+        if not events:
+            return None
         
-        return None
+        # Prefer a manifest over individual media files or segments
+        event = next((e for e in events if e['type'] == 'manifest'), events[0])
+        return {
+            'method': 'network_logs',
+            'url': event['url'],
+            'mime_type': event['mime_type']
+        }
     
     def extract_from_dom_search(self):
         """Search DOM for video/audio elements and data attributes."""
@@ -251,65 +249,82 @@ class JWPlayerMP3Extractor:
     
     def looks_like_stream_url(self, text):
         """Check if text looks like a streaming URL."""
-        if not isinstance(text, str):
-            return False
+        return looks_like_stream_url(text)
+    
+    def _report_progress(self, job):
+        """Print ffmpeg progress for a job at most every 15 seconds."""
+        now = time.monotonic()
+        if now - self._last_progress_report.get(job.name, 0) >= 15:
+            self._last_progress_report[job.name] = now
+            print(f"[ffmpeg] {job.name}: {job.progress_seconds:.0f}s of audio extracted "
+                  f"(speed {job.speed or 'n/a'})")
+    
+    def _write_metadata(self, job):
+        """Save extraction metadata next to the output file once a job succeeds."""
+        if job.status != 'done':
+            print(f"FFmpeg failed for {job.name} after {job.attempts} attempt(s): {job.error}")
+            return
+        
+        print(f"Successfully extracted audio to: {job.output_path}")
+        if not job.metadata:
+            return
+        
+        metadata = dict(job.metadata)
+        metadata['output_file'] = job.output_path
+        metadata['ffmpeg_attempts'] = job.attempts
+        metadata['extraction_seconds'] = round(job.finished_at - job.started_at, 1)
+        metadata['extraction_strategy'] = job.strategy
+        metadata['source_audio'] = job.source_info
+        metadata['downloaded_locally'] = bool(job.local_source)
+        metadata['timestamp'] = time.strftime('%Y-%m-%d %H:%M:%S')
+        
+        metadata_file = os.path.splitext(job.output_path)[0] + '_metadata.json'
+        with open(metadata_file, 'w') as f:
+            json.dump(metadata, f, indent=2)
+    
+    def submit_audio_extraction(self, stream_url, output_filename, metadata=None):
+        """Queue audio extraction on the transcoding scheduler and return a Future."""
+        if not stream_url:
+            return None
         
-        stream_indicators = [
-            '.mp4', '.m3u8', '.ts', '.aac', '.mp3', '.wav',
-            'manifest', 'playlist', 'stream'
-        ]
+        print(f"Queueing audio extraction from: {stream_url}")
         
-        return any(indicator in text.lower() for indicator in stream_indicators)
+        job = TranscodeJob(
+            source_url=stream_url,
+            output_path=os.path.join(self.output_dir, f"{output_filename}.mp3"),
+            name=output_filename,
+            metadata=metadata or {},
+            probe_source=True
+        )
+        return self.scheduler.submit(job)
     
     def extract_audio_with_ffmpeg(self, stream_url, output_filename):
-        """Extract audio from stream URL using ffmpeg."""
-        if not stream_url:
+        """Extract audio from stream URL using ffmpeg, blocking until it finishes."""
+        future = self.submit_audio_extraction(stream_url, output_filename)
+        if not future:
             return None
         
-        print(f"Extracting audio from: {stream_url}")
-        
-        # Create output path
-        output_path = os.path.join(self.output_dir, f"{output_filename}.mp3")
-        
-        # FFmpeg command
-        cmd = [
-            'ffmpeg',
-            '-i', stream_url,
-            '-vn',  # No video
-            '-acodec', 'mp3',
-            '-ab', '192k',  # 192kbps bitrate
-            '-ar', '44100',  # Sample rate
-            '-y',  # Overwrite output
-            output_path
-        ]
-        
         try:
-            print(f"Running: {' '.join(cmd)}")
-            result = subprocess.run(cmd, capture_output=True, text=True, timeout=300)
-            
-            if result.returncode == 0:
-                print(f"Successfully extracted audio to: {output_path}")
-                return output_path
-            else:
-                print(f"FFmpeg error: {result.stderr}")
-                return None
-                
-        except subprocess.TimeoutExpired:
-            print("FFmpeg timeout - file may be too large")
-            return None
-        except Exception as e:
-            print(f"FFmpeg exception: {e}")
+            return future.result()
+        except TranscodeError as e:
+            print(f"FFmpeg error: {e}")
             return None
     
     def process_committee_url(self, committee_name, committee_url):
-        """Process a single committee URL for video extraction."""
+        """Discover a committee's stream and queue its audio extraction.
+        
+        Returns a Future for the extracted MP3 path, or None if no stream was found.
+        Extraction runs in the background while the next committee is discovered.
+        """
         print(f"\n{'='*60}")
         print(f"Processing: {committee_name}")
         print(f"URL: {committee_url}")
         print(f"{'='*60}")
         
-        # Extract JWPlayer config
-        config = self.extract_jwplayer_config(committee_url)
+        # Try the static tier first; only load the page in Chrome if it fails
+        config = self.extract_static_config(committee_url)
+        if not config:
+            config = self.extract_jwplayer_config(committee_url)
         
         if not config:
             print(f"No video streams found for {committee_name}")
@@ -317,31 +332,19 @@ class JWPlayerMP3Extractor:
         
         print(f"Found stream with method: {config.get('method', 'unknown')}")
         
-        # Extract audio
         stream_url = config.get('url')
-        if stream_url:
-            # Create safe filename
-            safe_name = re.sub(r'[^\w\-_\.]', '_', committee_name)
-            output_file = self.extract_audio_with_ffmpeg(stream_url, safe_name)
-            
-            if output_file:
-                # Save metadata
-                metadata = {
-                    'committee': committee_name,
-                    'source_url': committee_url,
-                    'stream_url': stream_url,
-                    'extraction_method': config.get('method'),
-                    'output_file': output_file,
-                    'timestamp': time.strftime('%Y-%m-%d %H:%M:%S')
-                }
-                
-                metadata_file = output_file.replace('.mp3', '_metadata.json')
-                with open(metadata_file, 'w') as f:
-                    json.dump(metadata, f, indent=2)
-                
-                return output_file
+        if not stream_url:
+            return None
         
-        return None
+        # Create safe filename
+        safe_name = re.sub(r'[^\w\-_\.]', '_', committee_name)
+        metadata = {
+            'committee': committee_name,
+            'source_url': committee_url,
+            'stream_url': stream_url,
+            'extraction_method': config.get('method')
+        }
+        return self.submit_audio_extraction(stream_url, safe_name, metadata)
     
     def process_all_committees(self):
         """Process all committees from the database."""
@@ -355,37 +358,38 @@ class JWPlayerMP3Extractor:
         
         success_count = 0
         results = []
+        pending = []
         
         for committee in committees[:5]:  # Test with first 5 committees
+            result = {
+                'committee': committee.name,
+                'chamber': committee.chamber,
+                'success': False,
+                'output_file': None
+            }
+            results.append(result)
+            
             try:
-                result = self.process_committee_url(committee.name, committee.official_url)
-                if result:
-                    success_count += 1
-                    results.append({
-                        'committee': committee.name,
-                        'chamber': committee.chamber,
-                        'success': True,
-                        'output_file': result
-                    })
-                else:
-                    results.append({
-                        'committee': committee.name,
-                        'chamber': committee.chamber,
-                        'success': False,
-                        'output_file': None
-                    })
+                future = self.process_committee_url(committee.name, committee.official_url)
+                if future:
+                    pending.append((result, future))
                 
-                # Respectful delay between requests
+                # Respectful delay between requests; queued extractions keep running
                 time.sleep(3)
                 
             except Exception as e:
                 print(f"Error processing {committee.name}: {e}")
-                results.append({
-                    'committee': committee.name,
-                    'chamber': committee.chamber,
-                    'success': False,
-                    'error': str(e)
-                })
+                result['error'] = str(e)
+        
+        # Wait for the extractions still running in the background
+        print(f"\nWaiting for {len(pending)} audio extraction(s) to finish...")
+        for result, future in pending:
+            try:
+                result['output_file'] = future.result()
+                result['success'] = True
+                success_count += 1
+            except TranscodeError as e:
+                result['error'] = str(e)
         
         print(f"\n{'='*60}")
         print(f"EXTRACTION COMPLETE")
@@ -400,6 +404,7 @@ class JWPlayerMP3Extractor:
     
     def cleanup(self):
         """Clean up resources."""
+        self.scheduler.shutdown(wait=False)
         if self.driver:
             self.driver.quit()
 
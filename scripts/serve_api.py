@@ -0,0 +1,37 @@
+#!/usr/bin/env python3
+"""
+Serve the index database over a read-only JSON HTTP API.
+"""
+import sys
+import os
+import argparse
+
+from aiohttp import web
+
+# Add src to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.api.server import IndexQueryAPI
+
+
+def main():
+    """Run the query API until interrupted."""
+    default_db = os.path.join(os.path.dirname(__file__), '..', 'data', 'congress_video.db')
+
+    parser = argparse.ArgumentParser(description=__doc__.strip())
+    parser.add_argument('--db', default=default_db, help='database file to serve')
+    parser.add_argument('--host', default='127.0.0.1', help='address to bind (default: 127.0.0.1)')
+    parser.add_argument('--port', type=int, default=8080, help='port to bind (default: 8080)')
+    parser.add_argument('--cache-size', type=int, default=512, help='cached responses kept in memory')
+    parser.add_argument('--cache-ttl', type=float, default=60.0, help='seconds a cached response stays fresh')
+    parser.add_argument('--workers', type=int, default=4, help='query threads')
+    args = parser.parse_args()
+
+    api = IndexQueryAPI(args.db, cache_size=args.cache_size, cache_ttl=args.cache_ttl,
+                        max_workers=args.workers)
+    print(f"Serving {args.db} on http://{args.host}:{args.port}")
+    web.run_app(api.create_app(), host=args.host, port=args.port, print=None)
+
+
+if __name__ == '__main__':
+    main()
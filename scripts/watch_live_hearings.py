@@ -0,0 +1,50 @@
+#!/usr/bin/env python3
+"""
+Watch scheduled hearings and mark them live (and completed) as their streams start and end.
+"""
+import sys
+import os
+import asyncio
+import argparse
+from datetime import datetime
+
+# Add src to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.database.database import CongressVideoDatabase
+from src.monitoring.live_watcher import LiveHearingWatcher
+
+
+def main():
+    """Run the live hearing watcher until interrupted."""
+    parser = argparse.ArgumentParser(description=__doc__.strip())
+    parser.add_argument('--duration', type=float, default=None,
+                        help='stop after this many seconds (default: run until interrupted)')
+    parser.add_argument('--concurrency', type=int, default=100,
+                        help='maximum concurrent requests (default: 100)')
+    parser.add_argument('--horizon-hours', type=float, default=48,
+                        help='watch hearings starting within this many hours (default: 48)')
+    args = parser.parse_args()
+
+    print("Starting live hearing watcher...")
+    print(f"Timestamp: {datetime.now()}")
+
+    db_path = os.path.join(os.path.dirname(__file__), '..', 'data', 'congress_video.db')
+    db = CongressVideoDatabase(db_path)
+
+    watcher = LiveHearingWatcher(db, max_concurrency=args.concurrency, horizon_hours=args.horizon_hours)
+
+    try:
+        asyncio.run(watcher.run(duration=args.duration))
+    except KeyboardInterrupt:
+        print("\nWatcher interrupted by user")
+
+    print(f"\nWatcher stats: {watcher.stats}")
+    live = db.get_live_hearings()
+    print(f"Hearings currently live: {len(live)}")
+    for hearing in live:
+        print(f"  - {hearing.title} ({hearing.video_url})")
+
+
+if __name__ == '__main__':
+    main()
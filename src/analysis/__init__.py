@@ -0,0 +1 @@
+# Vectorised analytics over the index (pandas)
\ No newline at end of file
@@ -0,0 +1,125 @@
+"""
+Columnar (Parquet) export of the index.
+
+Each table is written as a Hive-partitioned Parquet dataset
+(``<table>/chamber=<chamber>/month=<YYYY-MM>/...``) so query engines can prune
+partitions and push predicates down instead of re-parsing JSON. Label columns
+are categoricals and every string column is dictionary-encoded in the files.
+Each table is written with a fixed Arrow schema, so partitions from different
+runs can be read as one dataset.
+"""
+import os
+import shutil
+from typing import Dict, List, Optional
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from src.database.database import CongressVideoDatabase
+from src.analysis.frames import load_table
+
+
+UNKNOWN_PARTITION = 'unknown'
+
+# Columns each table is partitioned by; committee-level tables have no month
+PARTITION_COLUMNS: Dict[str, List[str]] = {
+    'committees': ['chamber'],
+    'subcommittees': ['chamber'],
+    'hearings': ['chamber', 'month'],
+    'video_formats': ['chamber', 'month'],
+}
+
+
+# Fixed Arrow schemas, so files written on different runs agree whatever values (or
+# empty columns) a run happened to see
+LABEL = pa.dictionary(pa.int32(), pa.string())
+TIMESTAMP = pa.timestamp('us')
+
+EXPORT_SCHEMAS: Dict[str, pa.Schema] = {
+    'committees': pa.schema([
+        ('id', pa.int64()), ('name', pa.string()), ('chamber', pa.string()), ('official_url', pa.string()),
+        ('committee_code', pa.string()), ('created_at', TIMESTAMP), ('updated_at', TIMESTAMP),
+    ]),
+    'subcommittees': pa.schema([
+        ('id', pa.int64()), ('name', pa.string()), ('parent_committee_id', pa.int64()),
+        ('official_url', pa.string()), ('subcommittee_code', pa.string()), ('created_at', TIMESTAMP),
+        ('updated_at', TIMESTAMP), ('chamber', pa.string()),
+    ]),
+    'hearings': pa.schema([
+        ('id', pa.int64()), ('committee_id', pa.int64()), ('subcommittee_id', pa.int64()),
+        ('title', pa.string()), ('hearing_date', TIMESTAMP), ('hearing_url', pa.string()),
+        ('video_url', pa.string()), ('is_live', pa.bool_()), ('status', LABEL), ('created_at', TIMESTAMP),
+        ('updated_at', TIMESTAMP), ('chamber', pa.string()), ('month', pa.string()),
+    ]),
+    'video_formats': pa.schema([
+        ('id', pa.int64()), ('hearing_id', pa.int64()), ('platform', LABEL), ('video_id', pa.string()),
+        ('streaming_url', pa.string()), ('resolution', LABEL), ('codec', LABEL),
+        ('streaming_protocol', LABEL), ('player_type', LABEL), ('embed_hash', pa.string()),
+        ('created_at', TIMESTAMP), ('updated_at', TIMESTAMP), ('chamber', pa.string()), ('month', pa.string()),
+    ]),
+}
+
+
+def _month(dates: pd.Series) -> pd.Series:
+    """Format dates as YYYY-MM partition values."""
+    return dates.dt.strftime('%Y-%m').fillna(UNKNOWN_PARTITION)
+
+
+def build_export_frames(db: CongressVideoDatabase) -> Dict[str, pd.DataFrame]:
+    """Load every exported table with its chamber and month partition columns attached."""
+    committees = load_table(db, 'committees')
+    subcommittees = load_table(db, 'subcommittees')
+    hearings = load_table(db, 'hearings')
+    video_formats = load_table(db, 'video_formats')
+
+    chamber_by_committee = committees['chamber']
+    subcommittees['chamber'] = subcommittees['parent_committee_id'].map(chamber_by_committee)
+
+    # Hearings filed under a subcommittee take the parent committee's chamber
+    committee_ids = hearings['committee_id'].fillna(
+        hearings['subcommittee_id'].map(subcommittees['parent_committee_id'])
+    )
+    hearings['chamber'] = committee_ids.map(chamber_by_committee)
+    hearings['month'] = _month(hearings['hearing_date'])
+
+    video_formats['chamber'] = video_formats['hearing_id'].map(hearings['chamber'])
+    video_formats['month'] = video_formats['hearing_id'].map(hearings['month'])
+
+    frames = {
+        'committees': committees,
+        'subcommittees': subcommittees,
+        'hearings': hearings,
+        'video_formats': video_formats,
+    }
+    for frame in frames.values():
+        for column in ('chamber', 'month'):
+            if column in frame:
+                frame[column] = frame[column].astype(object).fillna(UNKNOWN_PARTITION)
+    return frames
+
+
+def export_parquet(db: CongressVideoDatabase, output_dir: str,
+                   tables: Optional[List[str]] = None,
+                   compression: str = 'zstd') -> Dict[str, int]:
+    """Write tables as partitioned Parquet datasets, replacing earlier exports; returns row counts."""
+    frames = build_export_frames(db)
+    counts = {}
+    for table in tables or list(PARTITION_COLUMNS):
+        frame = frames[table].reset_index()
+        table_dir = os.path.join(output_dir, table)
+        if os.path.isdir(table_dir):
+            shutil.rmtree(table_dir)
+        os.makedirs(table_dir, exist_ok=True)
+
+        if not frame.empty:
+            arrow_table = pa.Table.from_pandas(frame, schema=EXPORT_SCHEMAS[table], preserve_index=False)
+            pq.write_to_dataset(
+                arrow_table,
+                table_dir,
+                partition_cols=PARTITION_COLUMNS[table],
+                compression=compression,
+                use_dictionary=True,
+            )
+        counts[table] = len(frame)
+    return counts
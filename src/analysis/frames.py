@@ -0,0 +1,152 @@
+"""
+Typed DataFrames over the index database and the standard breakdowns.
+
+Tables are read with one query each straight into columnar frames. Low
+cardinality labels (platform, chamber, player type, status, protocol) are
+stored as categoricals, so group-bys run on integer codes rather than Python
+strings.
+"""
+from typing import Dict, List, Optional
+
+import pandas as pd
+
+from src.database.database import CongressVideoDatabase
+
+
+CATEGORICAL_COLUMNS: Dict[str, List[str]] = {
+    'committees': ['chamber'],
+    'subcommittees': [],
+    'hearings': ['status'],
+    'video_formats': ['platform', 'player_type', 'streaming_protocol', 'codec', 'resolution'],
+}
+
+DATE_COLUMNS: Dict[str, List[str]] = {
+    'committees': ['created_at', 'updated_at'],
+    'subcommittees': ['created_at', 'updated_at'],
+    'hearings': ['hearing_date', 'created_at', 'updated_at'],
+    'video_formats': ['created_at', 'updated_at'],
+}
+
+# Analytic columns only; embed code and technical details stay in the database
+TABLE_COLUMNS: Dict[str, str] = {
+    'committees': 'id, name, chamber, official_url, committee_code, created_at, updated_at',
+    'subcommittees': 'id, name, parent_committee_id, official_url, subcommittee_code, created_at, updated_at',
+    'hearings': ('id, committee_id, subcommittee_id, title, hearing_date, hearing_url, video_url, '
+                 'is_live, status, created_at, updated_at'),
+    'video_formats': ('id, hearing_id, platform, video_id, streaming_url, resolution, codec, '
+                      'streaming_protocol, player_type, embed_hash, created_at, updated_at'),
+}
+
+FORMAT_CONTEXT_QUERY = '''
+    SELECT vf.id, vf.hearing_id, vf.platform, vf.player_type, vf.streaming_protocol,
+           vf.codec, vf.resolution, vf.streaming_url, vf.video_id,
+           h.hearing_date, h.status, h.is_live,
+           c.id AS committee_id, c.name AS committee, c.chamber
+    FROM video_formats vf
+    LEFT JOIN hearings h ON h.id = vf.hearing_id
+    LEFT JOIN subcommittees s ON s.id = h.subcommittee_id
+    LEFT JOIN committees c ON c.id = COALESCE(h.committee_id, s.parent_committee_id)
+'''
+
+HEARING_CONTEXT_QUERY = '''
+    SELECT h.id, h.hearing_date, h.status, h.is_live,
+           c.id AS committee_id, c.name AS committee, c.chamber,
+           EXISTS (SELECT 1 FROM video_formats vf WHERE vf.hearing_id = h.id) AS has_video
+    FROM hearings h
+    LEFT JOIN subcommittees s ON s.id = h.subcommittee_id
+    LEFT JOIN committees c ON c.id = COALESCE(h.committee_id, s.parent_committee_id)
+'''
+
+
+def _apply_types(frame: pd.DataFrame, categorical: List[str], dates: List[str]) -> pd.DataFrame:
+    """Convert label columns to categoricals, dates to datetimes and flags to booleans."""
+    for column in categorical:
+        if column in frame:
+            # Through the string dtype, so categories are strings even when every value is empty
+            frame[column] = frame[column].astype('string').replace('', pd.NA).astype('category')
+    for column in dates:
+        if column in frame:
+            frame[column] = pd.to_datetime(frame[column], errors='coerce', format='mixed')
+    for column in ('is_live', 'has_video'):
+        if column in frame:
+            frame[column] = frame[column].fillna(0).astype(bool)
+    return frame
+
+
+def _read(db: CongressVideoDatabase, query: str, params=None) -> pd.DataFrame:
+    """Run a query into a DataFrame."""
+    with db.get_connection() as conn:
+        return pd.read_sql_query(query, conn, params=params)
+
+
+def load_table(db: CongressVideoDatabase, table: str) -> pd.DataFrame:
+    """Load one table as a typed DataFrame indexed by id."""
+    if table not in TABLE_COLUMNS:
+        raise ValueError(f"Unknown table: {table}")
+
+    columns = [column.strip() for column in TABLE_COLUMNS[table].split(',')]
+    present = set(_read(db, f'PRAGMA table_info({table})')['name'])
+    frame = _read(db, f"SELECT {', '.join(c for c in columns if c in present)} FROM {table}")
+    # Columns added by later migrations are empty on older databases opened read-only
+    for column in columns:
+        if column not in present:
+            frame[column] = None
+    frame = _apply_types(frame.reindex(columns=columns), CATEGORICAL_COLUMNS[table], DATE_COLUMNS[table])
+    return frame.set_index('id')
+
+
+def load_format_frame(db: CongressVideoDatabase, platform: Optional[str] = None) -> pd.DataFrame:
+    """Load video formats joined with their hearing date/status and committee."""
+    query = FORMAT_CONTEXT_QUERY
+    params = None
+    if platform:
+        query += ' WHERE vf.platform = ?'
+        params = (platform,)
+
+    frame = _read(db, query, params)
+    return _apply_types(
+        frame,
+        CATEGORICAL_COLUMNS['video_formats'] + ['status', 'chamber', 'committee'],
+        ['hearing_date'],
+    ).set_index('id')
+
+
+def load_hearing_frame(db: CongressVideoDatabase) -> pd.DataFrame:
+    """Load hearings with their committee and whether any video format was found."""
+    frame = _read(db, HEARING_CONTEXT_QUERY)
+    return _apply_types(frame, ['status', 'chamber', 'committee'], ['hearing_date']).set_index('id')
+
+
+def platform_breakdown(formats: pd.DataFrame,
+                       by: tuple = ('chamber', 'committee', 'platform')) -> pd.Series:
+    """Count formats per chamber, committee and platform (or any subset of those)."""
+    counts = formats.groupby(list(by), observed=True).size()
+    return counts[counts > 0].sort_values(ascending=False)
+
+
+def platform_by_chamber(formats: pd.DataFrame) -> pd.DataFrame:
+    """Format counts as a platform × chamber table."""
+    return formats.pivot_table(index='platform', columns='chamber', values='hearing_id',
+                               aggfunc='size', fill_value=0, observed=True)
+
+
+def coverage_over_time(hearings: pd.DataFrame, freq: str = 'MS',
+                       by: Optional[str] = None) -> pd.DataFrame:
+    """Hearings, hearings with video and coverage ratio per period (optionally per chamber)."""
+    dated = hearings.dropna(subset=['hearing_date'])
+    keys = [pd.Grouper(key='hearing_date', freq=freq)]
+    if by:
+        keys.append(by)
+
+    coverage = dated.groupby(keys, observed=True)['has_video'].agg(hearings='size', with_video='sum')
+    coverage['coverage'] = coverage['with_video'] / coverage['hearings']
+    return coverage[coverage['hearings'] > 0]
+
+
+def protocol_mix(formats: pd.DataFrame, by: str = 'chamber') -> pd.DataFrame:
+    """Share of each streaming protocol within each group (rows sum to 1)."""
+    protocols = formats['streaming_protocol']
+    if 'unknown' not in protocols.cat.categories:
+        protocols = protocols.cat.add_categories(['unknown'])
+    protocols = protocols.fillna('unknown')
+    return pd.crosstab(formats[by], protocols, normalize='index')
@@ -0,0 +1 @@
+# Read-only HTTP query API over the index
\ No newline at end of file
@@ -0,0 +1,244 @@
+"""
+Read-only HTTP query API over the index database.
+
+Queries run on a small thread pool against a ``mode=ro`` connection, so the
+API never contends with scrapers or the live watcher for the SQLite write
+lock. Serialised responses are kept in an in-process LRU keyed by path and
+query string and invalidated when the database file changes; every response
+carries a content ETag and conditional requests are answered with 304.
+Concurrent misses for the same key share one query.
+"""
+import asyncio
+import hashlib
+import json
+import os
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from aiohttp import web
+
+from src.database.database import CongressVideoDatabase
+
+
+CHAMBERS = ('house', 'senate')
+
+
+@dataclass
+class CachedResponse:
+    """A serialised JSON body with its validator."""
+    body: bytes
+    etag: str
+    generation: Tuple[int, ...]
+    expires: float
+
+
+def make_etag(body: bytes) -> str:
+    """Strong ETag for a response body."""
+    return '"' + hashlib.blake2b(body, digest_size=12).hexdigest() + '"'
+
+
+def etag_matches(header: Optional[str], etag: str) -> bool:
+    """Check an If-None-Match header against an ETag."""
+    if not header:
+        return False
+    candidates = [value.strip() for value in header.split(',')]
+    return '*' in candidates or etag in candidates or f'W/{etag}' in candidates
+
+
+def parse_date_param(request: web.Request, name: str) -> Optional[datetime]:
+    """Read an ISO date/datetime query parameter, rejecting malformed values."""
+    value = request.query.get(name)
+    if not value:
+        return None
+    try:
+        return datetime.fromisoformat(value)
+    except ValueError:
+        raise web.HTTPBadRequest(text=f"Invalid {name}: expected ISO date, got {value!r}")
+
+
+def parse_end_param(request: web.Request) -> Tuple[Optional[datetime], bool]:
+    """Read the end query parameter as (bound, exclusive).
+
+    A date-only end covers that whole day, so it becomes an exclusive bound at
+    the next midnight; a datetime end is inclusive.
+    """
+    end = parse_date_param(request, 'end')
+    if end is not None and 'T' not in request.query['end'] and ' ' not in request.query['end']:
+        return end + timedelta(days=1), True
+    return end, False
+
+
+def parse_chamber_param(request: web.Request) -> Optional[str]:
+    """Read and validate the chamber query parameter."""
+    chamber = request.query.get('chamber')
+    if chamber and chamber not in CHAMBERS:
+        raise web.HTTPBadRequest(text=f"Invalid chamber: {chamber!r}")
+    return chamber or None
+
+
+class IndexQueryAPI:
+    """aiohttp application serving committees, hearings, formats and live hearings."""
+
+    def __init__(self, db_path: str, cache_size: int = 512, cache_ttl: float = 60.0,
+                 live_ttl: float = 5.0, max_workers: int = 4):
+        """Open the database read-only; TTLs are in seconds."""
+        if not os.path.exists(db_path):
+            raise FileNotFoundError(f"Database not found: {db_path}")
+
+        self.db_path = db_path
+        self.db = CongressVideoDatabase(db_path, read_only=True)
+        self.cache_size = cache_size
+        self.cache_ttl = cache_ttl
+        self.live_ttl = live_ttl
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='index-api')
+
+        self._cache: 'OrderedDict[str, CachedResponse]' = OrderedDict()
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self.stats = {'requests': 0, 'cache_hits': 0, 'not_modified': 0, 'queries': 0}
+
+    def _generation(self) -> Tuple[int, ...]:
+        """Modification stamp of the database (and its WAL) used to invalidate the cache."""
+        stamp = []
+        for path in (self.db_path, self.db_path + '-wal'):
+            try:
+                stat = os.stat(path)
+                stamp.extend((stat.st_mtime_ns, stat.st_size))
+            except FileNotFoundError:
+                stamp.extend((0, 0))
+        return tuple(stamp)
+
+    def _lookup(self, key: str, generation: Tuple[int, ...]) -> Optional[CachedResponse]:
+        """Return a fresh cached response and mark it recently used."""
+        entry = self._cache.get(key)
+        if entry is None:
+            return None
+        if entry.generation != generation or entry.expires < time.monotonic():
+            del self._cache[key]
+            return None
+        self._cache.move_to_end(key)
+        return entry
+
+    def _store(self, key: str, entry: CachedResponse):
+        """Insert a response, evicting the least recently used beyond cache_size."""
+        self._cache[key] = entry
+        self._cache.move_to_end(key)
+        while len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+
+    def _run_query(self, query: Callable[[], Any]) -> bytes:
+        """Run a query and serialise its result (executor thread)."""
+        return json.dumps(query(), default=str, separators=(',', ':')).encode('utf-8')
+
+    async def _cached(self, key: str, query: Callable[[], Any], ttl: float) -> CachedResponse:
+        """Serve from the cache or run the query once for all concurrent callers."""
+        generation = self._generation()
+        entry = self._lookup(key, generation)
+        if entry:
+            self.stats['cache_hits'] += 1
+            return entry
+
+        pending = self._inflight.get(key)
+        if pending:
+            return await asyncio.shield(pending)
+
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._inflight[key] = future
+        try:
+            self.stats['queries'] += 1
+            body = await loop.run_in_executor(self.executor, self._run_query, query)
+            entry = CachedResponse(body=body, etag=make_etag(body), generation=generation,
+                                   expires=time.monotonic() + ttl)
+            self._store(key, entry)
+            future.set_result(entry)
+            return entry
+        except Exception as e:
+            future.set_exception(e)
+            # Mark it retrieved so it is not logged when no other request was waiting
+            future.exception()
+            raise
+        finally:
+            del self._inflight[key]
+
+    async def _respond(self, request: web.Request, query: Callable[[], Any],
+                       ttl: Optional[float] = None) -> web.Response:
+        """Build a JSON response (or 304) for a query, using the cache."""
+        self.stats['requests'] += 1
+        ttl = self.cache_ttl if ttl is None else ttl
+        entry = await self._cached(request.path_qs, query, ttl)
+
+        headers = {'ETag': entry.etag, 'Cache-Control': f'public, max-age={int(ttl)}'}
+        if etag_matches(request.headers.get('If-None-Match'), entry.etag):
+            self.stats['not_modified'] += 1
+            return web.Response(status=304, headers=headers)
+        return web.Response(body=entry.body, content_type='application/json', headers=headers)
+
+    # Handlers
+
+    async def committees(self, request: web.Request) -> web.Response:
+        """GET /committees?chamber=house|senate"""
+        chamber = parse_chamber_param(request)
+        return await self._respond(
+            request, lambda: [asdict(c) for c in self.db.get_committees(chamber)]
+        )
+
+    async def hearings(self, request: web.Request) -> web.Response:
+        """GET /hearings?start=YYYY-MM-DD&end=YYYY-MM-DD&chamber=..."""
+        start = parse_date_param(request, 'start')
+        end, end_exclusive = parse_end_param(request)
+        chamber = parse_chamber_param(request)
+        return await self._respond(
+            request,
+            lambda: [asdict(h) for h in self.db.get_hearings_between(start, end, chamber, end_exclusive)]
+        )
+
+    async def live_hearings(self, request: web.Request) -> web.Response:
+        """GET /hearings/live"""
+        return await self._respond(
+            request, lambda: [asdict(h) for h in self.db.get_live_hearings()], ttl=self.live_ttl
+        )
+
+    def _formats(self, platform: Optional[str], chamber: Optional[str]):
+        """Formats with hearing and committee summaries, without embed code."""
+        results = []
+        for vf, hearing, committee in self.db.get_video_formats_with_context(
+                platform=platform, chamber=chamber, include_embed_code=False):
+            record = asdict(vf)
+            del record['embed_code']
+            record['accessibility_features'] = vf.get_accessibility_features()
+            record['technical_details'] = vf.get_technical_details()
+            record['hearing'] = {'id': hearing.id, 'title': hearing.title,
+                                 'hearing_date': hearing.hearing_date} if hearing else None
+            record['committee'] = {'id': committee.id, 'name': committee.name,
+                                   'chamber': committee.chamber} if committee else None
+            results.append(record)
+        return results
+
+    async def formats(self, request: web.Request) -> web.Response:
+        """GET /formats?platform=youtube&chamber=..."""
+        platform = request.query.get('platform') or None
+        chamber = parse_chamber_param(request)
+        return await self._respond(request, lambda: self._formats(platform, chamber))
+
+    async def health(self, request: web.Request) -> web.Response:
+        """GET /health (never cached)"""
+        return web.json_response({'status': 'ok', 'cached_responses': len(self._cache), **self.stats})
+
+    async def _shutdown(self, app: web.Application):
+        """Stop the query threads."""
+        self.executor.shutdown(wait=False)
+
+    def create_app(self) -> web.Application:
+        """Build the aiohttp application."""
+        app = web.Application()
+        app.router.add_get('/committees', self.committees)
+        app.router.add_get('/hearings', self.hearings)
+        app.router.add_get('/hearings/live', self.live_hearings)
+        app.router.add_get('/formats', self.formats)
+        app.router.add_get('/health', self.health)
+        app.on_cleanup.append(self._shutdown)
+        return app
@@ -3,21 +3,41 @@ Database operations for Congress video format tracking system.
 """
 import sqlite3
 import os
+import json
 from datetime import datetime
-from typing import List, Optional, Dict, Any
+from urllib.parse import urlsplit
+from typing import List, Optional, Dict, Any, Iterator, Tuple
 from contextlib import contextmanager
 
-from src.database.models import Committee, Subcommittee, Hearing, VideoFormat, ScrapeLog
+from src.database.models import Committee, Subcommittee, Hearing, VideoFormat, ScrapeLog, embed_code_hash
+from src.utils.metrics import MetricsRegistry, METRICS
+
+
+def url_domain(url: Optional[str]) -> Optional[str]:
+    """Return the host part of a URL (registered as the url_domain() SQL function)."""
+    if not url:
+        return None
+    return urlsplit(url).netloc.lower() or None
 
 
 class CongressVideoDatabase:
     """Database manager for Congress video format tracking."""
     
-    def __init__(self, db_path: str = "data/congress_video.db"):
-        """Initialize database with given path."""
+    def __init__(self, db_path: str = "data/congress_video.db", read_only: bool = False,
+                 metrics: Optional[MetricsRegistry] = None):
+        """Initialize database with given path.
+        
+        With read_only=True the existing database is opened with SQLite's
+        mode=ro and the schema is left untouched, so readers never take the
+        write lock; reads also work on databases from before the embed_blobs
+        migration.
+        """
         self.db_path = db_path
-        self.ensure_database_exists()
-        self.create_tables()
+        self.read_only = read_only
+        self.metrics = metrics or METRICS
+        if not read_only:
+            self.ensure_database_exists()
+            self.create_tables()
     
     def ensure_database_exists(self):
         """Ensure the database directory exists."""
@@ -26,8 +46,12 @@ class CongressVideoDatabase:
     @contextmanager
     def get_connection(self):
         """Get database connection with automatic cleanup."""
-        conn = sqlite3.connect(self.db_path)
+        if self.read_only:
+            conn = sqlite3.connect(f"file:{os.path.abspath(self.db_path)}?mode=ro", uri=True)
+        else:
+            conn = sqlite3.connect(self.db_path)
         conn.row_factory = sqlite3.Row
+        conn.create_function('url_domain', 1, url_domain, deterministic=True)
         try:
             yield conn
         finally:
@@ -101,12 +125,26 @@ class CongressVideoDatabase:
                     player_type TEXT,
                     accessibility_features TEXT,
                     technical_details TEXT,
+                    embed_hash TEXT,
                     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
                     updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    FOREIGN KEY (hearing_id) REFERENCES hearings (id)
+                    FOREIGN KEY (hearing_id) REFERENCES hearings (id),
+                    FOREIGN KEY (embed_hash) REFERENCES embed_blobs (hash)
+                )
+            ''')
+            
+            # Embed code blobs, stored once per distinct content
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS embed_blobs (
+                    hash TEXT PRIMARY KEY,
+                    content TEXT NOT NULL,
+                    size INTEGER NOT NULL,
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
                 )
             ''')
             
+            self._migrate_embed_blobs(cursor)
+            
             # Scrape logs table
             cursor.execute('''
                 CREATE TABLE IF NOT EXISTS scrape_logs (
@@ -121,6 +159,23 @@ class CongressVideoDatabase:
                 )
             ''')
             
+            # Per-run stage timing histograms and counters
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS metrics (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    run_id TEXT NOT NULL,
+                    name TEXT NOT NULL,
+                    kind TEXT NOT NULL CHECK(kind IN ('histogram', 'counter')),
+                    labels TEXT,
+                    count INTEGER,
+                    sum REAL,
+                    min REAL,
+                    max REAL,
+                    buckets TEXT,
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                )
+            ''')
+            
             # Create indexes for better performance
             cursor.execute('CREATE INDEX IF NOT EXISTS idx_committees_chamber ON committees(chamber)')
             cursor.execute('CREATE INDEX IF NOT EXISTS idx_committees_code ON committees(committee_code)')
@@ -129,16 +184,49 @@ class CongressVideoDatabase:
             cursor.execute('CREATE INDEX IF NOT EXISTS idx_hearings_committee ON hearings(committee_id)')
             cursor.execute('CREATE INDEX IF NOT EXISTS idx_hearings_subcommittee ON hearings(subcommittee_id)')
             cursor.execute('CREATE INDEX IF NOT EXISTS idx_hearings_date ON hearings(hearing_date)')
+            cursor.execute('CREATE INDEX IF NOT EXISTS idx_hearings_status ON hearings(status, hearing_date)')
             cursor.execute('CREATE INDEX IF NOT EXISTS idx_video_formats_hearing ON video_formats(hearing_id)')
             cursor.execute('CREATE INDEX IF NOT EXISTS idx_video_formats_platform ON video_formats(platform)')
+            cursor.execute('CREATE INDEX IF NOT EXISTS idx_video_formats_platform_player ON video_formats(platform, player_type)')
+            cursor.execute('CREATE INDEX IF NOT EXISTS idx_video_formats_embed ON video_formats(embed_hash)')
             cursor.execute('CREATE INDEX IF NOT EXISTS idx_scrape_logs_type ON scrape_logs(scrape_type)')
             cursor.execute('CREATE INDEX IF NOT EXISTS idx_scrape_logs_status ON scrape_logs(status)')
+            cursor.execute('CREATE INDEX IF NOT EXISTS idx_metrics_run ON metrics(run_id, name)')
             
             conn.commit()
     
+    def _migrate_embed_blobs(self, cursor: sqlite3.Cursor):
+        """Add embed_hash to older databases and move inline embed codes into embed_blobs."""
+        cursor.execute('PRAGMA table_info(video_formats)')
+        if any(row['name'] == 'embed_hash' for row in cursor.fetchall()):
+            return
+        
+        cursor.execute('ALTER TABLE video_formats ADD COLUMN embed_hash TEXT')
+        cursor.connection.create_function('embed_hash', 1, embed_code_hash, deterministic=True)
+        cursor.execute('''
+            INSERT OR IGNORE INTO embed_blobs (hash, content, size)
+            SELECT embed_hash(embed_code), embed_code, LENGTH(CAST(embed_code AS BLOB))
+            FROM video_formats WHERE embed_code IS NOT NULL AND embed_code != ''
+        ''')
+        cursor.execute('''
+            UPDATE video_formats SET embed_hash = embed_hash(embed_code), embed_code = NULL
+            WHERE embed_code IS NOT NULL AND embed_code != ''
+        ''')
+    
+    def _store_embed_blob(self, cursor: sqlite3.Cursor, embed_code: str) -> Optional[str]:
+        """Store an embed code once and return its hash."""
+        if not embed_code:
+            return None
+        
+        blob_hash = embed_code_hash(embed_code)
+        cursor.execute('''
+            INSERT OR IGNORE INTO embed_blobs (hash, content, size) VALUES (?, ?, ?)
+        ''', (blob_hash, embed_code, len(embed_code.encode('utf-8'))))
+        return blob_hash
+    
     def insert_committee(self, committee: Committee) -> int:
         """Insert a new committee and return its ID."""
-        with self.get_connection() as conn:
+        with self.metrics.span('db_write_seconds', table='committees'), self.get_connection() as conn:
             cursor = conn.cursor()
             try:
                 cursor.execute('''
@@ -158,7 +246,7 @@ class CongressVideoDatabase:
     
     def insert_subcommittee(self, subcommittee: Subcommittee) -> int:
         """Insert a new subcommittee and return its ID."""
-        with self.get_connection() as conn:
+        with self.metrics.span('db_write_seconds', table='subcommittees'), self.get_connection() as conn:
             cursor = conn.cursor()
             cursor.execute('''
                 INSERT INTO subcommittees (name, parent_committee_id, official_url, subcommittee_code, description)
@@ -170,7 +258,7 @@ class CongressVideoDatabase:
     
     def insert_hearing(self, hearing: Hearing) -> int:
         """Insert a new hearing and return its ID."""
-        with self.get_connection() as conn:
+        with self.metrics.span('db_write_seconds', table='hearings'), self.get_connection() as conn:
             cursor = conn.cursor()
             cursor.execute('''
                 INSERT INTO hearings (committee_id, subcommittee_id, title, hearing_date, 
@@ -184,15 +272,17 @@ class CongressVideoDatabase:
     
     def insert_video_format(self, video_format: VideoFormat) -> int:
         """Insert a new video format and return its ID."""
-        with self.get_connection() as conn:
+        with self.metrics.span('db_write_seconds', table='video_formats'), self.get_connection() as conn:
             cursor = conn.cursor()
+            embed_hash = self._store_embed_blob(cursor, video_format.embed_code)
+            video_format.embed_hash = embed_hash or ""
             cursor.execute('''
-                INSERT INTO video_formats (hearing_id, platform, video_id, embed_code, streaming_url,
+                INSERT INTO video_formats (hearing_id, platform, video_id, embed_hash, streaming_url,
                                          resolution, codec, streaming_protocol, player_type,
                                          accessibility_features, technical_details)
                 VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
             ''', (video_format.hearing_id, video_format.platform, video_format.video_id,
-                  video_format.embed_code, video_format.streaming_url, video_format.resolution,
+                  embed_hash, video_format.streaming_url, video_format.resolution,
                   video_format.codec, video_format.streaming_protocol, video_format.player_type,
                   video_format.accessibility_features, video_format.technical_details))
             conn.commit()
@@ -200,7 +290,7 @@ class CongressVideoDatabase:
     
     def insert_scrape_log(self, log: ScrapeLog) -> int:
         """Insert a new scrape log and return its ID."""
-        with self.get_connection() as conn:
+        with self.metrics.span('db_write_seconds', table='scrape_logs'), self.get_connection() as conn:
             cursor = conn.cursor()
             cursor.execute('''
                 INSERT INTO scrape_logs (target_url, scrape_type, status, records_found, 
@@ -211,6 +301,37 @@ class CongressVideoDatabase:
             conn.commit()
             return cursor.lastrowid
     
+    def insert_metrics(self, run_id: str, rows: List[Dict[str, Any]]) -> int:
+        """Store a metrics registry snapshot (MetricsRegistry.rows()) under a run ID."""
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.executemany('''
+                INSERT INTO metrics (run_id, name, kind, labels, count, sum, min, max, buckets)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+            ''', [(run_id, row['name'], row['kind'], json.dumps(row['labels'], sort_keys=True),
+                   row['count'], row['sum'], row['min'], row['max'],
+                   json.dumps(row['buckets']) if row['buckets'] is not None else None)
+                  for row in rows])
+            conn.commit()
+            return len(rows)
+    
+    def get_metrics(self, run_id: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Get stored metrics, for one run or all runs."""
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            if run_id:
+                cursor.execute('SELECT * FROM metrics WHERE run_id = ? ORDER BY name, id', (run_id,))
+            else:
+                cursor.execute('SELECT * FROM metrics ORDER BY run_id, name, id')
+            
+            metrics = []
+            for row in cursor.fetchall():
+                data = dict(row)
+                data['labels'] = json.loads(data['labels']) if data['labels'] else {}
+                data['buckets'] = json.loads(data['buckets']) if data['buckets'] else None
+                metrics.append(data)
+            return metrics
+    
     def get_committees(self, chamber: Optional[str] = None) -> List[Committee]:
         """Get all committees, optionally filtered by chamber."""
         with self.get_connection() as conn:
@@ -254,16 +375,226 @@ class CongressVideoDatabase:
             
             return [Hearing(**dict(row)) for row in cursor.fetchall()]
     
-    def get_video_formats(self, hearing_id: Optional[int] = None) -> List[VideoFormat]:
-        """Get video formats, optionally filtered by hearing."""
+    def get_hearings_between(self, start: Optional[datetime] = None, end: Optional[datetime] = None,
+                             chamber: Optional[str] = None, end_exclusive: bool = False) -> List[Hearing]:
+        """Get hearings dated within [start, end] ([start, end) if end_exclusive), optionally for one chamber."""
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            query = '''
+                SELECT h.* FROM hearings h
+                LEFT JOIN subcommittees s ON s.id = h.subcommittee_id
+                LEFT JOIN committees c ON c.id = COALESCE(h.committee_id, s.parent_committee_id)
+                WHERE 1 = 1
+            '''
+            params = []
+            
+            if start:
+                query += ' AND h.hearing_date >= ?'
+                params.append(start.isoformat(' '))
+            if end:
+                query += ' AND h.hearing_date < ?' if end_exclusive else ' AND h.hearing_date <= ?'
+                params.append(end.isoformat(' '))
+            if chamber:
+                query += ' AND c.chamber = ?'
+                params.append(chamber)
+            
+            query += ' ORDER BY h.hearing_date DESC'
+            cursor.execute(query, params)
+            
+            return [Hearing(**dict(row)) for row in cursor.fetchall()]
+    
+    def get_scheduled_hearings(self, until: Optional[datetime] = None) -> List[Hearing]:
+        """Get hearings that are scheduled or live, optionally only those starting before a cutoff."""
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            query = "SELECT * FROM hearings WHERE status IN ('scheduled', 'live')"
+            params = []
+            
+            if until:
+                query += ' AND (hearing_date IS NULL OR hearing_date <= ? OR is_live)'
+                params.append(until.isoformat(' '))
+            
+            query += ' ORDER BY hearing_date'
+            cursor.execute(query, params)
+            
+            return [Hearing(**dict(row)) for row in cursor.fetchall()]
+    
+    def get_live_hearings(self) -> List[Hearing]:
+        """Get hearings currently marked live."""
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("SELECT * FROM hearings WHERE is_live OR status = 'live' ORDER BY hearing_date")
+            
+            return [Hearing(**dict(row)) for row in cursor.fetchall()]
+    
+    def update_hearing_status(self, hearing_id: int, status: str, is_live: bool,
+                              video_url: Optional[str] = None) -> bool:
+        """Update a hearing's live state; returns False if the hearing does not exist."""
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute('''
+                UPDATE hearings
+                SET status = ?, is_live = ?, video_url = COALESCE(?, video_url), updated_at = CURRENT_TIMESTAMP
+                WHERE id = ?
+            ''', (status, is_live, video_url, hearing_id))
+            conn.commit()
+            return cursor.rowcount > 0
+    
+    def get_video_formats(self, hearing_id: Optional[int] = None,
+                          include_embed_code: bool = True) -> List[VideoFormat]:
+        """Get video formats, optionally filtered by hearing.
+        
+        Embed codes are restored from embed_blobs; pass include_embed_code=False
+        to skip loading them when only embed_hash is needed.
+        """
         with self.get_connection() as conn:
             cursor = conn.cursor()
+            if include_embed_code and self._has_embed_blobs(cursor):
+                query = '''
+                    SELECT vf.*, b.content AS embed_blob FROM video_formats vf
+                    LEFT JOIN embed_blobs b ON b.hash = vf.embed_hash
+                '''
+            else:
+                query = 'SELECT vf.* FROM video_formats vf'
+            
             if hearing_id:
-                cursor.execute('SELECT * FROM video_formats WHERE hearing_id = ?', (hearing_id,))
+                cursor.execute(query + ' WHERE vf.hearing_id = ?', (hearing_id,))
             else:
-                cursor.execute('SELECT * FROM video_formats')
+                cursor.execute(query)
             
-            return [VideoFormat(**dict(row)) for row in cursor.fetchall()]
+            return [self._video_format_from_row(dict(row)) for row in cursor.fetchall()]
+    
+    def _table_columns(self, cursor: sqlite3.Cursor, table: str) -> List[str]:
+        """Return the column names of a table."""
+        cursor.execute(f'PRAGMA table_info({table})')
+        return [row['name'] for row in cursor.fetchall()]
+    
+    def _has_embed_blobs(self, cursor: sqlite3.Cursor) -> bool:
+        """Whether embed codes live in embed_blobs; a read-only open of an older database skips that migration."""
+        return 'embed_hash' in self._table_columns(cursor, 'video_formats')
+    
+    @staticmethod
+    def _video_format_from_row(data: Dict[str, Any]) -> VideoFormat:
+        """Build a VideoFormat from a row, restoring its embed code from embed_blob if joined."""
+        blob = data.pop('embed_blob', None)
+        if blob is not None:
+            data['embed_code'] = blob
+        data['embed_code'] = data['embed_code'] or ""
+        # Rows not yet migrated to embed_blobs keep the embed code inline and have no hash column
+        data['embed_hash'] = data.get('embed_hash') or (embed_code_hash(data['embed_code']) if data['embed_code'] else "")
+        return VideoFormat(**data)
+    
+    def get_video_formats_with_context(self, platform: Optional[str] = None,
+                                       chamber: Optional[str] = None,
+                                       committee_id: Optional[int] = None,
+                                       hearing_id: Optional[int] = None,
+                                       since: Optional[datetime] = None,
+                                       until: Optional[datetime] = None,
+                                       include_embed_code: bool = True
+                                       ) -> List[Tuple[VideoFormat, Optional[Hearing], Optional[Committee]]]:
+        """Get (video format, hearing, committee) tuples from one joined query.
+        
+        Hearings filed under a subcommittee are attributed to its parent
+        committee. Hearing and committee are None when the format is orphaned.
+        """
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            aliases = {'h': 'hearings', 'c': 'committees'}
+            columns = {alias: self._table_columns(cursor, table) for alias, table in aliases.items()}
+            
+            select = ['vf.*']
+            for alias, names in columns.items():
+                select.extend(f'{alias}.{name} AS {alias}__{name}' for name in names)
+            joins = '''
+                FROM video_formats vf
+                LEFT JOIN hearings h ON h.id = vf.hearing_id
+                LEFT JOIN subcommittees s ON s.id = h.subcommittee_id
+                LEFT JOIN committees c ON c.id = COALESCE(h.committee_id, s.parent_committee_id)
+            '''
+            if include_embed_code and self._has_embed_blobs(cursor):
+                select.append('b.content AS embed_blob')
+                joins += ' LEFT JOIN embed_blobs b ON b.hash = vf.embed_hash'
+            
+            conditions = []
+            params: List[Any] = []
+            for clause, value in (('vf.platform = ?', platform), ('c.chamber = ?', chamber),
+                                  ('c.id = ?', committee_id), ('vf.hearing_id = ?', hearing_id),
+                                  ('h.hearing_date >= ?', since), ('h.hearing_date <= ?', until)):
+                if value is not None:
+                    conditions.append(clause)
+                    params.append(value)
+            
+            query = f"SELECT {', '.join(select)} {joins}"
+            if conditions:
+                query += ' WHERE ' + ' AND '.join(conditions)
+            query += ' ORDER BY c.chamber, c.name, h.hearing_date DESC, vf.id'
+            cursor.execute(query, params)
+            
+            results = []
+            for row in cursor.fetchall():
+                data = dict(row)
+                related = {alias: {name: data.pop(f'{alias}__{name}') for name in names}
+                           for alias, names in columns.items()}
+                hearing = Hearing(**related['h']) if related['h']['id'] is not None else None
+                committee = Committee(**related['c']) if related['c']['id'] is not None else None
+                results.append((self._video_format_from_row(data), hearing, committee))
+            return results
+    
+    EXPORTABLE_TABLES = ('committees', 'subcommittees', 'hearings', 'video_formats', 'scrape_logs')
+    
+    def iter_rows(self, table: str) -> Iterator[Dict[str, Any]]:
+        """Stream every row of a table as a dict without materialising the result set."""
+        if table not in self.EXPORTABLE_TABLES:
+            raise ValueError(f"Unknown table: {table}")
+        
+        with self.get_connection() as conn:
+            cursor = conn.execute(f'SELECT * FROM {table} ORDER BY id')
+            for row in cursor:
+                yield dict(row)
+    
+    def get_platform_summary(self) -> List[Dict[str, Any]]:
+        """Count instances and distinct streaming URLs per platform, largest first."""
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute('''
+                SELECT platform,
+                       COUNT(*) as total,
+                       COUNT(DISTINCT NULLIF(streaming_url, '')) as unique_streaming_urls
+                FROM video_formats
+                GROUP BY platform
+                ORDER BY total DESC, platform
+            ''')
+            return [dict(row) for row in cursor.fetchall()]
+    
+    def get_player_type_counts(self) -> Dict[str, List[Dict[str, Any]]]:
+        """Count player types per platform, most common first."""
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute('''
+                SELECT platform, player_type, COUNT(*) as count
+                FROM video_formats
+                WHERE player_type IS NOT NULL AND player_type != ''
+                GROUP BY platform, player_type
+                ORDER BY platform, count DESC, player_type
+            ''')
+            
+            counts: Dict[str, List[Dict[str, Any]]] = {}
+            for row in cursor.fetchall():
+                counts.setdefault(row['platform'], []).append(
+                    {'player_type': row['player_type'], 'count': row['count']}
+                )
+            return counts
+    
+    def get_domain_counts(self) -> Dict[str, int]:
+        """Count distinct committee website domains per chamber."""
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute('''
+                SELECT chamber, COUNT(DISTINCT url_domain(official_url)) as domains
+                FROM committees
+                GROUP BY chamber
+            ''')
+            return {row['chamber']: row['domains'] for row in cursor.fetchall()}
     
     def get_stats(self) -> Dict[str, Any]:
         """Get database statistics."""
@@ -293,4 +624,10 @@ class CongressVideoDatabase:
             cursor.execute('SELECT platform, COUNT(*) as count FROM video_formats GROUP BY platform')
             stats['formats_by_platform'] = {row['platform']: row['count'] for row in cursor.fetchall()}
             
+            # Embed code deduplication
+            cursor.execute('SELECT COUNT(*) as count, COALESCE(SUM(size), 0) as bytes FROM embed_blobs')
+            row = cursor.fetchone()
+            stats['unique_embed_blobs'] = row['count']
+            stats['embed_blob_bytes'] = row['bytes']
+            
             return stats
\ No newline at end of file
@@ -2,6 +2,7 @@
 Database models for Congress video format tracking system.
 """
 import sqlite3
+import hashlib
 from datetime import datetime
 from typing import Optional, List, Dict, Any
 from dataclasses import dataclass, asdict
@@ -94,6 +95,7 @@ class VideoFormat:
     player_type: str = ""  # 'embedded', 'native', 'custom'
     accessibility_features: str = ""  # JSON string of accessibility features
     technical_details: str = ""  # JSON string of additional technical info
+    embed_hash: str = ""  # SHA-256 of embed_code, key into the embed_blobs table
     created_at: Optional[datetime] = None
     updated_at: Optional[datetime] = None
     
@@ -127,6 +129,11 @@ class VideoFormat:
         return {}
 
 
+def embed_code_hash(embed_code: str) -> str:
+    """Content address of an embed code blob."""
+    return hashlib.sha256(embed_code.encode('utf-8')).hexdigest()
+
+
 @dataclass
 class ScrapeLog:
     """Model for tracking scraping activities."""
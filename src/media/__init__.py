@@ -0,0 +1 @@
+# Media processing: audio extraction, transcoding and stream handling
\ No newline at end of file
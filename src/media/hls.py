@@ -0,0 +1,422 @@
+"""
+HLS playlist parsing and a resumable, segment-parallel downloader.
+
+Long hearing archives are multi-hour HLS streams. Fetching the segments
+directly (concurrently, with per-segment retries and resume) and handing
+ffmpeg a local file is far more reliable than one long ``ffmpeg -i url``.
+"""
+import json
+import os
+import re
+import hashlib
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from typing import Optional, Dict, Any, List, Tuple, Union
+from urllib.parse import urljoin, urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+
+AUDIO_CODEC_PREFIXES = ('mp4a', 'ac-3', 'ec-3', 'mp3', 'opus', 'flac')
+
+_ATTRIBUTE_RE = re.compile(r'([A-Z0-9-]+)=("[^"]*"|[^,]*)')
+
+
+class HLSError(Exception):
+    """Raised when an HLS download fails."""
+
+
+class HLSUnsupportedError(HLSError):
+    """Raised for playlists the native downloader does not handle (encrypted, live)."""
+
+
+@dataclass
+class HLSVariant:
+    """A variant stream listed in a master playlist (EXT-X-STREAM-INF)."""
+    uri: str
+    bandwidth: int = 0
+    codecs: str = ""
+    resolution: str = ""
+    audio_group: str = ""
+
+    @property
+    def is_audio_only(self) -> bool:
+        """True when every codec in CODECS is an audio codec."""
+        codecs = [c.strip().lower() for c in self.codecs.split(',') if c.strip()]
+        return bool(codecs) and all(c.startswith(AUDIO_CODEC_PREFIXES) for c in codecs)
+
+
+@dataclass
+class HLSRendition:
+    """An alternative rendition listed in a master playlist (EXT-X-MEDIA)."""
+    type: str
+    group_id: str = ""
+    name: str = ""
+    uri: str = ""
+    language: str = ""
+    default: bool = False
+
+
+@dataclass
+class HLSSegment:
+    """A media segment listed in a media playlist."""
+    uri: str
+    duration: float = 0.0
+    byterange: Optional[Tuple[int, int]] = None  # (length, offset)
+
+
+@dataclass
+class MasterPlaylist:
+    """A parsed master (multivariant) playlist."""
+    url: str
+    variants: List[HLSVariant] = field(default_factory=list)
+    renditions: List[HLSRendition] = field(default_factory=list)
+
+
+@dataclass
+class MediaPlaylist:
+    """A parsed media playlist."""
+    url: str
+    target_duration: float = 0.0
+    media_sequence: int = 0
+    segments: List[HLSSegment] = field(default_factory=list)
+    init_segment: Optional[HLSSegment] = None
+    encryption: str = "NONE"
+    ended: bool = False
+
+    @property
+    def total_duration(self) -> float:
+        """Sum of all segment durations in seconds."""
+        return sum(segment.duration for segment in self.segments)
+
+
+def parse_attributes(text: str) -> Dict[str, str]:
+    """Parse an HLS attribute list such as ``BANDWIDTH=1280000,CODECS="avc1,mp4a"``."""
+    return {key: value.strip('"') for key, value in _ATTRIBUTE_RE.findall(text)}
+
+
+def _parse_byterange(value: str, next_offset: int) -> Tuple[int, int]:
+    """Parse ``length[@offset]``; a missing offset continues from the previous range."""
+    length, _, offset = value.partition('@')
+    return int(length), int(offset) if offset else next_offset
+
+
+def parse_playlist(text: str, url: str) -> Union[MasterPlaylist, MediaPlaylist]:
+    """Parse an M3U8 playlist into a master or media playlist."""
+    lines = [line.strip() for line in text.splitlines() if line.strip()]
+    if not lines or not lines[0].startswith('#EXTM3U'):
+        raise HLSUnsupportedError(f"Not an HLS playlist: {url}")
+
+    if any(line.startswith('#EXT-X-STREAM-INF') for line in lines):
+        return _parse_master(lines, url)
+    return _parse_media(lines, url)
+
+
+def _parse_master(lines: List[str], url: str) -> MasterPlaylist:
+    """Parse the lines of a master playlist."""
+    playlist = MasterPlaylist(url=url)
+    pending = None
+
+    for line in lines:
+        if line.startswith('#EXT-X-STREAM-INF:'):
+            pending = parse_attributes(line.split(':', 1)[1])
+        elif line.startswith('#EXT-X-MEDIA:'):
+            attrs = parse_attributes(line.split(':', 1)[1])
+            playlist.renditions.append(HLSRendition(
+                type=attrs.get('TYPE', ''),
+                group_id=attrs.get('GROUP-ID', ''),
+                name=attrs.get('NAME', ''),
+                uri=urljoin(url, attrs['URI']) if attrs.get('URI') else '',
+                language=attrs.get('LANGUAGE', ''),
+                default=attrs.get('DEFAULT') == 'YES'
+            ))
+        elif pending is not None and not line.startswith('#'):
+            playlist.variants.append(HLSVariant(
+                uri=urljoin(url, line),
+                bandwidth=int(pending.get('BANDWIDTH', 0) or 0),
+                codecs=pending.get('CODECS', ''),
+                resolution=pending.get('RESOLUTION', ''),
+                audio_group=pending.get('AUDIO', '')
+            ))
+            pending = None
+
+    return playlist
+
+
+def _parse_media(lines: List[str], url: str) -> MediaPlaylist:
+    """Parse the lines of a media playlist."""
+    playlist = MediaPlaylist(url=url)
+    duration = 0.0
+    byterange = None
+    next_offset = 0
+
+    for line in lines:
+        if line.startswith('#EXT-X-TARGETDURATION:'):
+            playlist.target_duration = float(line.split(':', 1)[1])
+        elif line.startswith('#EXT-X-MEDIA-SEQUENCE:'):
+            playlist.media_sequence = int(line.split(':', 1)[1])
+        elif line.startswith('#EXTINF:'):
+            duration = float(line.split(':', 1)[1].split(',', 1)[0] or 0)
+        elif line.startswith('#EXT-X-BYTERANGE:'):
+            byterange = _parse_byterange(line.split(':', 1)[1], next_offset)
+            next_offset = byterange[0] + byterange[1]
+        elif line.startswith('#EXT-X-KEY:'):
+            method = parse_attributes(line.split(':', 1)[1]).get('METHOD', 'NONE')
+            if method != 'NONE':
+                playlist.encryption = method
+        elif line.startswith('#EXT-X-MAP:'):
+            attrs = parse_attributes(line.split(':', 1)[1])
+            map_range = _parse_byterange(attrs['BYTERANGE'], 0) if attrs.get('BYTERANGE') else None
+            playlist.init_segment = HLSSegment(uri=urljoin(url, attrs.get('URI', '')), byterange=map_range)
+        elif line.startswith('#EXT-X-ENDLIST'):
+            playlist.ended = True
+        elif not line.startswith('#'):
+            playlist.segments.append(HLSSegment(uri=urljoin(url, line), duration=duration, byterange=byterange))
+            duration = 0.0
+            byterange = None
+
+    return playlist
+
+
+def select_audio_playlist(master: MasterPlaylist) -> Tuple[str, str]:
+    """Pick the media playlist to download, preferring audio-only renditions.
+
+    Returns the playlist URL and a short description of why it was chosen.
+    """
+    audio_renditions = [r for r in master.renditions if r.type == 'AUDIO' and r.uri]
+    if audio_renditions:
+        rendition = next((r for r in audio_renditions if r.default), audio_renditions[0])
+        return rendition.uri, f"audio rendition '{rendition.name or rendition.group_id}'"
+
+    audio_variants = [v for v in master.variants if v.is_audio_only]
+    if audio_variants:
+        variant = max(audio_variants, key=lambda v: v.bandwidth)
+        return variant.uri, f"audio-only variant ({variant.bandwidth} bps)"
+
+    if not master.variants:
+        raise HLSUnsupportedError(f"Master playlist has no variants: {master.url}")
+
+    # No audio-only option: the smallest variant carries the same audio track
+    variant = min(master.variants, key=lambda v: v.bandwidth or float('inf'))
+    return variant.uri, f"lowest-bandwidth variant ({variant.bandwidth} bps)"
+
+
+def is_hls_url(url: str) -> bool:
+    """Check if a URL points at an HLS playlist."""
+    return urlparse(url).path.lower().endswith('.m3u8') or '.m3u8' in url.lower()
+
+
+class HLSDownloader:
+    """Download an HLS stream's segments concurrently into a single local file.
+
+    Progress is persisted in the work directory: segments are written to a
+    temporary name and renamed when complete, so an interrupted download
+    resumes with only the missing segments.
+    """
+
+    STATE_FILE = 'state.json'
+
+    def __init__(self, max_workers: int = 8, segment_retries: int = 4, timeout: float = 30,
+                 session: Optional[requests.Session] = None):
+        """Initialize the downloader with a connection pool sized for max_workers.
+
+        segment_retries configures the urllib3 Retry of the default session.
+        """
+        self.max_workers = max_workers
+        self.segment_retries = segment_retries
+        self.timeout = timeout
+        self.session = session or self._create_session()
+
+    def _create_session(self) -> requests.Session:
+        """Create a session whose pool keeps one connection per worker alive."""
+        session = requests.Session()
+        retry_strategy = Retry(
+            total=self.segment_retries,
+            backoff_factor=0.5,
+            status_forcelist=[429, 500, 502, 503, 504],
+            allowed_methods=["GET"]
+        )
+        adapter = HTTPAdapter(max_retries=retry_strategy, pool_connections=4, pool_maxsize=self.max_workers)
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        session.headers.update({
+            'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+        })
+        return session
+
+    def fetch_playlist(self, url: str) -> Union[MasterPlaylist, MediaPlaylist]:
+        """Download and parse a playlist."""
+        response = self.session.get(url, timeout=self.timeout)
+        response.raise_for_status()
+        return parse_playlist(response.text, response.url)
+
+    def resolve_media_playlist(self, url: str) -> Tuple[MediaPlaylist, str]:
+        """Follow a master playlist to the media playlist that should be downloaded."""
+        playlist = self.fetch_playlist(url)
+        description = 'media playlist'
+        if isinstance(playlist, MasterPlaylist):
+            media_url, description = select_audio_playlist(playlist)
+            playlist = self.fetch_playlist(media_url)
+            if isinstance(playlist, MasterPlaylist):
+                raise HLSUnsupportedError(f"Nested master playlist at {media_url}")
+        return playlist, description
+
+    @staticmethod
+    def work_dir_for(url: str, root: str) -> str:
+        """Return a stable work directory for a playlist URL."""
+        return os.path.join(root, hashlib.sha1(url.encode('utf-8')).hexdigest()[:16])
+
+    def download(self, url: str, work_dir: str, on_progress=None) -> str:
+        """Download the stream at url into work_dir and return the local media file path.
+
+        Raises HLSUnsupportedError for encrypted or still-live playlists, which
+        should be left to ffmpeg, and HLSError when segments still fail after
+        all retries (a later call resumes with the missing segments).
+        """
+        os.makedirs(work_dir, exist_ok=True)
+        playlist, description = self.resolve_media_playlist(url)
+
+        if playlist.encryption != 'NONE':
+            raise HLSUnsupportedError(f"Encrypted playlist ({playlist.encryption}) not supported natively")
+        if not playlist.ended:
+            raise HLSUnsupportedError("Playlist is live (no EXT-X-ENDLIST)")
+        if not playlist.segments:
+            raise HLSUnsupportedError("Playlist has no segments")
+
+        extension = self._media_extension(playlist)
+        output_path = os.path.join(work_dir, f"media{extension}")
+        state = self._load_state(work_dir)
+
+        if state.get('media_playlist_url') == playlist.url and state.get('complete') and os.path.exists(output_path):
+            return output_path
+
+        if state.get('media_playlist_url') != playlist.url:
+            # A different rendition or playlist: start over
+            self._clear_segments(work_dir)
+            state = {}
+
+        state.update({
+            'source_url': url,
+            'media_playlist_url': playlist.url,
+            'selection': description,
+            'segments': len(playlist.segments),
+            'total_duration': playlist.total_duration,
+            'complete': False
+        })
+        self._save_state(work_dir, state)
+
+        segments = list(enumerate(playlist.segments))
+        if playlist.init_segment:
+            segments.insert(0, (-1, playlist.init_segment))
+
+        missing = [(index, segment) for index, segment in segments
+                   if not os.path.exists(self._segment_path(work_dir, index))]
+        done = len(segments) - len(missing)
+        failures = []
+        lock = threading.Lock()
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            futures = {executor.submit(self._download_segment, segment, self._segment_path(work_dir, index)): index
+                       for index, segment in missing}
+            for future in as_completed(futures):
+                try:
+                    future.result()
+                except Exception as e:
+                    failures.append((futures[future], str(e)))
+                    continue
+
+                with lock:
+                    done += 1
+                    if done % 50 == 0 or done == len(segments):
+                        state['downloaded'] = done
+                        self._save_state(work_dir, state)
+                    if on_progress:
+                        on_progress(done, len(segments))
+
+        if failures:
+            state['downloaded'] = done
+            self._save_state(work_dir, state)
+            raise HLSError(f"{len(failures)} segment(s) failed, first: {failures[0][1]}")
+
+        self._concatenate(work_dir, [index for index, _ in segments], output_path)
+        state['complete'] = True
+        self._save_state(work_dir, state)
+        self._clear_segments(work_dir)
+        return output_path
+
+    def _download_segment(self, segment: HLSSegment, path: str):
+        """Download one segment and rename it into place.
+
+        Transient failures are retried by the session's urllib3 Retry; a
+        segment that still fails is left for the next (resumed) download.
+        """
+        headers = {}
+        if segment.byterange:
+            length, offset = segment.byterange
+            headers['Range'] = f"bytes={offset}-{offset + length - 1}"
+
+        try:
+            with self.session.get(segment.uri, headers=headers, timeout=self.timeout, stream=True) as response:
+                response.raise_for_status()
+                temp_path = path + '.tmp'
+                with open(temp_path, 'wb') as f:
+                    for chunk in response.iter_content(chunk_size=256 * 1024):
+                        f.write(chunk)
+            os.replace(temp_path, path)
+        except (requests.exceptions.RequestException, OSError) as e:
+            raise HLSError(f"Segment {segment.uri} failed: {e}")
+
+    @staticmethod
+    def _segment_path(work_dir: str, index: int) -> str:
+        """Path of a completed segment; index -1 is the initialization segment."""
+        name = 'init.seg' if index < 0 else f"seg_{index:06d}.seg"
+        return os.path.join(work_dir, name)
+
+    @staticmethod
+    def _media_extension(playlist: MediaPlaylist) -> str:
+        """Pick a container extension for the concatenated segments."""
+        if playlist.init_segment:
+            return '.mp4'
+        path = urlparse(playlist.segments[0].uri).path.lower()
+        for extension in ('.aac', '.mp3', '.ts'):
+            if path.endswith(extension):
+                return extension
+        return '.ts'
+
+    def _concatenate(self, work_dir: str, indices: List[int], output_path: str):
+        """Join segments in playlist order into a single file."""
+        temp_path = output_path + '.tmp'
+        with open(temp_path, 'wb') as out:
+            for index in indices:
+                with open(self._segment_path(work_dir, index), 'rb') as f:
+                    while True:
+                        chunk = f.read(1024 * 1024)
+                        if not chunk:
+                            break
+                        out.write(chunk)
+        os.replace(temp_path, output_path)
+
+    @staticmethod
+    def _clear_segments(work_dir: str):
+        """Remove downloaded segment files from the work directory."""
+        for name in os.listdir(work_dir):
+            if name.endswith(('.seg', '.seg.tmp')):
+                os.remove(os.path.join(work_dir, name))
+
+    def _load_state(self, work_dir: str) -> Dict[str, Any]:
+        """Load persisted download state, if any."""
+        try:
+            with open(os.path.join(work_dir, self.STATE_FILE), 'r') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _save_state(self, work_dir: str, state: Dict[str, Any]):
+        """Persist download state atomically."""
+        path = os.path.join(work_dir, self.STATE_FILE)
+        with open(path + '.tmp', 'w') as f:
+            json.dump(state, f, indent=2)
+        os.replace(path + '.tmp', path)
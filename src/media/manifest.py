@@ -0,0 +1,369 @@
+"""
+Manifest introspection for HLS (.m3u8) and MPEG-DASH (.mpd) endpoints.
+"""
+import re
+import threading
+import xml.etree.ElementTree as ET
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field, asdict
+from typing import Optional, Dict, Any, List, Iterable
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from src.database.models import VideoFormat
+from src.media.hls import parse_playlist, MasterPlaylist, MediaPlaylist, AUDIO_CODEC_PREFIXES, HLSError
+from src.utils.helpers import WebScraper
+
+
+# RFC 6381 codec prefixes mapped to the names used in VideoFormat.codec
+CODEC_NAMES = {
+    'avc1': 'h264', 'avc3': 'h264',
+    'hvc1': 'h265', 'hev1': 'h265',
+    'vp09': 'vp9', 'vp9': 'vp9',
+    'av01': 'av1',
+    'mp4a': 'aac',
+    'ac-3': 'ac3', 'ec-3': 'eac3',
+    'opus': 'opus', 'mp3': 'mp3', 'flac': 'flac',
+}
+
+_ISO_DURATION_RE = re.compile(
+    r'P(?:(?P<days>\d+(?:\.\d+)?)D)?'
+    r'(?:T(?:(?P<hours>\d+(?:\.\d+)?)H)?(?:(?P<minutes>\d+(?:\.\d+)?)M)?(?:(?P<seconds>\d+(?:\.\d+)?)S)?)?'
+)
+
+
+@dataclass
+class Rendition:
+    """One rendition (variant or representation) offered by a manifest."""
+    bandwidth: int = 0
+    codecs: str = ""
+    resolution: str = ""
+    audio_only: bool = False
+    uri: str = ""
+
+
+@dataclass
+class ManifestInfo:
+    """What a streaming manifest actually offers."""
+    url: str
+    protocol: str = ""  # 'hls', 'dash'
+    renditions: List[Rendition] = field(default_factory=list)
+    codecs: List[str] = field(default_factory=list)
+    bitrates: List[int] = field(default_factory=list)
+    max_resolution: str = ""
+    has_audio_only: bool = False
+    segment_count: int = 0
+    segment_duration: Optional[float] = None  # average seconds per segment
+    total_duration: Optional[float] = None  # seconds
+    is_live: bool = False
+    etag: str = ""
+    content_type: str = ""
+    error: str = ""
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to dictionary for JSON serialization."""
+        return asdict(self)
+
+
+def normalize_codec(codec: str) -> str:
+    """Map an RFC 6381 codec string (e.g. 'avc1.4d401f') to a short name."""
+    prefix = codec.strip().lower().split('.', 1)[0]
+    return CODEC_NAMES.get(prefix, prefix)
+
+
+def is_audio_codec_list(codecs: str) -> bool:
+    """True when every codec in a comma-separated list is an audio codec."""
+    items = [c.strip().lower() for c in codecs.split(',') if c.strip()]
+    return bool(items) and all(c.startswith(AUDIO_CODEC_PREFIXES) for c in items)
+
+
+def resolution_label(resolution: str) -> str:
+    """Convert 'WIDTHxHEIGHT' to the '720p' style used by VideoFormat.resolution."""
+    _, _, height = resolution.partition('x')
+    return f"{height}p" if height.isdigit() else resolution
+
+
+def parse_iso_duration(value: str) -> Optional[float]:
+    """Parse an ISO 8601 duration such as 'PT1H2M3.5S' into seconds."""
+    match = _ISO_DURATION_RE.fullmatch(value.strip()) if value else None
+    if not match:
+        return None
+    parts = {k: float(v) for k, v in match.groupdict().items() if v}
+    return (parts.get('days', 0) * 86400 + parts.get('hours', 0) * 3600
+            + parts.get('minutes', 0) * 60 + parts.get('seconds', 0))
+
+
+def _summarize(info: ManifestInfo):
+    """Fill the aggregate fields of a ManifestInfo from its renditions."""
+    codecs = []
+    for rendition in info.renditions:
+        for codec in rendition.codecs.split(','):
+            name = normalize_codec(codec) if codec.strip() else ''
+            if name and name not in codecs:
+                codecs.append(name)
+    info.codecs = codecs
+    info.bitrates = sorted({r.bandwidth for r in info.renditions if r.bandwidth})
+    info.has_audio_only = any(r.audio_only for r in info.renditions)
+
+    heights = [int(r.resolution.partition('x')[2]) for r in info.renditions
+               if r.resolution.partition('x')[2].isdigit()]
+    if heights:
+        info.max_resolution = f"{max(heights)}p"
+
+
+def analyze_hls(text: str, url: str, media_text: Optional[str] = None,
+                media_url: str = "") -> ManifestInfo:
+    """Build a ManifestInfo from an HLS playlist (and optionally one of its media playlists)."""
+    info = ManifestInfo(url=url, protocol='hls')
+    playlist = parse_playlist(text, url)
+
+    if isinstance(playlist, MasterPlaylist):
+        for variant in playlist.variants:
+            info.renditions.append(Rendition(
+                bandwidth=variant.bandwidth,
+                codecs=variant.codecs,
+                resolution=variant.resolution,
+                audio_only=variant.is_audio_only,
+                uri=variant.uri
+            ))
+        for rendition in playlist.renditions:
+            if rendition.type == 'AUDIO' and rendition.uri:
+                info.renditions.append(Rendition(audio_only=True, uri=rendition.uri))
+        media = parse_playlist(media_text, media_url) if media_text else None
+    else:
+        media = playlist
+
+    if isinstance(media, MediaPlaylist):
+        info.segment_count = len(media.segments)
+        info.is_live = not media.ended
+        if media.segments:
+            info.total_duration = round(media.total_duration, 3)
+            info.segment_duration = round(media.total_duration / len(media.segments), 3)
+
+    _summarize(info)
+    return info
+
+
+def analyze_dash(text: str, url: str) -> ManifestInfo:
+    """Build a ManifestInfo from an MPEG-DASH MPD document."""
+    info = ManifestInfo(url=url, protocol='dash')
+    root = ET.fromstring(text)
+
+    def local(tag):
+        return tag.rsplit('}', 1)[-1]
+
+    info.is_live = root.get('type') == 'dynamic'
+    info.total_duration = parse_iso_duration(root.get('mediaPresentationDuration', ''))
+
+    segment_durations = []
+    for adaptation in (el for el in root.iter() if local(el.tag) == 'AdaptationSet'):
+        set_mime = adaptation.get('mimeType', '') or adaptation.get('contentType', '')
+        set_codecs = adaptation.get('codecs', '')
+        # Segment timing is taken from the first adaptation set that declares it
+        collect_segments = not segment_durations
+
+        for element in adaptation.iter():
+            name = local(element.tag)
+            if name == 'SegmentTemplate' and collect_segments:
+                timescale = float(element.get('timescale', 1))
+                if element.get('duration'):
+                    segment_durations.append(float(element.get('duration')) / timescale)
+                for timeline in (el for el in element if local(el.tag) == 'SegmentTimeline'):
+                    for entry in timeline:
+                        # r="N" repeats the segment N more times
+                        repeat = max(0, int(entry.get('r', 0)))
+                        segment_durations.extend([float(entry.get('d', 0)) / timescale] * (repeat + 1))
+            elif name == 'Representation':
+                mime = element.get('mimeType', '') or set_mime
+                codecs = element.get('codecs', '') or set_codecs
+                width, height = element.get('width'), element.get('height')
+                info.renditions.append(Rendition(
+                    bandwidth=int(element.get('bandwidth', 0) or 0),
+                    codecs=codecs,
+                    resolution=f"{width}x{height}" if width and height else "",
+                    audio_only=mime.startswith('audio') or is_audio_codec_list(codecs),
+                    uri=element.get('id', '')
+                ))
+
+    if segment_durations:
+        info.segment_duration = round(sum(segment_durations) / len(segment_durations), 3)
+        if info.total_duration:
+            info.segment_count = int(round(info.total_duration / info.segment_duration))
+
+    _summarize(info)
+    return info
+
+
+def apply_to_video_format(video_format: VideoFormat, info: ManifestInfo) -> VideoFormat:
+    """Record manifest findings on a VideoFormat's resolution/codec/protocol fields."""
+    if info.error:
+        return video_format
+
+    video_format.streaming_protocol = info.protocol
+    if info.max_resolution:
+        video_format.resolution = info.max_resolution
+    elif info.has_audio_only and not any(not r.audio_only for r in info.renditions):
+        video_format.resolution = 'audio-only'
+    if info.codecs:
+        video_format.codec = ','.join(info.codecs)
+
+    details = video_format.get_technical_details()
+    details['manifest'] = {
+        'url': info.url,
+        'renditions': [asdict(r) for r in info.renditions],
+        'bitrates': info.bitrates,
+        'has_audio_only': info.has_audio_only,
+        'segment_count': info.segment_count,
+        'segment_duration': info.segment_duration,
+        'total_duration': info.total_duration,
+        'is_live': info.is_live
+    }
+    video_format.set_technical_details(details)
+    return video_format
+
+
+def manifest_protocol(url: str) -> str:
+    """Return 'hls' or 'dash' for manifest URLs, '' otherwise."""
+    path = url.lower().split('?', 1)[0]
+    if path.endswith('.m3u8'):
+        return 'hls'
+    if path.endswith('.mpd'):
+        return 'dash'
+    return ''
+
+
+class ManifestAnalyzer:
+    """Fetch and analyse manifests concurrently, caching results by URL and ETag."""
+
+    def __init__(self, session: Optional[requests.Session] = None, max_workers: int = 8,
+                 timeout: float = 15, cache_size: int = 1024, follow_variants: bool = True,
+                 scraper: Optional[WebScraper] = None):
+        """Initialize analyzer; follow_variants also fetches one media playlist for durations.
+
+        With a scraper, manifests are fetched through a WebScraper with the same
+        rate limiting, retries and metrics but its own connection pool, and
+        requests to one host are serialised so that concurrent workers do not
+        multiply the rate limit; different hosts are fetched in parallel.
+        """
+        self.scraper = scraper
+        self._fetcher: Optional[WebScraper] = None
+        if scraper:
+            self._fetcher = WebScraper(delay_range=scraper.delay_range, max_retries=scraper.max_retries,
+                                       metrics=scraper.metrics)
+            self._fetcher.session.headers.update(scraper.session.headers)
+            self._fetcher.session.proxies.update(scraper.session.proxies)
+            self.session = self._fetcher.session
+        else:
+            self.session = session or self._create_session(max_workers)
+        self.max_workers = max_workers
+        self.timeout = timeout
+        self.cache_size = cache_size
+        self.follow_variants = follow_variants
+        self._cache: "OrderedDict[str, ManifestInfo]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._host_locks: Dict[str, threading.Lock] = {}
+
+    @staticmethod
+    def _create_session(pool_size: int) -> requests.Session:
+        """Create a session with a connection pool sized for the worker count."""
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_maxsize=pool_size)
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        return session
+
+    def _cached(self, url: str) -> Optional[ManifestInfo]:
+        """Return the cached result for a URL, marking it recently used."""
+        with self._lock:
+            info = self._cache.get(url)
+            if info:
+                self._cache.move_to_end(url)
+            return info
+
+    def _store(self, url: str, info: ManifestInfo):
+        """Cache a result, evicting the least recently used entry when full."""
+        with self._lock:
+            self._cache[url] = info
+            self._cache.move_to_end(url)
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+
+    def _get(self, url: str, **kwargs) -> requests.Response:
+        """GET a manifest, rate limited one request at a time per host when there is a scraper."""
+        if self._fetcher is None:
+            return self.session.get(url, timeout=self.timeout, **kwargs)
+
+        host = urlparse(url).hostname or ''
+        with self._lock:
+            host_lock = self._host_locks.setdefault(host, threading.Lock())
+        with host_lock:
+            response = self._fetcher.get_page(url, timeout=self.timeout, **kwargs)
+        if response is None:
+            raise requests.exceptions.RequestException(f"Failed to fetch {url}")
+        return response
+
+    def analyze(self, url: str) -> ManifestInfo:
+        """Fetch and analyse one manifest, revalidating cached results with If-None-Match."""
+        protocol = manifest_protocol(url)
+        cached = self._cached(url)
+        headers = {'If-None-Match': cached.etag} if cached and cached.etag else {}
+
+        try:
+            response = self._get(url, headers=headers)
+            if response.status_code == 304 and cached:
+                return cached
+            response.raise_for_status()
+
+            content_type = response.headers.get('content-type', '')
+            text = response.text
+            if protocol == 'dash' or 'dash+xml' in content_type:
+                info = analyze_dash(text, response.url)
+            else:
+                media_text, media_url = None, ""
+                if self.follow_variants and '#EXT-X-STREAM-INF' in text:
+                    media_text, media_url = self._fetch_first_variant(text, response.url)
+                info = analyze_hls(text, response.url, media_text, media_url)
+
+            info.url = url
+            info.etag = response.headers.get('etag', '')
+            info.content_type = content_type
+        except (requests.exceptions.RequestException, HLSError, ET.ParseError, ValueError) as e:
+            info = ManifestInfo(url=url, protocol=protocol, error=str(e))
+
+        if not info.error:
+            self._store(url, info)
+        return info
+
+    def _fetch_first_variant(self, text: str, url: str):
+        """Fetch the lowest-bandwidth media playlist to learn segment durations."""
+        master = parse_playlist(text, url)
+        if not isinstance(master, MasterPlaylist) or not master.variants:
+            return None, ""
+        variant = min(master.variants, key=lambda v: v.bandwidth or float('inf'))
+        try:
+            response = self._get(variant.uri)
+            response.raise_for_status()
+            return response.text, response.url
+        except requests.exceptions.RequestException:
+            return None, ""
+
+    def analyze_many(self, urls: Iterable[str]) -> Dict[str, ManifestInfo]:
+        """Analyse a batch of manifest URLs concurrently."""
+        unique_urls = list(dict.fromkeys(urls))
+        if not unique_urls:
+            return {}
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, len(unique_urls))) as executor:
+            return dict(zip(unique_urls, executor.map(self.analyze, unique_urls)))
+
+    def enrich_video_formats(self, video_formats: List[VideoFormat]) -> List[VideoFormat]:
+        """Analyse the manifests behind a list of VideoFormats and record the results on them."""
+        manifest_urls = [vf.streaming_url for vf in video_formats if manifest_protocol(vf.streaming_url)]
+        results = self.analyze_many(manifest_urls)
+        for video_format in video_formats:
+            info = results.get(video_format.streaming_url)
+            if info:
+                apply_to_video_format(video_format, info)
+        return video_formats
@@ -0,0 +1,159 @@
+"""
+Codec probing with ffprobe and selection of the cheapest audio extraction path.
+"""
+import json
+import subprocess
+from dataclasses import dataclass, field
+from typing import Optional, List, Dict, Any
+
+
+# Sample rates MP3 supports natively; anything else is resampled to 44.1 kHz
+MP3_SAMPLE_RATES = (32000, 44100, 48000)
+
+
+@dataclass
+class AudioProbe:
+    """Audio stream properties reported by ffprobe."""
+    codec_name: str = ""
+    bit_rate: Optional[int] = None
+    sample_rate: Optional[int] = None
+    channels: Optional[int] = None
+    format_name: str = ""
+    duration: Optional[float] = None  # seconds
+    has_video: bool = False
+
+
+@dataclass
+class AudioPlan:
+    """How ffmpeg should produce the audio file for a given source."""
+    strategy: str  # 'copy', 'remux', 'aac_to_mp3', 'transcode'
+    codec_args: List[str] = field(default_factory=list)
+    extension: str = ".mp3"
+    reason: str = ""
+
+
+def _to_int(value: Any) -> Optional[int]:
+    """Convert an ffprobe numeric string to int, or None if absent."""
+    try:
+        return int(float(value))
+    except (TypeError, ValueError):
+        return None
+
+
+def _to_float(value: Any) -> Optional[float]:
+    """Convert an ffprobe numeric string to float, or None if absent."""
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def probe_audio(source: str, timeout: float = 30, input_args: Optional[List[str]] = None) -> Optional[AudioProbe]:
+    """Probe the first audio stream of a URL or file with ffprobe.
+
+    Returns None when ffprobe is unavailable, times out or finds no audio.
+    """
+    cmd = (
+        ['ffprobe', '-v', 'error', '-print_format', 'json',
+         '-show_entries', 'stream=codec_type,codec_name,bit_rate,sample_rate,channels'
+                          ':format=format_name,duration,bit_rate']
+        + (input_args or [])
+        + [source]
+    )
+
+    try:
+        result = subprocess.run(cmd, capture_output=True, text=True, timeout=timeout)
+    except (OSError, subprocess.TimeoutExpired) as e:
+        print(f"ffprobe failed for {source}: {e}")
+        return None
+
+    if result.returncode != 0:
+        return None
+
+    try:
+        data = json.loads(result.stdout or '{}')
+    except ValueError:
+        return None
+
+    streams = data.get('streams', [])
+    audio = next((s for s in streams if s.get('codec_type') == 'audio'), None)
+    if not audio:
+        return None
+
+    container = data.get('format', {})
+    return AudioProbe(
+        codec_name=audio.get('codec_name', ''),
+        bit_rate=_to_int(audio.get('bit_rate')) or _to_int(container.get('bit_rate')),
+        sample_rate=_to_int(audio.get('sample_rate')),
+        channels=_to_int(audio.get('channels')),
+        format_name=container.get('format_name', ''),
+        duration=_to_float(container.get('duration')),
+        has_video=any(s.get('codec_type') == 'video' for s in streams)
+    )
+
+
+def plan_audio_extraction(probe: Optional[AudioProbe], bitrate: int = 192000,
+                          accept_aac: bool = False, compression_level: int = 5,
+                          allow_stream_copy: bool = True) -> AudioPlan:
+    """Choose the cheapest ffmpeg path that yields the requested audio.
+
+    MP3 sources are stream-copied. AAC sources are remuxed to .m4a when AAC is
+    acceptable, otherwise decoded once and encoded to MP3 without upsampling.
+    Everything else falls back to a full transcode, as does every source when
+    allow_stream_copy is False (a stream copy that already failed).
+    """
+    # Drop video, subtitle and data streams so nothing but audio is decoded
+    base_args = ['-map', '0:a:0', '-vn', '-sn', '-dn']
+
+    if probe is None:
+        return AudioPlan(
+            strategy='transcode',
+            codec_args=base_args + ['-c:a', 'libmp3lame', '-b:a', str(bitrate), '-ar', '44100'],
+            reason='probe unavailable'
+        )
+
+    if probe.codec_name == 'mp3' and allow_stream_copy:
+        return AudioPlan(
+            strategy='copy',
+            codec_args=base_args + ['-c:a', 'copy'],
+            reason='source audio is already MP3'
+        )
+
+    if probe.codec_name == 'aac' and accept_aac and allow_stream_copy:
+        return AudioPlan(
+            strategy='remux',
+            codec_args=base_args + ['-c:a', 'copy', '-bsf:a', 'aac_adtstoasc'],
+            extension='.m4a',
+            reason='source audio is AAC and AAC output is accepted'
+        )
+
+    # Never encode at a higher bitrate or sample rate than the source carries
+    target_bitrate = min(bitrate, probe.bit_rate) if probe.bit_rate else bitrate
+    sample_rate = probe.sample_rate if probe.sample_rate in MP3_SAMPLE_RATES else 44100
+
+    codec_args = base_args + [
+        '-c:a', 'libmp3lame',
+        '-b:a', str(target_bitrate),
+        '-ar', str(sample_rate),
+        '-compression_level', str(compression_level)
+    ]
+
+    if probe.codec_name == 'aac':
+        return AudioPlan(strategy='aac_to_mp3', codec_args=codec_args, reason='AAC source re-encoded to MP3')
+
+    return AudioPlan(strategy='transcode', codec_args=codec_args,
+                     reason=f"{probe.codec_name or 'unknown'} source requires a full transcode")
+
+
+def describe_probe(probe: Optional[AudioProbe]) -> Dict[str, Any]:
+    """Summarise a probe result for logs and metadata files."""
+    if probe is None:
+        return {}
+    return {
+        'codec': probe.codec_name,
+        'bit_rate': probe.bit_rate,
+        'sample_rate': probe.sample_rate,
+        'channels': probe.channels,
+        'container': probe.format_name,
+        'duration': probe.duration
+    }
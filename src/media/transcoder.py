@@ -0,0 +1,328 @@
+"""
+Concurrent ffmpeg transcoding with a bounded worker pool.
+"""
+import os
+import queue
+import shutil
+import subprocess
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+from dataclasses import dataclass, field
+from typing import Optional, Dict, Any, List, Callable
+
+from src.media.hls import HLSDownloader, HLSError, HLSUnsupportedError, is_hls_url
+from src.media.probe import probe_audio, plan_audio_extraction, describe_probe
+
+
+DEFAULT_AUDIO_ARGS = ['-vn', '-acodec', 'mp3', '-ab', '192k', '-ar', '44100']
+
+# Probe strategies that copy the source audio instead of encoding it
+STREAM_COPY_STRATEGIES = ('copy', 'remux')
+
+
+class TranscodeError(Exception):
+    """Raised when an ffmpeg job fails after all retries."""
+
+
+@dataclass
+class TranscodeJob:
+    """A single ffmpeg audio extraction job."""
+    source_url: str
+    output_path: str
+    name: str = ""
+    codec_args: List[str] = field(default_factory=lambda: list(DEFAULT_AUDIO_ARGS))
+    input_args: List[str] = field(default_factory=list)
+    metadata: Dict[str, Any] = field(default_factory=dict)
+    probe_source: bool = False  # choose codec_args from an ffprobe of the source
+    accept_aac: bool = False  # allow AAC sources to be remuxed to .m4a
+    strategy: str = ""  # extraction path chosen by the probe step
+    source_info: Dict[str, Any] = field(default_factory=dict)
+    local_source: str = ""  # downloaded copy of an HLS source, if any
+    status: str = "queued"  # 'queued', 'running', 'retrying', 'done', 'failed'
+    attempts: int = 0
+    error: str = ""
+    progress_seconds: float = 0.0
+    speed: str = ""
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+
+    def build_command(self, output_path: str) -> List[str]:
+        """Build the ffmpeg command line, with machine-readable progress on stdout."""
+        return (
+            ['ffmpeg', '-nostdin', '-hide_banner', '-loglevel', 'error',
+             '-progress', 'pipe:1', '-nostats']
+            + self.input_args
+            + ['-i', self.local_source or self.source_url]
+            + self.codec_args
+            + ['-y', output_path]
+        )
+
+
+def partial_output_path(output_path: str) -> str:
+    """Return the temporary path ffmpeg writes to before the job succeeds."""
+    base, extension = os.path.splitext(output_path)
+    return f"{base}.part{extension}"
+
+
+def parse_progress_block(lines: List[str]) -> Dict[str, str]:
+    """Parse one ``key=value`` block emitted by ``ffmpeg -progress``."""
+    values = {}
+    for line in lines:
+        key, sep, value = line.partition('=')
+        if sep:
+            values[key.strip()] = value.strip()
+    return values
+
+
+class TranscodeScheduler:
+    """Queue of ffmpeg jobs executed by a bounded pool of worker processes.
+
+    Each worker thread supervises one ffmpeg process at a time, so the number
+    of concurrent encoders never exceeds ``max_workers`` (the CPU count by
+    default). Jobs that fail or stall are retried with a backoff. When a
+    download directory is given, HLS sources are first fetched segment by
+    segment with HLSDownloader and ffmpeg reads the local file.
+    """
+
+    def __init__(self, max_workers: Optional[int] = None, max_retries: int = 2,
+                 retry_backoff: float = 5.0, stall_timeout: float = 120.0,
+                 on_progress: Optional[Callable[[TranscodeJob], None]] = None,
+                 on_complete: Optional[Callable[[TranscodeJob], None]] = None,
+                 download_dir: Optional[str] = None, hls_downloader: Optional[HLSDownloader] = None,
+                 keep_downloads: bool = False):
+        """Initialize the scheduler; workers start on the first submit."""
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.max_retries = max_retries
+        self.retry_backoff = retry_backoff
+        self.stall_timeout = stall_timeout
+        self.on_progress = on_progress
+        self.on_complete = on_complete
+        self.download_dir = download_dir
+        self.hls_downloader = hls_downloader or (HLSDownloader() if download_dir else None)
+        self.keep_downloads = keep_downloads
+
+        self._queue: "queue.Queue[Optional[TranscodeJob]]" = queue.Queue()
+        self._futures: Dict[int, Future] = {}
+        self._workers: List[threading.Thread] = []
+        self._pending = 0
+        self._lock = threading.Lock()
+        self._idle = threading.Condition(self._lock)
+        self._closed = False
+
+    def submit(self, job: TranscodeJob) -> Future:
+        """Queue a job and return a Future resolving to its output path."""
+        future = Future()
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("Scheduler has been shut down")
+            self._futures[id(job)] = future
+            self._pending += 1
+            self._start_workers()
+        self._queue.put(job)
+        return future
+
+    def _start_workers(self):
+        """Start worker threads up to the concurrency limit (caller holds the lock)."""
+        while len(self._workers) < self.max_workers:
+            worker = threading.Thread(target=self._worker_loop, name=f"ffmpeg-worker-{len(self._workers)}",
+                                      daemon=True)
+            self._workers.append(worker)
+            worker.start()
+
+    def _worker_loop(self):
+        """Pull jobs from the queue until a shutdown sentinel arrives."""
+        while True:
+            job = self._queue.get()
+            if job is None:
+                return
+
+            try:
+                self._run_job(job)
+            except Exception as e:
+                job.error = str(e)
+                self._finish(job, success=False)
+
+    def _download_hls(self, job: TranscodeJob):
+        """Fetch an HLS source locally; on failure ffmpeg reads the URL directly."""
+        work_dir = HLSDownloader.work_dir_for(job.source_url, self.download_dir)
+        try:
+            job.local_source = self.hls_downloader.download(job.source_url, work_dir)
+            print(f"[hls] {job.name or job.source_url}: downloaded to {job.local_source}")
+        except HLSUnsupportedError as e:
+            print(f"[hls] {job.name or job.source_url}: falling back to ffmpeg input ({e})")
+        except HLSError:
+            # Failed segments are retried (and resumed) like any other failure
+            raise
+        except Exception as e:
+            raise HLSError(f"HLS download failed: {e}")
+
+    def _plan_job(self, job: TranscodeJob, allow_stream_copy: bool = True):
+        """Probe the source and pick stream copy, AAC-to-MP3 or a full transcode."""
+        probe = probe_audio(job.local_source or job.source_url, input_args=job.input_args)
+        plan = plan_audio_extraction(probe, accept_aac=job.accept_aac, allow_stream_copy=allow_stream_copy)
+
+        job.codec_args = plan.codec_args
+        job.strategy = plan.strategy
+        job.source_info = describe_probe(probe)
+
+        base, extension = os.path.splitext(job.output_path)
+        if extension != plan.extension:
+            job.output_path = base + plan.extension
+
+        print(f"[ffmpeg] {job.name or job.source_url}: {plan.strategy} ({plan.reason})")
+
+    def _run_job(self, job: TranscodeJob):
+        """Run one attempt of a job and either finish it or schedule a retry."""
+        job.attempts += 1
+        job.status = 'running'
+        job.started_at = job.started_at or time.monotonic()
+
+        if self.hls_downloader and self.download_dir and not job.local_source and is_hls_url(job.source_url):
+            try:
+                self._download_hls(job)
+            except HLSError as e:
+                self._handle_failure(job, str(e))
+                return
+
+        if job.probe_source and not job.strategy:
+            self._plan_job(job)
+
+        temp_path = partial_output_path(job.output_path)
+        returncode, stderr_tail, stalled = self._run_ffmpeg(job, job.build_command(temp_path))
+
+        if returncode == 0:
+            os.replace(temp_path, job.output_path)
+            if job.local_source and not self.keep_downloads:
+                shutil.rmtree(os.path.dirname(job.local_source), ignore_errors=True)
+            self._finish(job, success=True)
+            return
+
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+
+        if job.strategy in STREAM_COPY_STRATEGIES:
+            # The same stream copy would fail again: retry with a full transcode (back to .mp3)
+            print(f"[ffmpeg] {job.name or job.source_url}: {job.strategy} failed, falling back to a transcode")
+            self._plan_job(job, allow_stream_copy=False)
+
+        self._handle_failure(job, "ffmpeg stalled" if stalled else (stderr_tail or f"ffmpeg exited with {returncode}"))
+
+    def _handle_failure(self, job: TranscodeJob, error: str):
+        """Schedule a retry with backoff, or fail the job once retries run out."""
+        job.error = error
+
+        if job.attempts <= self.max_retries and not self._closed:
+            job.status = 'retrying'
+            delay = self.retry_backoff * job.attempts
+            timer = threading.Timer(delay, self._requeue, args=(job,))
+            timer.daemon = True
+            timer.start()
+        else:
+            self._finish(job, success=False)
+
+    def _requeue(self, job: TranscodeJob):
+        """Queue a retry when its backoff expires, or fail the job if the scheduler shut down meanwhile."""
+        with self._lock:
+            # Checked and queued under the lock, so a retry can never land behind the shutdown sentinels
+            if not self._closed:
+                self._queue.put(job)
+                return
+        job.error = f"{job.error} (scheduler shut down before retry)"
+        self._finish(job, success=False)
+
+    def _run_ffmpeg(self, job: TranscodeJob, cmd: List[str]):
+        """Run ffmpeg, streaming progress and killing it if it stalls."""
+        process = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+                                   stdin=subprocess.DEVNULL, text=True)
+        stderr_lines: deque = deque(maxlen=20)
+        last_progress = [time.monotonic()]
+
+        def read_progress():
+            block = []
+            for line in process.stdout:
+                block.append(line)
+                if line.startswith('progress='):
+                    self._update_progress(job, parse_progress_block(block))
+                    last_progress[0] = time.monotonic()
+                    block = []
+
+        def read_stderr():
+            for line in process.stderr:
+                stderr_lines.append(line.rstrip())
+
+        readers = [threading.Thread(target=read_progress, daemon=True),
+                   threading.Thread(target=read_stderr, daemon=True)]
+        for reader in readers:
+            reader.start()
+
+        stalled = False
+        while process.poll() is None:
+            if time.monotonic() - last_progress[0] > self.stall_timeout:
+                stalled = True
+                process.kill()
+                break
+            time.sleep(0.5)
+
+        process.wait()
+        for reader in readers:
+            reader.join(timeout=5)
+
+        return process.returncode, '\n'.join(stderr_lines), stalled
+
+    def _update_progress(self, job: TranscodeJob, values: Dict[str, str]):
+        """Record progress reported by ffmpeg and notify the progress callback."""
+        out_time_us = values.get('out_time_us') or values.get('out_time_ms')
+        if out_time_us and out_time_us.lstrip('-').isdigit():
+            job.progress_seconds = max(0.0, int(out_time_us) / 1_000_000)
+        job.speed = values.get('speed', job.speed)
+
+        if self.on_progress:
+            self.on_progress(job)
+
+    def _finish(self, job: TranscodeJob, success: bool):
+        """Resolve the job's Future and update bookkeeping."""
+        job.status = 'done' if success else 'failed'
+        job.finished_at = time.monotonic()
+
+        if self.on_complete:
+            try:
+                self.on_complete(job)
+            except Exception as e:
+                print(f"Transcode completion callback failed for {job.name}: {e}")
+
+        with self._lock:
+            future = self._futures.pop(id(job), None)
+            self._pending -= 1
+            self._idle.notify_all()
+
+        if future:
+            if success:
+                future.set_result(job.output_path)
+            else:
+                future.set_exception(TranscodeError(f"{job.name or job.source_url}: {job.error}"))
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """Block until every submitted job has finished; returns False on timeout."""
+        with self._lock:
+            return self._idle.wait_for(lambda: self._pending == 0, timeout=timeout)
+
+    def shutdown(self, wait: bool = True):
+        """Stop accepting jobs and stop the workers once the queue drains."""
+        if wait:
+            self.wait()
+        with self._lock:
+            self._closed = True
+            workers = list(self._workers)
+        for _ in workers:
+            self._queue.put(None)
+        if wait:
+            for worker in workers:
+                worker.join()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.shutdown(wait=exc_type is None)
@@ -0,0 +1 @@
+# Long-running monitoring services (live hearing detection)
@@ -0,0 +1,345 @@
+"""
+Asynchronous watcher that detects scheduled hearings going live.
+
+Every scheduled hearing is polled with conditional GETs on a single event
+loop. Polls get more frequent as the hearing's start time approaches, and a
+hearing is marked live when its stream manifest is open-ended (HLS without
+``#EXT-X-ENDLIST``, dynamic DASH) or its YouTube player reports ``isLive``.
+"""
+import asyncio
+import heapq
+import re
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import Optional, Dict, List, Tuple, Set
+from urllib.parse import urljoin
+
+import aiohttp
+
+from src.database.database import CongressVideoDatabase
+from src.database.models import Hearing
+from src.scrapers.youtube import parse_player_response, extract_video_ids, WATCH_URL
+
+
+MANIFEST_URL_RE = re.compile(r'''https?:(?:\\?/){2}[^"'\s<>]+?\.(?:m3u8|mpd)(?:\?[^"'\s<>\\]*)?''')
+
+USER_AGENT = 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+
+
+def parse_hearing_date(value) -> Optional[datetime]:
+    """Convert a stored hearing_date (datetime or ISO string) to a datetime."""
+    if isinstance(value, datetime):
+        return value
+    if not value:
+        return None
+    try:
+        return datetime.fromisoformat(str(value))
+    except ValueError:
+        return None
+
+
+def detect_live(url: str, text: str) -> Tuple[Optional[bool], List[str]]:
+    """Decide whether a fetched document shows a live stream.
+
+    Returns ``(is_live, follow_urls)``; ``is_live`` is None when the document
+    does not settle it, in which case ``follow_urls`` lists the manifests or
+    watch pages worth checking next.
+    """
+    head = text.lstrip()[:4096]
+
+    if head.startswith('#EXTM3U'):
+        if '#EXT-X-STREAM-INF' in text:
+            # Master playlist: liveness is a property of the media playlists
+            lines = text.splitlines()
+            for index, line in enumerate(lines):
+                if line.startswith('#EXT-X-STREAM-INF'):
+                    uri = next((l.strip() for l in lines[index + 1:] if l.strip() and not l.startswith('#')), None)
+                    return None, [urljoin(url, uri)] if uri else []
+            return None, []
+        if '#EXT-X-ENDLIST' in text or '#EXT-X-PLAYLIST-TYPE:VOD' in text:
+            return False, []
+        return ('#EXTINF' in text) or None, []
+
+    if '<MPD' in head:
+        return 'type="dynamic"' in head or "type='dynamic'" in head, []
+
+    if 'ytInitialPlayerResponse' in text:
+        player = parse_player_response(text, ('videoDetails',))
+        if player and 'videoDetails' in player:
+            return bool(player['videoDetails'].get('isLive')), []
+
+    # A hearing page: follow its embedded manifests and YouTube players
+    follow = [m.replace('\\/', '/') for m in dict.fromkeys(MANIFEST_URL_RE.findall(text))]
+    follow.extend(WATCH_URL.format(video_id) for video_id in extract_video_ids(text)[:3])
+    return None, follow[:5]
+
+
+@dataclass
+class WatchTarget:
+    """Polling state for one hearing."""
+    hearing_id: int
+    page_url: str
+    hearing_date: Optional[datetime] = None
+    stream_url: str = ""  # URL that last settled the live state
+    is_live: bool = False
+    next_check: float = 0.0  # event loop time
+    failures: int = 0
+
+
+@dataclass
+class _Validator:
+    """Conditional-GET validators and last verdict for one URL."""
+    etag: str = ""
+    last_modified: str = ""
+    verdict: Optional[bool] = None
+    follow: List[str] = field(default_factory=list)
+
+
+class LiveHearingWatcher:
+    """Poll scheduled hearings concurrently and record when they go live or end."""
+
+    def __init__(self, db: CongressVideoDatabase, max_concurrency: int = 100, per_host_limit: int = 6,
+                 min_interval: float = 5.0, max_interval: float = 1800.0, live_interval: float = 15.0,
+                 lead_time: float = 900.0, grace_period: float = 6 * 3600, horizon_hours: float = 48,
+                 refresh_interval: float = 300.0, request_timeout: float = 15.0,
+                 max_body_bytes: int = 4 * 1024 * 1024, max_validators: int = 4096):
+        """Initialize the watcher; intervals are in seconds, max_validators bounds the per-URL cache."""
+        self.db = db
+        self.max_concurrency = max_concurrency
+        self.per_host_limit = per_host_limit
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.live_interval = live_interval
+        self.lead_time = lead_time
+        self.grace_period = grace_period
+        self.horizon_hours = horizon_hours
+        self.refresh_interval = refresh_interval
+        self.request_timeout = request_timeout
+        self.max_body_bytes = max_body_bytes
+        self.max_validators = max_validators
+
+        self.targets: Dict[int, WatchTarget] = {}
+        self._heap: List[Tuple[float, int]] = []
+        self._validators: "OrderedDict[str, _Validator]" = OrderedDict()
+        self._in_flight: Set[int] = set()
+        self._tasks: Set[asyncio.Task] = set()
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._stopping = False
+        self.stats = {'requests': 0, 'not_modified': 0, 'errors': 0, 'went_live': 0, 'ended': 0}
+
+    def poll_interval(self, target: WatchTarget, now: datetime) -> Optional[float]:
+        """Seconds until the next poll, or None once the hearing is no longer worth watching."""
+        if target.is_live:
+            return self.live_interval
+        if target.hearing_date is None:
+            return self.max_interval
+
+        until_start = (target.hearing_date - now).total_seconds()
+        if until_start < -self.grace_period:
+            return None
+        if until_start <= self.lead_time:
+            return self.min_interval
+        # Poll at a tenth of the remaining time, so checks tighten as the start nears
+        interval = min(self.max_interval, max(self.min_interval, until_start / 10))
+        return interval * (1 + min(target.failures, 5))
+
+    def _schedule(self, target: WatchTarget, delay: float):
+        """Queue a target's next check."""
+        loop = asyncio.get_running_loop()
+        target.next_check = loop.time() + delay
+        heapq.heappush(self._heap, (target.next_check, target.hearing_id))
+
+    def _now_for(self, target: WatchTarget) -> datetime:
+        """Current time in the same timezone convention as the hearing date."""
+        tz = target.hearing_date.tzinfo if target.hearing_date else None
+        return datetime.now(tz)
+
+    async def refresh_targets(self):
+        """Load scheduled hearings from the database and reconcile the watch list."""
+        loop = asyncio.get_running_loop()
+        cutoff = datetime.now() + timedelta(hours=self.horizon_hours)
+        hearings: List[Hearing] = await loop.run_in_executor(None, self.db.get_scheduled_hearings, cutoff)
+
+        seen = set()
+        for hearing in hearings:
+            url = hearing.video_url or hearing.hearing_url
+            if not hearing.id or not url:
+                continue
+            seen.add(hearing.id)
+            if hearing.id in self.targets:
+                continue
+            target = WatchTarget(
+                hearing_id=hearing.id,
+                page_url=hearing.hearing_url or url,
+                hearing_date=parse_hearing_date(hearing.hearing_date),
+                stream_url=hearing.video_url or "",
+                is_live=bool(hearing.is_live)
+            )
+            if self.poll_interval(target, self._now_for(target)) is None:
+                continue
+            self.targets[hearing.id] = target
+            self._schedule(target, 0)
+
+        for hearing_id in list(self.targets):
+            if hearing_id not in seen and hearing_id not in self._in_flight:
+                del self.targets[hearing_id]
+
+        print(f"[watch] {len(self.targets)} hearings watched ({sum(t.is_live for t in self.targets.values())} live)")
+
+    async def _fetch(self, url: str) -> Tuple[bool, str]:
+        """Conditional GET; returns (changed, body). An unchanged response has an empty body."""
+        validator = self._validators.get(url)
+        if validator:
+            self._validators.move_to_end(url)
+        headers = {}
+        if validator and validator.etag:
+            headers['If-None-Match'] = validator.etag
+        if validator and validator.last_modified:
+            headers['If-Modified-Since'] = validator.last_modified
+
+        self.stats['requests'] += 1
+        async with self._session.get(url, headers=headers) as response:
+            if response.status == 304 and validator:
+                self.stats['not_modified'] += 1
+                return False, ""
+            response.raise_for_status()
+
+            body = await self._read_body(response)
+            self._validators[url] = _Validator(
+                etag=response.headers.get('ETag', ''),
+                last_modified=response.headers.get('Last-Modified', '')
+            )
+            self._validators.move_to_end(url)
+            # Least recently polled URLs (ended hearings, old manifests) are forgotten first
+            while len(self._validators) > self.max_validators:
+                self._validators.popitem(last=False)
+            return True, body.decode(response.charset or 'utf-8', errors='replace')
+
+    async def _read_body(self, response: aiohttp.ClientResponse) -> bytes:
+        """Read a response body to EOF, stopping at max_body_bytes.
+
+        A single StreamReader.read() only returns what is already buffered,
+        which cuts playlists before #EXT-X-ENDLIST and watch pages before the
+        player response.
+        """
+        chunks = []
+        size = 0
+        async for chunk in response.content.iter_chunked(64 * 1024):
+            chunks.append(chunk[:self.max_body_bytes - size])
+            size += len(chunks[-1])
+            if size >= self.max_body_bytes:
+                break
+        return b''.join(chunks)
+
+    async def _probe(self, url: str, depth: int = 0) -> Tuple[Optional[bool], str]:
+        """Resolve a URL's live state, following manifests and players up to two levels deep."""
+        changed, text = await self._fetch(url)
+        validator = self._validators[url]
+        if changed:
+            validator.verdict, validator.follow = detect_live(url, text)
+
+        if validator.verdict is not None or depth >= 2:
+            return validator.verdict, url
+
+        for follow_url in validator.follow:
+            try:
+                verdict, source = await self._probe(follow_url, depth + 1)
+            except (aiohttp.ClientError, asyncio.TimeoutError):
+                continue
+            if verdict is not None:
+                return verdict, source
+        return None, url
+
+    async def _check_target(self, target: WatchTarget, semaphore: asyncio.Semaphore):
+        """Check one hearing and record any transition; the target is always rescheduled."""
+        try:
+            async with semaphore:
+                verdict, source = None, ""
+                try:
+                    if target.stream_url:
+                        verdict, source = await self._probe(target.stream_url)
+                    if verdict is None:
+                        verdict, source = await self._probe(target.page_url)
+                    target.failures = 0
+                except Exception as e:
+                    self.stats['errors'] += 1
+                    target.failures += 1
+                    print(f"[watch] hearing {target.hearing_id}: check failed ({type(e).__name__}: {e})")
+
+            if verdict is not None:
+                target.stream_url = source
+                await self._record(target, verdict)
+        finally:
+            self._in_flight.discard(target.hearing_id)
+            if target.hearing_id in self.targets:
+                interval = self.poll_interval(target, self._now_for(target))
+                if interval is None:
+                    print(f"[watch] hearing {target.hearing_id}: start time long past, no longer watching")
+                    del self.targets[target.hearing_id]
+                else:
+                    self._schedule(target, interval)
+
+    async def _record(self, target: WatchTarget, is_live: bool):
+        """Persist a live/ended transition."""
+        if is_live == target.is_live:
+            return
+
+        loop = asyncio.get_running_loop()
+        if is_live:
+            status = 'live'
+            self.stats['went_live'] += 1
+            print(f"[watch] hearing {target.hearing_id} is LIVE: {target.stream_url}")
+        else:
+            status = 'completed'
+            self.stats['ended'] += 1
+            print(f"[watch] hearing {target.hearing_id} has ended")
+
+        target.is_live = is_live
+        await loop.run_in_executor(None, self.db.update_hearing_status,
+                                   target.hearing_id, status, is_live, target.stream_url or None)
+        if not is_live:
+            self.targets.pop(target.hearing_id, None)
+
+    async def run(self, duration: Optional[float] = None):
+        """Watch until stopped (or for ``duration`` seconds)."""
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + duration if duration else None
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        connector = aiohttp.TCPConnector(limit=self.max_concurrency, limit_per_host=self.per_host_limit,
+                                         ttl_dns_cache=300)
+        timeout = aiohttp.ClientTimeout(total=self.request_timeout)
+        async with aiohttp.ClientSession(connector=connector, timeout=timeout,
+                                         headers={'User-Agent': USER_AGENT}) as session:
+            self._session = session
+            await self.refresh_targets()
+            next_refresh = loop.time() + self.refresh_interval
+
+            while not self._stopping and (deadline is None or loop.time() < deadline):
+                now = loop.time()
+                if now >= next_refresh:
+                    await self.refresh_targets()
+                    next_refresh = now + self.refresh_interval
+
+                while self._heap and self._heap[0][0] <= now:
+                    due_at, hearing_id = heapq.heappop(self._heap)
+                    target = self.targets.get(hearing_id)
+                    # Skip entries superseded by a later reschedule
+                    if not target or target.next_check != due_at or hearing_id in self._in_flight:
+                        continue
+                    self._in_flight.add(hearing_id)
+                    task = asyncio.create_task(self._check_target(target, semaphore))
+                    self._tasks.add(task)
+                    task.add_done_callback(self._tasks.discard)
+
+                wake_at = min(self._heap[0][0] if self._heap else next_refresh, next_refresh)
+                await asyncio.sleep(max(0.05, min(wake_at - loop.time(), 1.0)))
+
+            if self._tasks:
+                await asyncio.gather(*self._tasks, return_exceptions=True)
+            self._session = None
+
+    def stop(self):
+        """Ask the run loop to exit after in-flight checks finish."""
+        self._stopping = True
@@ -2,12 +2,15 @@
 Web scraper for US House of Representatives committees and hearings.
 """
 import re
+import time
 from typing import List, Optional, Dict, Any
 from datetime import datetime
 from bs4 import BeautifulSoup
 
 from src.database.models import Committee, Subcommittee, Hearing, VideoFormat, ScrapeLog
 from src.utils.helpers import WebScraper, VideoFormatDetector, URLNormalizer, TextCleaner
+from src.media.manifest import ManifestAnalyzer
+from src.utils.embed_capture import EmbedCapturePolicy
 
 
 class HouseScraper(WebScraper):
@@ -16,10 +19,12 @@ class HouseScraper(WebScraper):
     BASE_URL = "https://www.house.gov"
     COMMITTEES_URL = "https://www.house.gov/committees"
     
-    def __init__(self, **kwargs):
-        """Initialize House scraper."""
+    def __init__(self, capture_policy: Optional[EmbedCapturePolicy] = None, **kwargs):
+        """Initialize House scraper; capture_policy bounds the embed code kept per format."""
         super().__init__(**kwargs)
         self.chamber = "house"
+        self.capture_policy = capture_policy or EmbedCapturePolicy()
+        self.manifest_analyzer = ManifestAnalyzer(scraper=self)
     
     def scrape_committees(self) -> List[Committee]:
         """Scrape all House committees."""
@@ -168,7 +173,9 @@ class HouseScraper(WebScraper):
             return video_formats
         
         # Use video format detector to find streaming platforms
-        detected_formats = VideoFormatDetector.detect_streaming_platform(soup, hearing.hearing_url)
+        with self.metrics.span('detect_seconds', chamber=self.chamber):
+            detected_formats = VideoFormatDetector.detect_streaming_platform(soup, hearing.hearing_url,
+                                                                             self.capture_policy)
         
         for format_info in detected_formats:
             video_format = VideoFormat(
@@ -177,24 +184,38 @@ class HouseScraper(WebScraper):
                 video_id=format_info.get('video_id', ''),
                 embed_code=format_info.get('embed_code', ''),
                 streaming_url=format_info.get('streaming_url', ''),
+                streaming_protocol=format_info.get('streaming_protocol', ''),
                 player_type=format_info.get('player_type', 'unknown')
             )
             
             # Extract additional technical details
+            technical_details = {}
             if format_info.get('platform') == 'youtube':
-                video_format.set_technical_details({
+                technical_details.update({
                     'embed_url': format_info.get('embed_url', ''),
                     'watch_url': format_info.get('watch_url', ''),
                     'platform_features': ['autoplay', 'controls', 'fullscreen']
                 })
+            if format_info.get('embed_truncated'):
+                technical_details['embed_source'] = {
+                    'sha256': format_info['embed_sha256'],
+                    'size': format_info['embed_size'],
+                    'store_path': format_info.get('embed_store_path', '')
+                }
+            if technical_details:
+                video_format.set_technical_details(technical_details)
             
             video_formats.append(video_format)
         
+        # Fill resolution/codec/protocol from any HLS or DASH manifests found
+        with self.metrics.span('manifest_seconds', chamber=self.chamber):
+            self.manifest_analyzer.enrich_video_formats(video_formats)
+        
         return video_formats
     
     def scrape_all_committees_data(self) -> Dict[str, Any]:
         """Scrape all committees, subcommittees, and hearings data."""
-        start_time = datetime.now()
+        start_time = time.perf_counter()
         results = {
             'committees': [],
             'subcommittees': [],
@@ -214,13 +235,13 @@ class HouseScraper(WebScraper):
                 scrape_type='committee',
                 status='success',
                 records_found=len(committees),
-                scrape_duration=(datetime.now() - start_time).total_seconds()
+                scrape_duration=time.perf_counter() - start_time
             )
             results['scrape_logs'].append(committee_log)
             
             # Scrape subcommittees and hearings for each committee
             for committee in committees:
-                committee_start = datetime.now()
+                committee_start = time.perf_counter()
                 
                 try:
                     # Scrape subcommittees
@@ -242,7 +263,7 @@ class HouseScraper(WebScraper):
                         scrape_type='committee_detail',
                         status='success',
                         records_found=len(subcommittees) + len(hearings),
-                        scrape_duration=(datetime.now() - committee_start).total_seconds()
+                        scrape_duration=time.perf_counter() - committee_start
                     )
                     results['scrape_logs'].append(committee_log)
                     
@@ -253,13 +274,13 @@ class HouseScraper(WebScraper):
                         scrape_type='committee_detail',
                         status='failed',
                         error_message=str(e),
-                        scrape_duration=(datetime.now() - committee_start).total_seconds()
+                        scrape_duration=time.perf_counter() - committee_start
                     )
                     results['scrape_logs'].append(committee_log)
             
             # Scrape video formats for hearings (sample first 10 to avoid overwhelming)
             for hearing in results['hearings'][:10]:
-                hearing_start = datetime.now()
+                hearing_start = time.perf_counter()
                 
                 try:
                     video_formats = self.scrape_hearing_video(hearing)
@@ -271,7 +292,7 @@ class HouseScraper(WebScraper):
                         scrape_type='video',
                         status='success',
                         records_found=len(video_formats),
-                        scrape_duration=(datetime.now() - hearing_start).total_seconds()
+                        scrape_duration=time.perf_counter() - hearing_start
                     )
                     results['scrape_logs'].append(hearing_log)
                     
@@ -282,7 +303,7 @@ class HouseScraper(WebScraper):
                         scrape_type='video',
                         status='failed',
                         error_message=str(e),
-                        scrape_duration=(datetime.now() - hearing_start).total_seconds()
+                        scrape_duration=time.perf_counter() - hearing_start
                     )
                     results['scrape_logs'].append(hearing_log)
         
@@ -293,8 +314,9 @@ class HouseScraper(WebScraper):
                 scrape_type='full_scrape',
                 status='failed',
                 error_message=str(e),
-                scrape_duration=(datetime.now() - start_time).total_seconds()
+                scrape_duration=time.perf_counter() - start_time
             )
             results['scrape_logs'].append(overall_log)
         
+        self.record_scrape_logs(results['scrape_logs'])
         return results
\ No newline at end of file
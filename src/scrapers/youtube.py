@@ -0,0 +1,271 @@
+"""
+YouTube channel and video harvester for committee channels.
+"""
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, asdict
+from typing import Optional, Dict, Any, List, Iterable
+
+import requests
+
+from src.utils.helpers import WebScraper
+from src.utils.json_slice import decode_members
+
+
+WATCH_URL = "https://www.youtube.com/watch?v={}"
+
+PLAYER_RESPONSE_MARKER = b'ytInitialPlayerResponse'
+PLAYER_RESPONSE_RE = re.compile(r'ytInitialPlayerResponse\s*=\s*(?=\{)')
+SCRIPT_END = b'</script>'
+
+# The only player response sections the harvester reads
+PLAYER_SECTIONS = ('videoDetails', 'streamingData', 'playabilityStatus')
+
+VIDEO_ID_PATTERNS = [
+    re.compile(r'"videoId":"([a-zA-Z0-9_-]{11})"'),
+    re.compile(r'watch\?v=([a-zA-Z0-9_-]{11})'),
+    re.compile(r'embed/([a-zA-Z0-9_-]{11})'),
+]
+
+
+def extract_video_ids(html: str) -> List[str]:
+    """Extract YouTube video IDs from a page, in order of first appearance."""
+    found = {}
+    for pattern in VIDEO_ID_PATTERNS:
+        for match in pattern.finditer(html):
+            found.setdefault(match.group(1), match.start())
+    return sorted(found, key=found.get)
+
+
+@dataclass
+class StreamFormat:
+    """One entry of a player response's ``formats`` or ``adaptiveFormats``."""
+    itag: Optional[int] = None
+    mime_type: str = ""
+    container: str = ""
+    codecs: str = ""
+    quality: str = ""
+    quality_label: str = ""
+    bitrate: Optional[int] = None
+    width: Optional[int] = None
+    height: Optional[int] = None
+    fps: Optional[int] = None
+    audio_sample_rate: Optional[int] = None
+    audio_channels: Optional[int] = None
+    content_length: Optional[int] = None
+    duration_ms: Optional[int] = None
+    adaptive: bool = False
+    has_url: bool = False
+
+    @property
+    def is_audio_only(self) -> bool:
+        """True for audio-only adaptive streams."""
+        return self.mime_type.startswith('audio/')
+
+
+def _optional_int(value: Any) -> Optional[int]:
+    """Convert a numeric (or numeric string) field to int, or None."""
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def parse_stream_format(fmt: Dict[str, Any], adaptive: bool) -> StreamFormat:
+    """Build a StreamFormat from one raw format entry."""
+    mime_type = fmt.get('mimeType', '')
+    media_type, _, params = mime_type.partition(';')
+    codecs = params.partition('codecs=')[2].strip().strip('"')
+    return StreamFormat(
+        itag=_optional_int(fmt.get('itag')),
+        mime_type=mime_type,
+        container=media_type.partition('/')[2].strip(),
+        codecs=codecs,
+        quality=fmt.get('quality', ''),
+        quality_label=fmt.get('qualityLabel', ''),
+        bitrate=_optional_int(fmt.get('bitrate')),
+        width=_optional_int(fmt.get('width')),
+        height=_optional_int(fmt.get('height')),
+        fps=_optional_int(fmt.get('fps')),
+        audio_sample_rate=_optional_int(fmt.get('audioSampleRate')),
+        audio_channels=_optional_int(fmt.get('audioChannels')),
+        content_length=_optional_int(fmt.get('contentLength')),
+        duration_ms=_optional_int(fmt.get('approxDurationMs')),
+        adaptive=adaptive,
+        has_url='url' in fmt
+    )
+
+
+def parse_stream_formats(streaming_data: Dict[str, Any]) -> List[StreamFormat]:
+    """Build StreamFormat records for every muxed and adaptive format."""
+    return (
+        [parse_stream_format(fmt, adaptive=False) for fmt in streaming_data.get('formats', [])]
+        + [parse_stream_format(fmt, adaptive=True) for fmt in streaming_data.get('adaptiveFormats', [])]
+    )
+
+
+def parse_player_response(html: str, sections: Iterable[str] = PLAYER_SECTIONS) -> Optional[Dict[str, Any]]:
+    """Decode selected sections of ``ytInitialPlayerResponse`` from a watch page.
+
+    The player response is located by brace matching and only the requested
+    top-level members are decoded, so the scan is linear in the page size.
+    """
+    match = PLAYER_RESPONSE_RE.search(html)
+    if not match:
+        return None
+
+    try:
+        return decode_members(html, match.end(), sections)
+    except ValueError:
+        return None
+
+
+def extract_stream_formats(html: str) -> List[StreamFormat]:
+    """Extract structured format records from a watch page's ``streamingData``."""
+    player = parse_player_response(html, ('streamingData',))
+    return parse_stream_formats(player.get('streamingData', {})) if player else []
+
+
+def summarize_player_response(video_id: str, player: Dict[str, Any]) -> Dict[str, Any]:
+    """Build the video record used by the reports from a player response."""
+    details = player.get('videoDetails', {})
+    streaming = player.get('streamingData', {})
+
+    streaming_urls = [
+        fmt['url'] for fmt in streaming.get('formats', []) + streaming.get('adaptiveFormats', [])
+        if fmt.get('url')
+    ]
+    for key in ('hlsManifestUrl', 'dashManifestUrl'):
+        if streaming.get(key):
+            streaming_urls.append(streaming[key])
+
+    return {
+        'video_id': video_id,
+        'url': WATCH_URL.format(video_id),
+        'title': details.get('title', 'Unknown Title'),
+        'is_live': bool(details.get('isLive')),
+        'is_live_content': bool(details.get('isLiveContent')),
+        'playability': player.get('playabilityStatus', {}).get('status', 'unknown'),
+        'formats': [asdict(fmt) for fmt in parse_stream_formats(streaming)],
+        'streaming_urls': streaming_urls
+    }
+
+
+class YouTubeHarvester(WebScraper):
+    """Fetch committee channels and watch pages concurrently over one connection pool.
+
+    Watch pages are streamed only until the script holding the player response
+    has arrived, and results are cached per video ID for ``cache_ttl`` seconds.
+    """
+
+    def __init__(self, max_workers: int = 8, cache_ttl: float = 3600, timeout: float = 10,
+                 max_page_bytes: int = 4 * 1024 * 1024, **kwargs):
+        """Initialize the harvester."""
+        kwargs.setdefault('delay_range', (0, 0))
+        self.max_workers = max_workers
+        super().__init__(**kwargs)
+        self.cache_ttl = cache_ttl
+        self.timeout = timeout
+        self.max_page_bytes = max_page_bytes
+
+        self._cache: Dict[str, tuple] = {}
+        self._lock = threading.Lock()
+
+    def _create_session(self) -> requests.Session:
+        """Create a session whose pool can serve every worker concurrently."""
+        session = super()._create_session()
+        adapter = self._create_adapter(pool_maxsize=self.max_workers)
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        # Skip the EU consent interstitial, which has no player response
+        session.cookies.set('CONSENT', 'YES+1', domain='.youtube.com')
+        return session
+
+    def _read_player_script(self, url: str) -> Optional[str]:
+        """Stream a watch page until the player response script has been received."""
+        with self.session.get(url, timeout=self.timeout, stream=True) as response:
+            response.raise_for_status()
+            buffer = bytearray()
+            marker_at = -1
+            for chunk in response.iter_content(chunk_size=64 * 1024):
+                buffer.extend(chunk)
+                if marker_at == -1:
+                    marker_at = buffer.find(PLAYER_RESPONSE_MARKER, max(0, len(buffer) - len(chunk) - 32))
+                if marker_at != -1 and buffer.find(SCRIPT_END, marker_at) != -1:
+                    break
+                if len(buffer) > self.max_page_bytes:
+                    break
+            return buffer.decode(response.encoding or 'utf-8', errors='replace')
+
+    def _cached(self, video_id: str) -> Optional[Dict[str, Any]]:
+        """Return a cached video record that has not expired."""
+        with self._lock:
+            entry = self._cache.get(video_id)
+        if entry and entry[0] > time.monotonic():
+            return entry[1]
+        return None
+
+    def fetch_video(self, video_id: str) -> Optional[Dict[str, Any]]:
+        """Fetch one video's title, live state, formats and streaming URLs."""
+        cached = self._cached(video_id)
+        if cached:
+            return cached
+
+        try:
+            html = self._read_player_script(WATCH_URL.format(video_id))
+        except requests.exceptions.RequestException as e:
+            print(f"   Error analyzing video {video_id}: {e}")
+            return None
+
+        player = parse_player_response(html) if html else None
+        if player is None:
+            print(f"   No player response found for video {video_id}")
+            return None
+
+        info = summarize_player_response(video_id, player)
+        with self._lock:
+            self._cache[video_id] = (time.monotonic() + self.cache_ttl, info)
+        return info
+
+    def fetch_videos(self, video_ids: Iterable[str]) -> Dict[str, Optional[Dict[str, Any]]]:
+        """Fetch a batch of videos concurrently."""
+        unique_ids = list(dict.fromkeys(video_ids))
+        if not unique_ids:
+            return {}
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, len(unique_ids))) as executor:
+            return dict(zip(unique_ids, executor.map(self.fetch_video, unique_ids)))
+
+    def fetch_channel_video_ids(self, channel: Dict[str, str]) -> Optional[List[str]]:
+        """Return the video IDs on a channel page, trying its alternate URL; None if missing."""
+        for url in [channel['url'], channel.get('alt_url')]:
+            if not url:
+                continue
+            print(f"   Checking: {url}")
+            response = self.get_page(url, timeout=self.timeout)
+            if response is not None:
+                return extract_video_ids(response.text)
+        return None
+
+    def check_channels(self, channels: List[Dict[str, str]], videos_per_channel: int = 5) -> List[Dict[str, Any]]:
+        """Check channels concurrently, then fetch all of their recent videos in one batch."""
+        with ThreadPoolExecutor(max_workers=max(1, min(self.max_workers, len(channels)))) as executor:
+            channel_ids = list(executor.map(self.fetch_channel_video_ids, channels))
+
+        wanted = [vid for ids in channel_ids if ids for vid in ids[:videos_per_channel]]
+        videos = self.fetch_videos(wanted)
+
+        results = []
+        for channel, ids in zip(channels, channel_ids):
+            recent = [videos[vid] for vid in (ids or [])[:videos_per_channel] if videos.get(vid)]
+            results.append({
+                'name': channel['name'],
+                'primary_url': channel['url'],
+                'alt_url': channel.get('alt_url', ''),
+                'exists': ids is not None,
+                'live_streams': [video for video in recent if video.get('is_live')],
+                'recent_videos': recent,
+                'video_formats': []
+            })
+        return results
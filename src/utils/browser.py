@@ -0,0 +1,224 @@
+"""
+Browser helpers for Selenium-driven video extraction.
+"""
+import json
+import time
+from typing import Optional, Dict, Any, List
+from selenium.common.exceptions import TimeoutException, WebDriverException
+from selenium.webdriver.support.ui import WebDriverWait
+
+
+class NetworkEventListener:
+    """Incrementally consume media responses from Chrome's CDP network events.
+
+    Chrome delivers CDP events through the ``performance`` log. Instead of
+    dumping and decoding the whole buffer after the page loads, the listener
+    drains it in small batches while the page is loading, decodes only
+    ``Network.responseReceived`` events and keeps only media-related ones.
+    """
+
+    RESPONSE_MARKER = '"Network.responseReceived"'
+
+    MANIFEST_EXTENSIONS = ('.m3u8', '.mpd', '.f4m')
+    VIDEO_EXTENSIONS = ('.mp4', '.webm', '.mov', '.avi')
+    AUDIO_EXTENSIONS = ('.mp3', '.aac', '.wav', '.m4a')
+    MANIFEST_MIME_TYPES = (
+        'application/vnd.apple.mpegurl', 'application/x-mpegurl',
+        'audio/mpegurl', 'audio/x-mpegurl', 'application/dash+xml'
+    )
+
+    def __init__(self, driver, max_events: int = 200):
+        """Initialize listener for a WebDriver, keeping at most max_events matches per page."""
+        self.driver = driver
+        self.max_events = max_events
+        self.events: List[Dict[str, Any]] = []
+        self.manifest_seen: Optional[str] = None
+        self.enabled = True
+        self.responses_seen = 0
+
+    @staticmethod
+    def configure_options(options):
+        """Enable network-only performance logging on Chrome options."""
+        logging_prefs = dict(options.capabilities.get('goog:loggingPrefs', {}))
+        logging_prefs['performance'] = 'ALL'
+        options.set_capability('goog:loggingPrefs', logging_prefs)
+        options.add_experimental_option('perfLoggingPrefs', {
+            'enableNetwork': True,
+            'enablePage': False
+        })
+
+    @classmethod
+    def classify(cls, url: str, mime_type: str) -> Optional[str]:
+        """Classify a response as 'manifest', 'video_file', 'audio_file' or 'media_stream'."""
+        path = url.lower().split('?', 1)[0]
+        mime_type = mime_type.lower()
+
+        if mime_type in cls.MANIFEST_MIME_TYPES or path.endswith(cls.MANIFEST_EXTENSIONS):
+            return 'manifest'
+        if path.endswith(cls.VIDEO_EXTENSIONS):
+            return 'video_file'
+        if path.endswith(cls.AUDIO_EXTENSIONS):
+            return 'audio_file'
+        if mime_type.startswith(('video/', 'audio/')):
+            return 'media_stream'
+        return None
+
+    def poll(self) -> List[Dict[str, Any]]:
+        """Drain pending log entries and return the new media events among them."""
+        if not self.enabled:
+            return []
+
+        try:
+            entries = self.driver.get_log('performance')
+        except WebDriverException:
+            # Performance logging not enabled for this driver
+            self.enabled = False
+            return []
+
+        new_events = []
+        for entry in entries:
+            raw = entry.get('message', '')
+            # Cheap substring check so only response events are JSON-decoded
+            if self.RESPONSE_MARKER not in raw:
+                continue
+
+            try:
+                response = json.loads(raw)['message']['params']['response']
+            except (KeyError, ValueError):
+                continue
+
+            self.responses_seen += 1
+            url = response.get('url', '')
+            mime_type = response.get('mimeType', '')
+            kind = self.classify(url, mime_type)
+            if not kind:
+                continue
+
+            event = {'url': url, 'mime_type': mime_type, 'type': kind}
+            if kind == 'manifest' and not self.manifest_seen:
+                self.manifest_seen = url
+            if len(self.events) < self.max_events:
+                self.events.append(event)
+            new_events.append(event)
+
+        return new_events
+
+    def stop_loading(self):
+        """Stop the page load once the media endpoint is known."""
+        try:
+            self.driver.execute_script('window.stop();')
+        except WebDriverException:
+            pass
+
+    def reset(self):
+        """Discard events left over from a previous page."""
+        self.poll()
+        self.events = []
+        self.manifest_seen = None
+        self.responses_seen = 0
+
+
+class MediaReadinessDetector:
+    """Wait for a page's media player to become ready instead of sleeping a fixed time."""
+
+    # Returns the first readiness signal found in the page, or null
+    READY_SCRIPT = """
+    try {
+        if (typeof jwplayer !== 'undefined') {
+            var players = [];
+            if (jwplayer.api && jwplayer.api.getPlayers) {
+                players = jwplayer.api.getPlayers();
+            } else if (jwplayer().getConfig) {
+                players = [jwplayer()];
+            }
+            for (var i = 0; i < players.length; i++) {
+                var playlist = players[i].getPlaylist ? players[i].getPlaylist() : null;
+                if (playlist && playlist.length > 0) {
+                    return {signal: 'jwplayer_playlist', url: playlist[0].file || null};
+                }
+            }
+        }
+    } catch (e) {}
+
+    var media = document.querySelectorAll('video, audio');
+    for (var j = 0; j < media.length; j++) {
+        var src = media[j].currentSrc || media[j].src;
+        if (!src) {
+            var source = media[j].querySelector('source[src]');
+            src = source ? source.src : null;
+        }
+        if (src) {
+            return {signal: 'video_source', url: src};
+        }
+    }
+
+    return null;
+    """
+
+    def __init__(self, driver, timeout: float = 10, poll_frequency: float = 0.25,
+                 network: Optional[NetworkEventListener] = None):
+        """Initialize detector for a WebDriver with an upper-bound timeout."""
+        self.driver = driver
+        self.timeout = timeout
+        self.poll_frequency = poll_frequency
+        self.network = network or NetworkEventListener(driver)
+
+    def wait_for_media(self, timeout: Optional[float] = None,
+                       stop_on_manifest: bool = False) -> Optional[Dict[str, Any]]:
+        """Block until a media readiness signal appears or the timeout expires.
+
+        Returns a dict describing the signal ('jwplayer_playlist', 'video_source'
+        or 'network_manifest') along with the elapsed time, or None on timeout.
+        With stop_on_manifest, the rest of the page load is cancelled as soon as
+        a manifest response is seen.
+        """
+        timeout = self.timeout if timeout is None else timeout
+        start = time.monotonic()
+
+        try:
+            result = WebDriverWait(self.driver, timeout, poll_frequency=self.poll_frequency).until(
+                self._check_ready
+            )
+        except TimeoutException:
+            return None
+
+        result['elapsed'] = round(time.monotonic() - start, 3)
+        if stop_on_manifest and result['signal'] == 'network_manifest':
+            self.network.stop_loading()
+        return result
+
+    def wait_for_document(self, timeout: Optional[float] = None) -> bool:
+        """Block until document.readyState is complete, up to the timeout."""
+        timeout = self.timeout if timeout is None else timeout
+        try:
+            WebDriverWait(self.driver, timeout, poll_frequency=self.poll_frequency).until(
+                lambda d: d.execute_script("return document.readyState") == "complete"
+            )
+            return True
+        except TimeoutException:
+            return False
+
+    def _check_ready(self, driver) -> Optional[Dict[str, Any]]:
+        """Single poll: check the player, media elements, then the network log."""
+        try:
+            result = driver.execute_script(self.READY_SCRIPT)
+        except WebDriverException:
+            result = None
+
+        if result:
+            return result
+
+        self.network.poll()
+        if self.network.manifest_seen:
+            return {'signal': 'network_manifest', 'url': self.network.manifest_seen}
+
+        return None
+
+    def reset(self):
+        """Discard network events left over from a previous page."""
+        self.network.reset()
+
+    def network_events(self) -> List[Dict[str, Any]]:
+        """Return the media network events captured for the current page."""
+        self.network.poll()
+        return list(self.network.events)
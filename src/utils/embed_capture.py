@@ -0,0 +1,120 @@
+"""
+Bounded capture of player embed code.
+
+Inline scripts that mention a player are often whole bundles of hundreds of
+kilobytes. Instead of storing them verbatim, the capture policy keeps only the
+player setup call (bounded in length) together with a SHA-256 and size of the
+full script, and can optionally keep the full body in a gzip side store keyed
+by that hash.
+"""
+import gzip
+import hashlib
+import os
+import re
+from typing import Optional, Dict, Any, List
+
+from src.utils.js_literal import find_literal_end, JSLiteralError
+
+
+# Player setup calls whose argument list is worth keeping
+PLAYER_CALL_RE = re.compile(
+    r'(?:jwplayer\s*\([^()]*\)\s*\.\s*setup|videojs|\bvideojs\.getPlayer|\.setup)\s*(?=\()'
+)
+
+TRUNCATION_MARKER = '/* ...truncated */'
+
+
+class EmbedSideStore:
+    """Content-addressed gzip store for full embed bodies."""
+
+    def __init__(self, root: str):
+        """Initialize the store rooted at a directory."""
+        self.root = root
+
+    def path_for(self, digest: str) -> str:
+        """Return the file path for a content hash."""
+        return os.path.join(self.root, digest[:2], f"{digest}.gz")
+
+    def put(self, digest: str, content: str) -> str:
+        """Store content once under its hash and return the path."""
+        path = self.path_for(digest)
+        if not os.path.exists(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            temp_path = f"{path}.tmp"
+            with gzip.open(temp_path, 'wt', encoding='utf-8') as f:
+                f.write(content)
+            os.replace(temp_path, path)
+        return path
+
+    def get(self, digest: str) -> Optional[str]:
+        """Load content by hash, or None if it was never stored."""
+        path = self.path_for(digest)
+        if not os.path.exists(path):
+            return None
+        with gzip.open(path, 'rt', encoding='utf-8') as f:
+            return f.read()
+
+
+class EmbedCapturePolicy:
+    """Decide how much of an embed's source is kept with a detected format."""
+
+    def __init__(self, max_snippet_chars: int = 4096, context_chars: int = 512,
+                 side_store: Optional[EmbedSideStore] = None):
+        """Initialize the policy; side_store keeps full bodies when given."""
+        self.max_snippet_chars = max_snippet_chars
+        self.context_chars = context_chars
+        self.side_store = side_store
+
+    def _bound(self, text: str) -> str:
+        """Truncate text to the snippet budget."""
+        if len(text) <= self.max_snippet_chars:
+            return text
+        return text[:self.max_snippet_chars - len(TRUNCATION_MARKER)] + TRUNCATION_MARKER
+
+    def setup_snippet(self, source: str, keyword: str) -> str:
+        """Extract the player setup call(s) from a script, or the text around the keyword."""
+        calls: List[str] = []
+        budget = self.max_snippet_chars
+        for match in PLAYER_CALL_RE.finditer(source):
+            try:
+                end = find_literal_end(source, match.end())
+            except JSLiteralError:
+                continue
+            call = source[match.start():end]
+            calls.append(call)
+            budget -= len(call)
+            if budget <= 0:
+                break
+
+        if calls:
+            return self._bound(';\n'.join(calls))
+
+        position = source.lower().find(keyword.lower())
+        if position == -1:
+            return self._bound(source)
+        start = max(0, position - self.context_chars)
+        return self._bound(source[start:start + self.max_snippet_chars])
+
+    def _describe(self, source: str, embed_code: str) -> Dict[str, Any]:
+        """Hash the full source and optionally keep it in the side store."""
+        digest = hashlib.sha256(source.encode('utf-8')).hexdigest()
+        captured = {
+            'embed_code': embed_code,
+            'embed_sha256': digest,
+            'embed_size': len(source),
+            'embed_truncated': embed_code != source
+        }
+        if self.side_store and captured['embed_truncated']:
+            captured['embed_store_path'] = self.side_store.put(digest, source)
+        return captured
+
+    def capture_script(self, source: str, keyword: str) -> Dict[str, Any]:
+        """Capture an inline player script as a bounded setup snippet."""
+        return self._describe(source, self.setup_snippet(source, keyword))
+
+    def capture_markup(self, markup: str) -> Dict[str, Any]:
+        """Capture an iframe or video element, bounded in length."""
+        return self._describe(markup, self._bound(markup))
+
+
+DEFAULT_CAPTURE_POLICY = EmbedCapturePolicy()
@@ -8,32 +8,110 @@ from typing import Optional, Dict, Any, List
 from urllib.parse import urljoin, urlparse, parse_qs
 import requests
 from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
 from urllib3.util.retry import Retry
 from bs4 import BeautifulSoup
 
+from src.database.models import ScrapeLog
+from src.utils.embed_capture import EmbedCapturePolicy, DEFAULT_CAPTURE_POLICY
+from src.utils.metrics import MetricsRegistry, METRICS
+from src.utils.signatures import VIDEO_SIGNATURE_ENGINE
+
+
+def _timed_pool_classes(metrics: MetricsRegistry) -> Dict[str, type]:
+    """Connection pool classes whose connections time TCP connect and TLS handshake."""
+    
+    class TimedHTTPConnection(HTTPConnection):
+        def _new_conn(self):
+            """Open the TCP connection, timing it."""
+            start = time.perf_counter()
+            try:
+                return super()._new_conn()
+            finally:
+                # Includes DNS resolution, which urllib3 performs inside create_connection
+                metrics.observe('http_connect_seconds', time.perf_counter() - start, host=self.host)
+    
+    class TimedHTTPSConnection(HTTPSConnection):
+        _connect_seconds = 0.0
+        
+        def _new_conn(self):
+            """Open the TCP connection, timing it."""
+            start = time.perf_counter()
+            try:
+                return super()._new_conn()
+            finally:
+                self._connect_seconds = time.perf_counter() - start
+                metrics.observe('http_connect_seconds', self._connect_seconds, host=self.host)
+        
+        def connect(self):
+            """Connect and handshake; TLS time excludes the TCP connect."""
+            self._connect_seconds = 0.0
+            start = time.perf_counter()
+            super().connect()
+            metrics.observe('http_tls_seconds', time.perf_counter() - start - self._connect_seconds,
+                            host=self.host)
+    
+    return {
+        'http': type('TimedHTTPConnectionPool', (HTTPConnectionPool,), {'ConnectionCls': TimedHTTPConnection}),
+        'https': type('TimedHTTPSConnectionPool', (HTTPSConnectionPool,), {'ConnectionCls': TimedHTTPSConnection}),
+    }
+
+
+class TimedHTTPAdapter(HTTPAdapter):
+    """HTTPAdapter that records connect, TLS and time-to-first-byte per host."""
+    
+    def __init__(self, metrics: Optional[MetricsRegistry] = None, **kwargs):
+        """Initialize the adapter; kwargs are passed to HTTPAdapter."""
+        self.metrics = metrics or METRICS
+        super().__init__(**kwargs)
+    
+    def init_poolmanager(self, *args, **kwargs):
+        """Create the pool manager with timed connection classes."""
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = _timed_pool_classes(self.metrics)
+    
+    def send(self, request, **kwargs):
+        """Send a request; the response carries its time to first byte as ``ttfb``."""
+        host = urlparse(request.url).hostname
+        start = time.perf_counter()
+        try:
+            response = super().send(request, **kwargs)
+        except Exception:
+            self.metrics.inc('http_errors_total', host=host)
+            raise
+        # Headers have been parsed; the body is read afterwards unless streaming
+        response.ttfb = time.perf_counter() - start
+        self.metrics.observe('http_ttfb_seconds', response.ttfb, host=host)
+        return response
+
 
 class WebScraper:
     """Base web scraper with rate limiting and error handling."""
     
-    def __init__(self, delay_range: tuple = (1, 3), max_retries: int = 3):
+    def __init__(self, delay_range: tuple = (1, 3), max_retries: int = 3,
+                 metrics: Optional[MetricsRegistry] = None):
         """Initialize scraper with rate limiting and retry configuration."""
         self.delay_range = delay_range
         self.max_retries = max_retries
+        self.metrics = metrics or METRICS
         self.session = self._create_session()
     
-    def _create_session(self) -> requests.Session:
-        """Create a requests session with retry strategy."""
-        session = requests.Session()
-        
-        # Configure retry strategy
+    def _create_adapter(self, **kwargs) -> HTTPAdapter:
+        """Create an instrumented adapter with the retry strategy."""
         retry_strategy = Retry(
             total=self.max_retries,
             backoff_factor=1,
             status_forcelist=[429, 500, 502, 503, 504],
             allowed_methods=["HEAD", "GET", "OPTIONS"]
         )
+        return TimedHTTPAdapter(metrics=self.metrics, max_retries=retry_strategy, **kwargs)
+    
+    def _create_session(self) -> requests.Session:
+        """Create a requests session with retry strategy."""
+        session = requests.Session()
         
-        adapter = HTTPAdapter(max_retries=retry_strategy)
+        adapter = self._create_adapter()
         session.mount("http://", adapter)
         session.mount("https://", adapter)
         
@@ -46,25 +124,59 @@ class WebScraper:
     
     def get_page(self, url: str, **kwargs) -> Optional[requests.Response]:
         """Get a web page with rate limiting and error handling."""
+        host = urlparse(url).hostname
         try:
             # Rate limiting
             delay = random.uniform(*self.delay_range)
-            time.sleep(delay)
+            with self.metrics.span('rate_limit_sleep_seconds'):
+                time.sleep(delay)
             
+            start = time.perf_counter()
             response = self.session.get(url, **kwargs)
+            elapsed = time.perf_counter() - start
+            self.metrics.observe('http_request_seconds', elapsed, host=host)
+            if not kwargs.get('stream') and getattr(response, 'ttfb', None) is not None:
+                self.metrics.observe('http_download_seconds', max(0.0, elapsed - response.ttfb), host=host)
+                self.metrics.inc('http_response_bytes_total', len(response.content), host=host)
+            
             response.raise_for_status()
             return response
             
         except requests.exceptions.RequestException as e:
             print(f"Error fetching {url}: {e}")
+            self.metrics.inc('http_failed_requests_total', host=host)
             return None
     
     def get_soup(self, url: str, **kwargs) -> Optional[BeautifulSoup]:
         """Get a BeautifulSoup object for a web page."""
         response = self.get_page(url, **kwargs)
         if response:
-            return BeautifulSoup(response.content, 'html.parser')
+            with self.metrics.span('parse_seconds'):
+                return BeautifulSoup(response.content, 'html.parser')
         return None
+    
+    def record_scrape_logs(self, logs: List[ScrapeLog]):
+        """Record scrape log durations as per-type, per-status histograms."""
+        for log in logs:
+            self.metrics.observe('scrape_seconds', log.scrape_duration,
+                                 scrape_type=log.scrape_type, status=log.status)
+
+
+# Tags that can carry a player; matched in a single walk of the tree
+PLAYER_TAGS = frozenset(['iframe', 'video', 'script'])
+
+YOUTUBE_PATTERNS = [re.compile(pattern) for pattern in (
+    r'youtube\.com/embed/([a-zA-Z0-9_-]+)',
+    r'youtube\.com/watch\?v=([a-zA-Z0-9_-]+)',
+    r'youtu\.be/([a-zA-Z0-9_-]+)',
+    r'youtube-nocookie\.com/embed/([a-zA-Z0-9_-]+)'
+)]
+
+VIMEO_PATTERNS = [re.compile(pattern) for pattern in (
+    r'vimeo\.com/video/(\d+)',
+    r'player\.vimeo\.com/video/(\d+)',
+    r'vimeo\.com/(\d+)'
+)]
 
 
 class VideoFormatDetector:
@@ -73,15 +185,8 @@ class VideoFormatDetector:
     @staticmethod
     def extract_youtube_info(embed_code: str) -> Optional[Dict[str, Any]]:
         """Extract YouTube video information from embed code."""
-        youtube_patterns = [
-            r'youtube\.com/embed/([a-zA-Z0-9_-]+)',
-            r'youtube\.com/watch\?v=([a-zA-Z0-9_-]+)',
-            r'youtu\.be/([a-zA-Z0-9_-]+)',
-            r'youtube-nocookie\.com/embed/([a-zA-Z0-9_-]+)'
-        ]
-        
-        for pattern in youtube_patterns:
-            match = re.search(pattern, embed_code)
+        for pattern in YOUTUBE_PATTERNS:
+            match = pattern.search(embed_code)
             if match:
                 video_id = match.group(1)
                 return {
@@ -96,14 +201,8 @@ class VideoFormatDetector:
     @staticmethod
     def extract_vimeo_info(embed_code: str) -> Optional[Dict[str, Any]]:
         """Extract Vimeo video information from embed code."""
-        vimeo_patterns = [
-            r'vimeo\.com/video/(\d+)',
-            r'player\.vimeo\.com/video/(\d+)',
-            r'vimeo\.com/(\d+)'
-        ]
-        
-        for pattern in vimeo_patterns:
-            match = re.search(pattern, embed_code)
+        for pattern in VIMEO_PATTERNS:
+            match = pattern.search(embed_code)
             if match:
                 video_id = match.group(1)
                 return {
@@ -116,81 +215,91 @@ class VideoFormatDetector:
         return None
     
     @staticmethod
-    def detect_streaming_platform(soup: BeautifulSoup, url: str) -> List[Dict[str, Any]]:
-        """Detect streaming platforms and video information from a web page."""
-        detected_formats = []
+    def detect_streaming_platform(soup: BeautifulSoup, url: str,
+                                  capture_policy: Optional[EmbedCapturePolicy] = None) -> List[Dict[str, Any]]:
+        """Detect streaming platforms and video information from a web page.
         
-        # Look for iframe embeds
-        iframes = soup.find_all('iframe', src=True)
-        for iframe in iframes:
-            src = iframe.get('src', '')
-            
-            # YouTube detection
-            youtube_info = VideoFormatDetector.extract_youtube_info(src)
-            if youtube_info:
-                youtube_info.update({
-                    'embed_code': str(iframe),
-                    'streaming_url': src,
-                    'player_type': 'embedded'
-                })
-                detected_formats.append(youtube_info)
+        Embed code is captured through the capture policy, so inline player
+        scripts are reduced to their setup call plus a hash of the full body.
+        Scripts and other iframes are matched against every player and stream
+        signature in one pass (see src/utils/signatures.py).
+        """
+        capture = capture_policy or DEFAULT_CAPTURE_POLICY
+        iframe_formats = []
+        video_formats = []
+        script_formats = []
+        
+        # One walk over the tree for all three tag types (a plain descendants loop is far
+        # cheaper than find_all's per-element matching); results keep the iframe, video,
+        # script grouping
+        for tag in soup.descendants:
+            name = tag.name
+            if name not in PLAYER_TAGS:
                 continue
             
-            # Vimeo detection
-            vimeo_info = VideoFormatDetector.extract_vimeo_info(src)
-            if vimeo_info:
-                vimeo_info.update({
-                    'embed_code': str(iframe),
-                    'streaming_url': src,
-                    'player_type': 'embedded'
-                })
-                detected_formats.append(vimeo_info)
-                continue
+            if name == 'iframe':
+                src = tag.get('src')
+                if not src:
+                    continue
+                
+                # YouTube and Vimeo embeds keep their embed and watch URLs
+                info = VideoFormatDetector.extract_youtube_info(src) or VideoFormatDetector.extract_vimeo_info(src)
+                if info:
+                    info.update({
+                        **capture.capture_markup(str(tag)),
+                        'streaming_url': src,
+                        'player_type': 'embedded'
+                    })
+                    iframe_formats.append(info)
+                    continue
+                
+                # Hosted players (Brightcove, Kaltura, Wistia, Panopto, ...) and manifests by embed URL
+                found = VIDEO_SIGNATURE_ENGINE.describe(src, url)
+                if found:
+                    del found['signature']
+                    iframe_formats.append({
+                        **found,
+                        **capture.capture_markup(str(tag)),
+                        'streaming_url': found['streaming_url'] or src,
+                        'player_type': 'embedded'
+                    })
+                elif 'video' in src or 'stream' in src or 'media' in src:
+                    iframe_formats.append({
+                        'platform': 'custom',
+                        **capture.capture_markup(str(tag)),
+                        'streaming_url': src,
+                        'player_type': 'embedded'
+                    })
             
-            # Generic video embed
-            if any(domain in src for domain in ['video', 'stream', 'media']):
-                detected_formats.append({
-                    'platform': 'custom',
-                    'embed_code': str(iframe),
+            elif name == 'video':
+                src = tag.get('src')
+                if src is None:
+                    continue
+                video_formats.append({
+                    'platform': 'html5',
+                    **capture.capture_markup(str(tag)),
                     'streaming_url': src,
-                    'player_type': 'embedded'
+                    'player_type': 'native'
                 })
-        
-        # Look for video tags
-        videos = soup.find_all('video', src=True)
-        for video in videos:
-            src = video.get('src', '')
-            detected_formats.append({
-                'platform': 'html5',
-                'embed_code': str(video),
-                'streaming_url': src,
-                'player_type': 'native'
-            })
-        
-        # Look for JavaScript video players
-        scripts = soup.find_all('script', string=True)
-        for script in scripts:
-            script_content = script.string
-            if not script_content:
-                continue
             
-            # JW Player detection
-            if 'jwplayer' in script_content.lower():
-                detected_formats.append({
-                    'platform': 'jwplayer',
-                    'embed_code': str(script),
-                    'player_type': 'javascript'
-                })
-            
-            # Video.js detection
-            elif 'videojs' in script_content.lower():
-                detected_formats.append({
-                    'platform': 'videojs',
-                    'embed_code': str(script),
-                    'player_type': 'javascript'
-                })
+            else:
+                script_content = tag.string
+                if not script_content:
+                    continue
+                
+                # One pass over the script for every player and stream signature (JW Player wins
+                # ties); a player set up here is a JavaScript player whatever its embed type
+                found = VIDEO_SIGNATURE_ENGINE.describe(script_content, url)
+                if found:
+                    keyword = found.pop('signature')
+                    if found['player_type'] != 'stream':
+                        found['player_type'] = 'javascript'
+                    script_formats.append({
+                        **found,
+                        **capture.capture_script(script_content, keyword)
+                    })
         
-        return detected_formats
+        return iframe_formats + video_formats + script_formats
 
 
 class URLNormalizer:
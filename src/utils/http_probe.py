@@ -0,0 +1,148 @@
+"""
+Concurrent HTTP HEAD probing with per-host connection limits.
+"""
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Optional, Dict, List, Iterable, Tuple, Union
+from urllib.parse import urljoin, urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+
+
+@dataclass
+class ProbeResult:
+    """Outcome of probing one URL."""
+    url: str
+    status: Optional[int] = None
+    final_url: str = ""
+    content_type: str = ""
+    content_length: Optional[int] = None
+    elapsed: float = 0.0  # seconds
+    error: str = ""
+    cached: bool = False
+
+    @property
+    def ok(self) -> bool:
+        """True for a 200 response."""
+        return self.status == 200
+
+
+class HTTPProber:
+    """Probe many URLs concurrently over pooled keep-alive connections.
+
+    At most ``per_host_limit`` requests are in flight to any one host. Results
+    are cached by URL, so committees sharing a host are probed once. A
+    connection failure marks the host dead and the remaining probes for it
+    return immediately instead of waiting out their own timeouts.
+    """
+
+    def __init__(self, session: Optional[requests.Session] = None, max_workers: int = 32,
+                 per_host_limit: int = 4, timeout: Union[float, Tuple[float, float]] = (3.05, 10),
+                 cache_ttl: Optional[float] = None):
+        """Initialize the prober; timeout is (connect, read) seconds."""
+        self.session = session or self._create_session(per_host_limit)
+        self.max_workers = max_workers
+        self.per_host_limit = per_host_limit
+        self.timeout = timeout
+        self.cache_ttl = cache_ttl
+
+        self._cache: Dict[str, Tuple[float, ProbeResult]] = {}
+        self._host_slots: Dict[str, threading.BoundedSemaphore] = {}
+        self._dead_hosts: Dict[str, str] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _create_session(per_host_limit: int) -> requests.Session:
+        """Create a session keeping up to per_host_limit connections alive per host."""
+        session = requests.Session()
+        session.headers.update({
+            'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+        })
+        adapter = HTTPAdapter(pool_connections=100, pool_maxsize=per_host_limit)
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        return session
+
+    def _host_slot(self, host: str) -> threading.BoundedSemaphore:
+        """Return the semaphore limiting concurrent requests to a host."""
+        with self._lock:
+            slot = self._host_slots.get(host)
+            if slot is None:
+                slot = self._host_slots[host] = threading.BoundedSemaphore(self.per_host_limit)
+            return slot
+
+    def _cached(self, url: str) -> Optional[ProbeResult]:
+        """Return a cached result that has not expired."""
+        with self._lock:
+            entry = self._cache.get(url)
+        if entry is None:
+            return None
+        stored_at, result = entry
+        if self.cache_ttl is not None and time.monotonic() - stored_at > self.cache_ttl:
+            return None
+        return ProbeResult(**{**result.__dict__, 'cached': True})
+
+    def is_dead(self, url: str) -> bool:
+        """Check whether a URL's host has already failed to connect."""
+        return urlparse(url).netloc in self._dead_hosts
+
+    def probe(self, url: str) -> ProbeResult:
+        """HEAD one URL, falling back to a streamed GET when HEAD is refused."""
+        cached = self._cached(url)
+        if cached:
+            return cached
+
+        host = urlparse(url).netloc
+        if host in self._dead_hosts:
+            return ProbeResult(url=url, error=f"host unreachable: {self._dead_hosts[host]}")
+
+        with self._host_slot(host):
+            # Another probe may have found the host dead while we waited
+            if host in self._dead_hosts:
+                return ProbeResult(url=url, error=f"host unreachable: {self._dead_hosts[host]}")
+
+            start = time.perf_counter()
+            try:
+                response = self.session.head(url, timeout=self.timeout, allow_redirects=True)
+                if response.status_code in (403, 405, 501):
+                    # Some servers refuse HEAD; read only the headers of a GET
+                    response = self.session.get(url, timeout=self.timeout, stream=True)
+                    response.close()
+            except (requests.exceptions.ConnectionError, requests.exceptions.ConnectTimeout) as e:
+                with self._lock:
+                    self._dead_hosts[host] = type(e).__name__
+                return ProbeResult(url=url, error=str(e), elapsed=time.perf_counter() - start)
+            except requests.exceptions.RequestException as e:
+                return ProbeResult(url=url, error=str(e), elapsed=time.perf_counter() - start)
+
+        length = response.headers.get('content-length', '')
+        result = ProbeResult(
+            url=url,
+            status=response.status_code,
+            final_url=response.url,
+            content_type=response.headers.get('content-type', ''),
+            content_length=int(length) if length.isdigit() else None,
+            elapsed=time.perf_counter() - start
+        )
+
+        with self._lock:
+            self._cache[url] = (time.monotonic(), result)
+        return result
+
+    def probe_many(self, urls: Iterable[str]) -> Dict[str, ProbeResult]:
+        """Probe a batch of URLs concurrently, preserving input order."""
+        unique_urls = list(dict.fromkeys(urls))
+        if not unique_urls:
+            return {}
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, len(unique_urls))) as executor:
+            return dict(zip(unique_urls, executor.map(self.probe, unique_urls)))
+
+    def probe_paths(self, base_urls: Iterable[str], paths: Iterable[str]) -> Dict[str, List[ProbeResult]]:
+        """Probe every path on every site in one concurrent batch."""
+        paths = list(paths)
+        targets = {base_url: [urljoin(base_url, path) for path in paths] for base_url in base_urls}
+        results = self.probe_many(url for urls in targets.values() for url in urls)
+        return {base_url: [results[url] for url in urls] for base_url, urls in targets.items()}
@@ -0,0 +1,302 @@
+"""
+Parser for JavaScript object and array literals embedded in web pages.
+
+Player setup calls such as ``jwplayer("player").setup({...})`` are written as
+JavaScript rather than JSON: keys are often unquoted, strings may use single
+quotes, trailing commas are common and values can be arbitrary expressions.
+This module parses the literal parts into Python values and keeps anything it
+cannot evaluate as a ``JSExpression`` holding the raw source text.
+"""
+import re
+from typing import Any, Tuple
+
+
+class JSLiteralError(ValueError):
+    """Raised when text does not contain a parseable JavaScript literal."""
+
+
+class JSExpression(str):
+    """Raw source text of a value that is not a plain literal (call, variable, etc.)."""
+
+
+_NUMBER_RE = re.compile(r'[+-]?(?:0[xX][0-9a-fA-F]+|(?:\d+\.?\d*|\.\d+)(?:[eE][+-]?\d+)?)')
+_IDENT_RE = re.compile(r'[A-Za-z_$][\w$]*')
+_KEYWORDS = {
+    'true': True,
+    'false': False,
+    'null': None,
+    'undefined': None,
+    'NaN': float('nan'),
+    'Infinity': float('inf'),
+}
+_ESCAPES = {
+    'n': '\n', 't': '\t', 'r': '\r', 'b': '\b', 'f': '\f', 'v': '\v', '0': '\0',
+}
+_CLOSERS = {'{': '}', '[': ']', '(': ')'}
+
+
+class _Parser:
+    """Recursive-descent parser over a source string."""
+
+    def __init__(self, text: str, max_depth: int = 64):
+        self.text = text
+        self.length = len(text)
+        self.max_depth = max_depth
+
+    def skip_space(self, pos: int) -> int:
+        """Skip whitespace and comments."""
+        text = self.text
+        while pos < self.length:
+            char = text[pos]
+            if char.isspace():
+                pos += 1
+            elif text.startswith('//', pos):
+                end = text.find('\n', pos)
+                pos = self.length if end == -1 else end + 1
+            elif text.startswith('/*', pos):
+                end = text.find('*/', pos + 2)
+                pos = self.length if end == -1 else end + 2
+            else:
+                break
+        return pos
+
+    def parse_value(self, pos: int, depth: int = 0) -> Tuple[Any, int]:
+        """Parse one value starting at pos and return (value, end position)."""
+        if depth > self.max_depth:
+            raise JSLiteralError("Literal nested too deeply")
+
+        pos = self.skip_space(pos)
+        if pos >= self.length:
+            raise JSLiteralError("Unexpected end of input")
+
+        char = self.text[pos]
+        if char == '{':
+            value, end = self.parse_object(pos, depth)
+        elif char == '[':
+            value, end = self.parse_array(pos, depth)
+        elif char in '"\'`':
+            value, end = self.parse_string(pos)
+        else:
+            value, end = self.parse_scalar(pos)
+
+        # A literal followed by an operator (e.g. 'a' + b) is really an expression
+        after = self.skip_space(end)
+        if after < self.length and self.text[after] not in ',}]);':
+            expr_end = self.skip_expression(pos)
+            return JSExpression(self.text[pos:expr_end].strip()), expr_end
+
+        return value, end
+
+    def parse_object(self, pos: int, depth: int) -> Tuple[dict, int]:
+        """Parse an object literal starting at '{'."""
+        result = {}
+        pos += 1
+        while True:
+            pos = self.skip_space(pos)
+            if pos >= self.length:
+                raise JSLiteralError("Unterminated object literal")
+            if self.text[pos] == '}':
+                return result, pos + 1
+
+            key, pos = self.parse_key(pos)
+            pos = self.skip_space(pos)
+
+            if pos < self.length and self.text[pos] == ':':
+                value, pos = self.parse_value(pos + 1, depth + 1)
+            elif pos < self.length and self.text[pos] == '(':
+                # Method shorthand: name() { ... }
+                end = self.skip_expression(pos)
+                value = JSExpression(self.text[pos:end].strip())
+                pos = end
+            else:
+                # Property shorthand: { file } refers to a variable
+                value = JSExpression(key)
+            result[key] = value
+
+            pos = self.skip_space(pos)
+            if pos < self.length and self.text[pos] == ',':
+                pos += 1
+            elif pos < self.length and self.text[pos] == '}':
+                continue
+            else:
+                raise JSLiteralError(f"Expected ',' or '}}' at position {pos}")
+
+    def parse_array(self, pos: int, depth: int) -> Tuple[list, int]:
+        """Parse an array literal starting at '['."""
+        result = []
+        pos += 1
+        while True:
+            pos = self.skip_space(pos)
+            if pos >= self.length:
+                raise JSLiteralError("Unterminated array literal")
+            if self.text[pos] == ']':
+                return result, pos + 1
+
+            value, pos = self.parse_value(pos, depth + 1)
+            result.append(value)
+
+            pos = self.skip_space(pos)
+            if pos < self.length and self.text[pos] == ',':
+                pos += 1
+            elif pos < self.length and self.text[pos] == ']':
+                continue
+            else:
+                raise JSLiteralError(f"Expected ',' or ']' at position {pos}")
+
+    def parse_key(self, pos: int) -> Tuple[str, int]:
+        """Parse an object key: identifier, string or number."""
+        char = self.text[pos]
+        if char in '"\'`':
+            return self.parse_string(pos)
+        if char == '[':
+            # Computed key
+            end = self.skip_balanced(pos)
+            return self.text[pos:end], end
+
+        match = _IDENT_RE.match(self.text, pos) or _NUMBER_RE.match(self.text, pos)
+        if not match:
+            raise JSLiteralError(f"Invalid object key at position {pos}")
+        return match.group(0), match.end()
+
+    def parse_string(self, pos: int) -> Tuple[str, int]:
+        """Parse a quoted string, decoding JavaScript escape sequences."""
+        text = self.text
+        quote = text[pos]
+        pos += 1
+        chunks = []
+        start = pos
+        while pos < self.length:
+            char = text[pos]
+            if char == quote:
+                chunks.append(text[start:pos])
+                value = ''.join(chunks)
+                if quote == '`' and '${' in value:
+                    return JSExpression(text[start - 1:pos + 1]), pos + 1
+                return value, pos + 1
+            if char == '\\':
+                chunks.append(text[start:pos])
+                decoded, pos = self.parse_escape(pos + 1)
+                chunks.append(decoded)
+                start = pos
+                continue
+            pos += 1
+        raise JSLiteralError("Unterminated string literal")
+
+    def parse_escape(self, pos: int) -> Tuple[str, int]:
+        """Decode the escape sequence following a backslash."""
+        if pos >= self.length:
+            raise JSLiteralError("Unterminated escape sequence")
+
+        char = self.text[pos]
+        if char == 'u':
+            if self.text.startswith('{', pos + 1):
+                end = self.text.find('}', pos + 2)
+                if end == -1:
+                    raise JSLiteralError("Invalid unicode escape")
+                return chr(int(self.text[pos + 2:end], 16)), end + 1
+            digits = self.text[pos + 1:pos + 5]
+            try:
+                return chr(int(digits, 16)), pos + 5
+            except ValueError:
+                raise JSLiteralError("Invalid unicode escape")
+        if char == 'x':
+            digits = self.text[pos + 1:pos + 3]
+            try:
+                return chr(int(digits, 16)), pos + 3
+            except ValueError:
+                raise JSLiteralError("Invalid hex escape")
+        if char == '\n':
+            # Line continuation
+            return '', pos + 1
+        return _ESCAPES.get(char, char), pos + 1
+
+    def parse_scalar(self, pos: int) -> Tuple[Any, int]:
+        """Parse a number, keyword or fall back to a raw expression."""
+        match = _NUMBER_RE.match(self.text, pos)
+        if match:
+            literal = match.group(0)
+            if literal.lstrip('+-').lower().startswith('0x'):
+                return int(literal, 16), match.end()
+            number = float(literal)
+            return (int(number) if number.is_integer() and '.' not in literal
+                    and 'e' not in literal.lower() else number), match.end()
+
+        match = _IDENT_RE.match(self.text, pos)
+        if match and match.group(0) in _KEYWORDS:
+            return _KEYWORDS[match.group(0)], match.end()
+
+        end = self.skip_expression(pos)
+        if end == pos:
+            raise JSLiteralError(f"Unexpected character {self.text[pos]!r} at position {pos}")
+        return JSExpression(self.text[pos:end].strip()), end
+
+    def skip_string(self, pos: int) -> int:
+        """Return the position just after the string starting at pos."""
+        text = self.text
+        quote = text[pos]
+        pos += 1
+        while pos < self.length:
+            char = text[pos]
+            if char == '\\':
+                pos += 2
+                continue
+            if char == quote:
+                return pos + 1
+            pos += 1
+        raise JSLiteralError("Unterminated string literal")
+
+    def skip_balanced(self, pos: int) -> int:
+        """Return the position just after the bracket group starting at pos."""
+        stack = [_CLOSERS[self.text[pos]]]
+        pos += 1
+        while pos < self.length and stack:
+            pos = self.skip_space(pos)
+            if pos >= self.length:
+                break
+            char = self.text[pos]
+            if char in '"\'`':
+                pos = self.skip_string(pos)
+                continue
+            if char in _CLOSERS:
+                stack.append(_CLOSERS[char])
+            elif char == stack[-1]:
+                stack.pop()
+            elif char in ')]}':
+                raise JSLiteralError(f"Mismatched {char!r} at position {pos}")
+            pos += 1
+        if stack:
+            raise JSLiteralError("Unbalanced brackets")
+        return pos
+
+    def skip_expression(self, pos: int) -> int:
+        """Skip an arbitrary expression up to the next top-level ',', ';' or closing bracket."""
+        while pos < self.length:
+            pos = self.skip_space(pos)
+            if pos >= self.length:
+                break
+            char = self.text[pos]
+            if char in ',}]);':
+                break
+            if char in '"\'`':
+                pos = self.skip_string(pos)
+            elif char in _CLOSERS:
+                pos = self.skip_balanced(pos)
+            else:
+                pos += 1
+        return pos
+
+
+def parse_js_literal(text: str, start: int = 0) -> Tuple[Any, int]:
+    """Parse the JavaScript literal starting at ``start``.
+
+    Returns the parsed value and the index just past it. Raises
+    JSLiteralError if no literal can be parsed at that position.
+    """
+    return _Parser(text).parse_value(start)
+
+
+def find_literal_end(text: str, start: int) -> int:
+    """Return the index just past the bracketed literal at ``start`` without decoding it."""
+    if start >= len(text) or text[start] not in _CLOSERS:
+        raise JSLiteralError(f"No bracketed literal at position {start}")
+    return _Parser(text).skip_balanced(start)
@@ -0,0 +1,117 @@
+"""
+Linear-time slicing of JSON objects embedded in larger documents.
+
+Large pages often embed a multi-megabyte JSON object of which only one or two
+members are needed. Instead of decoding the whole object (or running
+backtracking regexes over it), the scanner here walks the object once,
+skipping strings and nested values at C speed, and returns the spans of the
+requested top-level members so only those are decoded.
+"""
+import json
+import re
+from typing import Dict, Tuple, Iterable, Any
+
+
+class JSONSliceError(ValueError):
+    """Raised when the text at the given offset is not a well-formed JSON value."""
+
+
+_STRUCTURE_RE = re.compile(r'["{}\[\]]')
+# Unrolled string body: runs of ordinary characters separated by escapes
+_STRING_BODY_RE = re.compile(r'[^"\\]*(?:\\.[^"\\]*)*"', re.DOTALL)
+_COLON_RE = re.compile(r'\s*:\s*')
+_WHITESPACE_RE = re.compile(r'\s*')
+_SCALAR_RE = re.compile(r'[^,}\]\s]+')
+
+
+def _skip_string(text: str, pos: int) -> int:
+    """Return the index just past the string whose opening quote precedes ``pos``."""
+    match = _STRING_BODY_RE.match(text, pos)
+    if not match:
+        raise JSONSliceError(f"Unterminated string at offset {pos - 1}")
+    return match.end()
+
+
+def _skip_container(text: str, start: int) -> int:
+    """Return the index just past the object or array starting at ``start``."""
+    depth = 0
+    pos = start
+    while True:
+        match = _STRUCTURE_RE.search(text, pos)
+        if not match:
+            raise JSONSliceError(f"Unterminated value starting at offset {start}")
+        char = match.group()
+        if char == '"':
+            pos = _skip_string(text, match.end())
+            continue
+        depth += 1 if char in '{[' else -1
+        pos = match.end()
+        if depth == 0:
+            return pos
+
+
+def find_value_end(text: str, start: int) -> int:
+    """Return the index just past the JSON value starting at ``start``."""
+    start = _WHITESPACE_RE.match(text, start).end()
+    if start >= len(text):
+        raise JSONSliceError("Unexpected end of input")
+
+    char = text[start]
+    if char in '{[':
+        return _skip_container(text, start)
+    if char == '"':
+        return _skip_string(text, start + 1)
+
+    match = _SCALAR_RE.match(text, start)
+    if not match:
+        raise JSONSliceError(f"Unexpected character {char!r} at offset {start}")
+    return match.end()
+
+
+def slice_members(text: str, start: int, keys: Iterable[str]) -> Dict[str, Tuple[int, int]]:
+    """Find the ``(start, end)`` spans of top-level members of the object at ``start``.
+
+    The scan stops as soon as every requested key has been found, so members
+    that appear early in a large object are located without reading the rest.
+    """
+    start = _WHITESPACE_RE.match(text, start).end()
+    if not text.startswith('{', start):
+        raise JSONSliceError(f"Expected an object at offset {start}")
+
+    wanted = set(keys)
+    spans: Dict[str, Tuple[int, int]] = {}
+    depth = 0
+    pos = start
+
+    while wanted:
+        match = _STRUCTURE_RE.search(text, pos)
+        if not match:
+            raise JSONSliceError(f"Unterminated object starting at offset {start}")
+        char = match.group()
+
+        if char == '"':
+            pos = _skip_string(text, match.end())
+            colon = _COLON_RE.match(text, pos) if depth == 1 else None
+            if colon:
+                key = json.loads(text[match.start():pos])
+                if key in wanted:
+                    value_end = find_value_end(text, colon.end())
+                    spans[key] = (colon.end(), value_end)
+                    wanted.discard(key)
+                    pos = value_end
+            continue
+
+        depth += 1 if char in '{[' else -1
+        pos = match.end()
+        if depth == 0:
+            break
+
+    return spans
+
+
+def decode_members(text: str, start: int, keys: Iterable[str]) -> Dict[str, Any]:
+    """Decode only the requested top-level members of the object at ``start``."""
+    return {
+        key: json.loads(text[value_start:value_end])
+        for key, (value_start, value_end) in slice_members(text, start, keys).items()
+    }
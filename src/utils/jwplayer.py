@@ -0,0 +1,191 @@
+"""
+Static JWPlayer configuration extraction from plain-HTTP HTML.
+
+Most committee pages embed ``jwplayer(...).setup({...})`` directly in an inline
+script, so the stream URL can be recovered without running a browser.
+"""
+import re
+from typing import Optional, Dict, Any, List, Iterator
+from urllib.parse import urljoin
+
+from src.utils.helpers import WebScraper
+from src.utils.js_literal import parse_js_literal, JSExpression, JSLiteralError
+
+
+# Setup calls: jwplayer("id").setup({ or playerInstance.setup({
+SETUP_CALL_RE = re.compile(r'(?:jwplayer\s*\([^()]*\)|\b[A-Za-z_$][\w$]*)\s*\.\s*setup\s*\(\s*(?=\{)')
+
+# Standalone "sources": [ ... ] or file: "..." entries outside a setup call
+SOURCES_RE = re.compile(r'''["']?sources["']?\s*:\s*(?=\[)''')
+FILE_RE = re.compile(r'''["']?file["']?\s*:\s*(?=["'])''')
+
+# JW Platform hosted playlists (cdn.jwplayer.com/v2/media/<id>)
+JW_PLATFORM_PLAYLIST_RE = re.compile(r'https?://cdn\.jwplayer\.com/v2/(?:media|playlists)/[\w-]+')
+
+STREAM_INDICATORS = (
+    '.mp4', '.m3u8', '.ts', '.aac', '.mp3', '.wav',
+    'manifest', 'playlist', 'stream'
+)
+
+# Preferred source types when a config lists several renditions
+SOURCE_PREFERENCE = ('.m3u8', '.mp3', '.aac', '.m4a', '.mp4')
+
+
+def looks_like_stream_url(text: Any) -> bool:
+    """Check if text looks like a streaming URL."""
+    if not isinstance(text, str) or isinstance(text, JSExpression):
+        return False
+    lowered = text.lower()
+    return any(indicator in lowered for indicator in STREAM_INDICATORS)
+
+
+def find_setup_configs(html: str) -> List[Dict[str, Any]]:
+    """Parse every ``.setup({...})`` config object found in the HTML."""
+    configs = []
+    for match in SETUP_CALL_RE.finditer(html):
+        try:
+            config, _ = parse_js_literal(html, match.end())
+        except JSLiteralError:
+            continue
+        if isinstance(config, dict):
+            configs.append(config)
+    return configs
+
+
+def iter_config_sources(config: Any) -> Iterator[Dict[str, Any]]:
+    """Yield every ``{file, type, label}`` source entry in a JWPlayer config."""
+    if isinstance(config, list):
+        for item in config:
+            yield from iter_config_sources(item)
+        return
+
+    if not isinstance(config, dict):
+        return
+
+    file_url = config.get('file')
+    if isinstance(file_url, str) and not isinstance(file_url, JSExpression):
+        yield {
+            'file': file_url,
+            'type': config.get('type', ''),
+            'label': config.get('label', '')
+        }
+
+    for key in ('sources', 'playlist', 'tracks_audio'):
+        value = config.get(key)
+        if isinstance(value, (list, dict)):
+            yield from iter_config_sources(value)
+
+
+def find_loose_sources(html: str) -> List[Dict[str, Any]]:
+    """Find ``sources: [...]`` and ``file: "..."`` entries outside setup calls."""
+    sources = []
+    for match in SOURCES_RE.finditer(html):
+        try:
+            value, _ = parse_js_literal(html, match.end())
+        except JSLiteralError:
+            continue
+        sources.extend(iter_config_sources(value))
+
+    for match in FILE_RE.finditer(html):
+        try:
+            value, _ = parse_js_literal(html, match.end())
+        except JSLiteralError:
+            continue
+        if isinstance(value, str) and not isinstance(value, JSExpression):
+            sources.append({'file': value, 'type': '', 'label': ''})
+
+    return sources
+
+
+def choose_stream_source(sources: List[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+    """Pick the most useful stream source, preferring HLS and audio renditions."""
+    candidates = [s for s in sources if looks_like_stream_url(s.get('file'))]
+    if not candidates:
+        return None
+
+    def rank(source):
+        url = source['file'].lower()
+        for index, extension in enumerate(SOURCE_PREFERENCE):
+            if extension in url:
+                return index
+        return len(SOURCE_PREFERENCE)
+
+    return min(candidates, key=rank)
+
+
+def extract_stream_from_html(html: str, base_url: str = "") -> Optional[Dict[str, Any]]:
+    """Extract the best JWPlayer stream from page HTML without a browser."""
+    configs = find_setup_configs(html)
+    sources = []
+    for config in configs:
+        sources.extend(iter_config_sources(config))
+
+    method = 'static_setup'
+    if not sources:
+        sources = find_loose_sources(html)
+        method = 'static_sources'
+
+    source = choose_stream_source(sources)
+    if not source:
+        return None
+
+    return {
+        'method': method,
+        'url': urljoin(base_url, source['file']) if base_url else source['file'],
+        'type': source.get('type') or 'unknown',
+        'label': source.get('label', ''),
+        'configs_found': len(configs)
+    }
+
+
+class StaticJWPlayerExtractor(WebScraper):
+    """Extract JWPlayer streams over plain HTTP, without loading a browser."""
+
+    def __init__(self, **kwargs):
+        """Initialize the static extractor."""
+        kwargs.setdefault('delay_range', (0, 1))
+        super().__init__(**kwargs)
+
+    def extract(self, url: str) -> Optional[Dict[str, Any]]:
+        """Fetch a page and extract its JWPlayer stream, or None if not found statically."""
+        response = self.get_page(url, timeout=15)
+        if not response:
+            return None
+
+        html = response.text
+        result = extract_stream_from_html(html, response.url)
+        if result:
+            return result
+
+        # Hosted JW Platform players load their playlist as JSON
+        for playlist_url in dict.fromkeys(JW_PLATFORM_PLAYLIST_RE.findall(html)):
+            result = self.extract_platform_playlist(playlist_url)
+            if result:
+                return result
+
+        return None
+
+    def extract_platform_playlist(self, playlist_url: str) -> Optional[Dict[str, Any]]:
+        """Resolve a JW Platform playlist URL to its best stream source."""
+        response = self.get_page(playlist_url, timeout=15)
+        if not response:
+            return None
+
+        try:
+            data = response.json()
+        except ValueError:
+            return None
+        if not isinstance(data, dict):
+            return None
+
+        source = choose_stream_source(list(iter_config_sources(data.get('playlist', []))))
+        if not source:
+            return None
+
+        return {
+            'method': 'static_platform_playlist',
+            'url': source['file'],
+            'type': source.get('type') or 'unknown',
+            'label': source.get('label', ''),
+            'playlist_url': playlist_url
+        }
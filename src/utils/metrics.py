@@ -0,0 +1,210 @@
+"""
+Lightweight in-process metrics: monotonic-clock spans, counters and histograms.
+
+Stages of a crawl (rate-limit sleep, connect, TLS, time to first byte,
+download, parse, detect, database writes) are timed with ``perf_counter`` and
+aggregated into fixed-bucket histograms keyed by name and labels. A registry
+can be rendered as Prometheus text exposition or flattened into rows for the
+``metrics`` table.
+"""
+import bisect
+import math
+import re
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Any, Iterator, List, Optional, Sequence, Tuple
+
+
+# Seconds; spans from sub-millisecond parses to multi-second downloads
+DEFAULT_BUCKETS: Tuple[float, ...] = (
+    0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0
+)
+
+LabelKey = Tuple[Tuple[str, str], ...]
+
+_METRIC_NAME_RE = re.compile(r'[^a-zA-Z0-9_:]')
+
+
+def _label_key(labels: Dict[str, Any]) -> LabelKey:
+    """Canonical, hashable form of a label set."""
+    return tuple(sorted((key, str(value)) for key, value in labels.items() if value is not None))
+
+
+def _format_labels(key: LabelKey, extra: Optional[Tuple[str, str]] = None) -> str:
+    """Render labels in Prometheus syntax."""
+    pairs = list(key) + ([extra] if extra else [])
+    if not pairs:
+        return ''
+    escaped = (
+        f'{name}="' + value.replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"') + '"'
+        for name, value in pairs
+    )
+    return '{' + ','.join(escaped) + '}'
+
+
+def _format_value(value: float) -> str:
+    """Render a sample value (Prometheus uses +Inf for the last bucket)."""
+    if math.isinf(value):
+        return '+Inf'
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+class Histogram:
+    """Fixed-bucket histogram with count, sum, min and max."""
+
+    __slots__ = ('buckets', 'counts', 'count', 'sum', 'min', 'max')
+
+    def __init__(self, buckets: Sequence[float] = DEFAULT_BUCKETS):
+        """Create an empty histogram with the given upper bounds."""
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)  # last slot is +Inf
+        self.count = 0
+        self.sum = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+
+    def observe(self, value: float):
+        """Record one value."""
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+        if value < self.min:
+            self.min = value
+        if value > self.max:
+            self.max = value
+
+    def cumulative(self) -> List[Tuple[float, int]]:
+        """Return (upper bound, cumulative count) pairs ending with +Inf."""
+        total = 0
+        result = []
+        for bound, count in zip(self.buckets + (math.inf,), self.counts):
+            total += count
+            result.append((bound, total))
+        return result
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Estimate a quantile from the buckets (upper bound of the bucket holding it)."""
+        if not self.count:
+            return None
+        rank = q * self.count
+        for bound, cumulative in self.cumulative():
+            if cumulative >= rank:
+                return min(bound, self.max)
+        return self.max
+
+
+class MetricsRegistry:
+    """Thread-safe collection of histograms and counters."""
+
+    def __init__(self, buckets: Sequence[float] = DEFAULT_BUCKETS):
+        """Create an empty registry."""
+        self.buckets = tuple(buckets)
+        self._histograms: Dict[str, Dict[LabelKey, Histogram]] = {}
+        self._counters: Dict[str, Dict[LabelKey, float]] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, name: str, value: float, **labels):
+        """Record a value (usually seconds) in a histogram."""
+        key = _label_key(labels)
+        with self._lock:
+            series = self._histograms.setdefault(name, {})
+            histogram = series.get(key)
+            if histogram is None:
+                histogram = series[key] = Histogram(self.buckets)
+            histogram.observe(value)
+
+    def inc(self, name: str, amount: float = 1, **labels):
+        """Increase a counter."""
+        key = _label_key(labels)
+        with self._lock:
+            series = self._counters.setdefault(name, {})
+            series[key] = series.get(key, 0) + amount
+
+    @contextmanager
+    def span(self, name: str, **labels) -> Iterator[None]:
+        """Time a block with the monotonic clock and record it, even if it raises."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - start, **labels)
+
+    def histogram(self, name: str, **labels) -> Optional[Histogram]:
+        """Return one histogram series, if it has been observed."""
+        return self._histograms.get(name, {}).get(_label_key(labels))
+
+    def counter(self, name: str, **labels) -> float:
+        """Return one counter value."""
+        return self._counters.get(name, {}).get(_label_key(labels), 0)
+
+    def reset(self):
+        """Drop all recorded values."""
+        with self._lock:
+            self._histograms.clear()
+            self._counters.clear()
+
+    def rows(self) -> List[Dict[str, Any]]:
+        """Flatten every series into plain dicts (for storage or JSON)."""
+        rows = []
+        with self._lock:
+            for name, series in sorted(self._histograms.items()):
+                for key, histogram in sorted(series.items()):
+                    rows.append({
+                        'name': name,
+                        'kind': 'histogram',
+                        'labels': dict(key),
+                        'count': histogram.count,
+                        'sum': histogram.sum,
+                        'min': histogram.min if histogram.count else None,
+                        'max': histogram.max if histogram.count else None,
+                        'buckets': [[None if math.isinf(b) else b, c] for b, c in histogram.cumulative()],
+                    })
+            for name, series in sorted(self._counters.items()):
+                for key, value in sorted(series.items()):
+                    rows.append({
+                        'name': name,
+                        'kind': 'counter',
+                        'labels': dict(key),
+                        'count': None,
+                        'sum': value,
+                        'min': None,
+                        'max': None,
+                        'buckets': None,
+                    })
+        return rows
+
+    def summary(self) -> List[Tuple[str, Dict[str, str], int, float, Optional[float], Optional[float]]]:
+        """(name, labels, count, total seconds, p50, p95) for each histogram, largest total first."""
+        result = []
+        with self._lock:
+            for name, series in self._histograms.items():
+                for key, histogram in series.items():
+                    result.append((name, dict(key), histogram.count, histogram.sum,
+                                   histogram.quantile(0.5), histogram.quantile(0.95)))
+        return sorted(result, key=lambda item: item[3], reverse=True)
+
+    def to_prometheus(self, prefix: str = 'congress_') -> str:
+        """Render all series in the Prometheus text exposition format."""
+        lines = []
+        with self._lock:
+            for name, series in sorted(self._histograms.items()):
+                metric = _METRIC_NAME_RE.sub('_', prefix + name)
+                lines.append(f'# TYPE {metric} histogram')
+                for key, histogram in sorted(series.items()):
+                    for bound, cumulative in histogram.cumulative():
+                        labels = _format_labels(key, ('le', _format_value(bound)))
+                        lines.append(f'{metric}_bucket{labels} {cumulative}')
+                    labels = _format_labels(key)
+                    lines.append(f'{metric}_sum{labels} {_format_value(histogram.sum)}')
+                    lines.append(f'{metric}_count{labels} {histogram.count}')
+            for name, series in sorted(self._counters.items()):
+                metric = _METRIC_NAME_RE.sub('_', prefix + name)
+                lines.append(f'# TYPE {metric} counter')
+                for key, value in sorted(series.items()):
+                    lines.append(f'{metric}{_format_labels(key)} {_format_value(value)}')
+        return '\n'.join(lines) + '\n'
+
+
+# Process-wide default registry shared by scrapers and the database
+METRICS = MetricsRegistry()
@@ -0,0 +1,286 @@
+"""
+One-pass signature engine: all player and stream literals are matched with a
+single trie-shaped regex and the matches turned into typed VideoFormat records.
+"""
+import re
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Sequence, Tuple, Union
+from urllib.parse import urljoin
+
+from src.database.models import VideoFormat
+
+
+Text = Union[str, bytes]
+
+# Characters that end a URL embedded in markup, JSON or JavaScript
+URL_DELIMITERS = ' \t\r\n"\'<>()`'
+
+
+@dataclass(frozen=True)
+class Signature:
+    """A player or stream indicator and the literals that reveal it."""
+    name: str
+    literals: Tuple[str, ...]
+    kind: str = 'player'  # 'player' or 'stream'
+    player_type: str = 'javascript'
+    protocol: str = ''  # streaming protocol of stream indicators
+    id_pattern: str = ''  # regex whose first group is the video id, searched next to a match
+
+
+@dataclass(frozen=True)
+class SignatureMatch:
+    """One occurrence of a signature literal."""
+    signature: Signature
+    literal: str
+    start: int
+    end: int
+
+
+# Priority order: when a text shows several players the first one wins
+VIDEO_SIGNATURES: Tuple[Signature, ...] = (
+    Signature('jwplayer', ('jwplayer', 'jwplatform.com', 'jwpcdn.com'),
+              # Slashes may be JSON-escaped inside setup() calls
+              id_pattern=r'(?:jwplatform|jwplayer)\.com\\?/(?:players|videos|previews|manifests|v2\\?/media)\\?/'
+                         r'([a-z0-9]{8})'),
+    Signature('videojs', ('videojs', 'video-js')),
+    Signature('brightcove', ('brightcove',),
+              id_pattern=r'(?:data-video-id|videoid|video_id)["\'\s:=]+["\']?(\d{6,})'),
+    Signature('kaltura', ('kaltura',),
+              id_pattern=r'entry_?id["\'\s:=/]+["\']?([0-9]_[0-9a-z]{8})'),
+    Signature('wistia', ('wistia',),
+              id_pattern=r'(?:wistia_async_|wistia\.(?:com|net)/(?:embed/)?(?:iframe|medias)/)([0-9a-z]{10})'),
+    Signature('panopto', ('panopto',),
+              id_pattern=r'[?&]id=([0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12})'),
+    Signature('plyr', ('plyr',)),
+    Signature('youtube', ('youtube.com/embed/', 'youtube-nocookie.com/embed/', 'youtube.com/watch?v=', 'youtu.be/'),
+              player_type='embedded',
+              id_pattern=r'(?:youtube(?:-nocookie)?\.com/embed/|youtube\.com/watch\?v=|youtu\.be/)([a-z0-9_-]+)'),
+    Signature('vimeo', ('vimeo.com/video/',), player_type='embedded', id_pattern=r'vimeo\.com/video/(\d+)'),
+    Signature('hls', ('.m3u8',), kind='stream', player_type='stream', protocol='hls'),
+    Signature('dash', ('.mpd',), kind='stream', player_type='stream', protocol='dash'),
+    Signature('rtmp', ('rtmp://', 'rtmps://'), kind='stream', player_type='stream', protocol='rtmp'),
+)
+
+
+def trie_pattern(literals: Iterable[str]) -> str:
+    """Build a regex alternation for literals with common prefixes factored into a trie.
+
+    Branches are greedy, so the longest literal wins where several start at the same place.
+    """
+    trie: Dict[str, dict] = {}
+    for literal in literals:
+        node = trie
+        for char in literal:
+            node = node.setdefault(char, {})
+        node[''] = {}
+
+    def render(node: Dict[str, dict]) -> str:
+        branches = [re.escape(char) + render(node[char]) for char in sorted(key for key in node if key)]
+        optional = '' in node
+        if not branches:
+            return ''
+        if len(branches) == 1 and not optional:
+            return branches[0]
+        body = '(?:' + '|'.join(branches) + ')'
+        return body + '?' if optional else body
+
+    return render(trie)
+
+
+class _Compiled:
+    """Patterns of an engine compiled for one text type (str or bytes)."""
+
+    def __init__(self, source: str, id_patterns: Dict[str, str], encode):
+        self.pattern = re.compile(encode(source))
+        self.ids = {name: re.compile(encode(pattern), re.IGNORECASE) for name, pattern in id_patterns.items()}
+        self.delimiters = [encode(char) for char in URL_DELIMITERS]
+        self.url_rest = re.compile(encode('[^' + re.escape(URL_DELIMITERS) + ']*'))
+
+
+class SignatureEngine:
+    """Scan text or page bytes for all signatures at once and build VideoFormats from the matches.
+
+    Scans of long texts are remembered by content: hearing pages of one site repeat the
+    same inline bundles, which are then hashed instead of scanned again.
+    """
+
+    def __init__(self, signatures: Sequence[Signature] = VIDEO_SIGNATURES, id_window: int = 512,
+                 max_url_length: int = 2048, context_chars: int = 120,
+                 cache_min_length: int = 4096, cache_max_chars: int = 4 * 1024 * 1024):
+        """Compile the signatures; windows bound the text examined around each match.
+
+        Texts of at least cache_min_length characters have their scans cached, keeping
+        at most cache_max_chars characters of cached text (0 disables the cache).
+        """
+        self.signatures = tuple(signatures)
+        self.id_window = id_window
+        self.max_url_length = max_url_length
+        self.context_chars = context_chars
+        self.cache_min_length = cache_min_length
+        self.cache_max_chars = cache_max_chars
+        self._cache: 'OrderedDict[Text, Tuple[Text, Tuple[SignatureMatch, ...]]]' = OrderedDict()
+        self._cache_chars = 0
+        self._cache_lock = threading.Lock()
+
+        # The first signature listing a literal owns it
+        self._owners: Dict[str, Signature] = {}
+        for signature in self.signatures:
+            for literal in signature.literals:
+                self._owners.setdefault(literal.lower(), signature)
+        self._priority = {signature.name: index for index, signature in enumerate(self.signatures)}
+        source = trie_pattern(self._owners)
+
+        id_patterns = {s.name: s.id_pattern for s in self.signatures if s.id_pattern}
+        self._compiled = {
+            str: _Compiled(source, id_patterns, lambda value: value),
+            bytes: _Compiled(source, id_patterns, lambda value: value.encode('ascii')),
+        }
+
+    def _compiled_for(self, text: Text) -> _Compiled:
+        """Patterns matching the text type (str subclasses such as bs4 strings included)."""
+        return self._compiled[bytes if isinstance(text, bytes) else str]
+
+    @staticmethod
+    def _prepare(text: Text) -> Tuple[Text, Text]:
+        """Return the text and its lowercase form with identical offsets."""
+        if isinstance(text, str) and not text.isascii():
+            # Some non-ASCII characters change length when lowercased (and str.lower() takes a
+            # slow path for them); bytes.lower() only touches ASCII
+            text = text.encode('utf-8')
+        return text, text.lower()
+
+    @staticmethod
+    def _decode(value: Text) -> str:
+        return value.decode('utf-8', errors='replace') if isinstance(value, bytes) else value
+
+    def _scan(self, lowered: Text) -> List[SignatureMatch]:
+        owners = self._owners
+        matches = []
+        for match in self._compiled_for(lowered).pattern.finditer(lowered):
+            literal = match.group()
+            if isinstance(literal, bytes):
+                literal = literal.decode('ascii')
+            matches.append(SignatureMatch(owners[literal], literal, match.start(), match.end()))
+        return matches
+
+    def _prepared_scan(self, text: Text) -> Tuple[Text, Sequence[SignatureMatch]]:
+        """Prepared text (see _prepare) and its matches, from the cache for repeated long texts."""
+        size = len(text)
+        cacheable = self.cache_min_length <= size <= self.cache_max_chars
+        if cacheable:
+            with self._cache_lock:
+                cached = self._cache.get(text)
+                if cached is not None:
+                    self._cache.move_to_end(text)
+                    return cached
+
+        prepared, lowered = self._prepare(text)
+        result = (prepared, tuple(self._scan(lowered)))
+        if not cacheable:
+            return result
+
+        # Non-ASCII texts also keep their encoded form
+        cost = size if prepared is text else size + len(prepared)
+        with self._cache_lock:
+            if text not in self._cache:
+                self._cache[text] = result
+                self._cache_chars += cost
+                while self._cache_chars > self.cache_max_chars:
+                    old_text, (old_prepared, _) = self._cache.popitem(last=False)
+                    self._cache_chars -= len(old_text) + (0 if old_prepared is old_text else len(old_prepared))
+        return result
+
+    def scan(self, text: Text) -> List[SignatureMatch]:
+        """Every signature occurrence in a str or bytes text, in one pass."""
+        return list(self._prepared_scan(text)[1])
+
+    def names(self, text: Text) -> List[str]:
+        """Names of the signatures present, in priority order."""
+        found = {match.signature.name for match in self.scan(text)}
+        return [signature.name for signature in self.signatures if signature.name in found]
+
+    def video_id(self, text: Text, match: SignatureMatch) -> str:
+        """Video id next to a player match: after it if possible, otherwise before it."""
+        pattern = self._compiled_for(text).ids.get(match.signature.name)
+        if pattern is None:
+            return ''
+        found = (pattern.search(text, match.start, match.end + self.id_window)
+                 or pattern.search(text, max(0, match.start - self.id_window), match.start))
+        return self._decode(found.group(1)) if found else ''
+
+    def stream_url(self, text: Text, match: SignatureMatch, base_url: str = '') -> str:
+        """Full URL around a stream indicator, unescaped and made absolute."""
+        compiled = self._compiled_for(text)
+        low = max(0, match.start - self.max_url_length)
+        start = max(text.rfind(delimiter, low, match.start) for delimiter in compiled.delimiters) + 1 or low
+        end = compiled.url_rest.match(text, match.end, match.end + self.max_url_length).end()
+        url = self._decode(text[start:end]).replace('\\/', '/').replace('&amp;', '&')
+        if base_url and '://' not in url:
+            url = urljoin(base_url, url)
+        return url
+
+    def context(self, text: Text, match: SignatureMatch) -> str:
+        """Text around a match, kept as the record's embed code."""
+        return self._decode(text[max(0, match.start - self.context_chars):match.end + self.context_chars])
+
+    def describe(self, text: Text, base_url: str = '') -> Dict[str, str]:
+        """Highest-priority player and first stream URL in a text, as detector fields ({} if none)."""
+        text, matches = self._prepared_scan(text)
+        player = stream = None
+        for match in matches:
+            if match.signature.kind == 'stream':
+                stream = stream or match
+            elif player is None or self._priority[match.signature.name] < self._priority[player.signature.name]:
+                player = match
+        if player is None and stream is None:
+            return {}
+
+        primary = player or stream
+        return {
+            'platform': primary.signature.name,
+            'signature': primary.literal,
+            'video_id': self.video_id(text, player) if player else '',
+            'streaming_url': self.stream_url(text, stream, base_url) if stream else '',
+            'streaming_protocol': stream.signature.protocol if stream else '',
+            'player_type': primary.signature.player_type,
+        }
+
+    def video_formats(self, text: Text, base_url: str = '', hearing_id: int = 0) -> List[VideoFormat]:
+        """One VideoFormat per distinct player (and video id) and per distinct stream URL."""
+        text, matches = self._prepared_scan(text)
+        formats: Dict[Tuple[str, str], VideoFormat] = {}
+        for match in matches:
+            signature = match.signature
+            if signature.kind == 'stream':
+                video_id, streaming_url = '', self.stream_url(text, match, base_url)
+                key = (signature.name, streaming_url)
+            else:
+                video_id, streaming_url = self.video_id(text, match), ''
+                key = (signature.name, video_id)
+            if key in formats:
+                continue
+
+            video_format = VideoFormat(
+                hearing_id=hearing_id,
+                platform=signature.name,
+                video_id=video_id,
+                embed_code=self.context(text, match),
+                streaming_url=streaming_url,
+                streaming_protocol=signature.protocol,
+                player_type=signature.player_type
+            )
+            video_format.set_technical_details({'signature': match.literal, 'offset': match.start})
+            formats[key] = video_format
+
+        # A bare mention of a player adds nothing once one of its videos was identified
+        identified = {name for name, video_id in formats if video_id}
+        return [
+            video_format for (name, video_id), video_format in formats.items()
+            if video_id or name not in identified
+        ]
+
+
+# Shared engine over the default signatures
+VIDEO_SIGNATURE_ENGINE = SignatureEngine()
@@ -0,0 +1,212 @@
+"""
+Append-only, gzip-compressed JSON Lines snapshots with a per-section index.
+
+A snapshot file (``*.jsonl.gz``) is a sequence of gzip members, one per
+written section. Every line is ``{"section": ..., "record": {...}}`` so the
+file can be streamed on its own, and a sidecar ``*.idx.json`` records the byte
+offset, length and record count of each member so a reader can jump straight
+to one section (e.g. ``video_formats``) without decompressing the others.
+Legacy ``*.json`` dumps with one list per section are read through the same
+interface.
+"""
+import gzip
+import json
+import os
+import re
+import zlib
+from typing import Dict, Any, Iterable, Iterator, List, Optional, Tuple
+
+
+SNAPSHOT_EXTENSION = '.jsonl.gz'
+INDEX_EXTENSION = '.idx.json'
+INDEX_FORMAT = 'congress-snapshot-v1'
+
+_CHUNK_SIZE = 64 * 1024
+_TIMESTAMP_RE = re.compile(r'(\d{8}_\d{6})')
+
+
+def index_path_for(path: str) -> str:
+    """Return the sidecar index path for a snapshot file."""
+    return path + INDEX_EXTENSION
+
+
+class SnapshotWriter:
+    """Append sections of records to a snapshot file."""
+
+    def __init__(self, path: str, compresslevel: int = 6):
+        """Open (or continue) the snapshot at path."""
+        self.path = path
+        self.compresslevel = compresslevel
+        self.index = self._load_index()
+
+    def _load_index(self) -> Dict[str, Any]:
+        """Load the existing index, or start a new one."""
+        index_path = index_path_for(self.path)
+        if os.path.exists(index_path):
+            with open(index_path, 'r') as f:
+                return json.load(f)
+        return {'format': INDEX_FORMAT, 'sections': {}}
+
+    def _save_index(self):
+        """Write the index atomically."""
+        index_path = index_path_for(self.path)
+        temp_path = index_path + '.tmp'
+        with open(temp_path, 'w') as f:
+            json.dump(self.index, f, indent=2)
+        os.replace(temp_path, index_path)
+
+    def write_section(self, section: str, records: Iterable[Dict[str, Any]]) -> int:
+        """Append records as one gzip member and index it; returns the record count."""
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        count = 0
+        with open(self.path, 'ab') as raw:
+            offset = raw.tell()
+            with gzip.GzipFile(fileobj=raw, mode='wb', compresslevel=self.compresslevel) as member:
+                for record in records:
+                    line = json.dumps({'section': section, 'record': record}, separators=(',', ':'), default=str)
+                    member.write(line.encode('utf-8'))
+                    member.write(b'\n')
+                    count += 1
+            length = raw.tell() - offset
+
+        self.index['sections'].setdefault(section, []).append(
+            {'offset': offset, 'length': length, 'count': count}
+        )
+        self._save_index()
+        return count
+
+
+class SnapshotReader:
+    """Stream records from a snapshot, whole or one section at a time."""
+
+    def __init__(self, path: str):
+        """Open the snapshot at path; the index is optional."""
+        self.path = path
+        index_path = index_path_for(path)
+        self.index: Optional[Dict[str, Any]] = None
+        if os.path.exists(index_path):
+            with open(index_path, 'r') as f:
+                self.index = json.load(f)
+
+    def sections(self) -> Dict[str, int]:
+        """Return record counts per section (scans the file when unindexed)."""
+        if self.index:
+            return {name: sum(m['count'] for m in members)
+                    for name, members in self.index['sections'].items()}
+
+        counts: Dict[str, int] = {}
+        for section, _ in self.iter_records():
+            counts[section] = counts.get(section, 0) + 1
+        return counts
+
+    def count(self, section: str) -> int:
+        """Return the number of records in a section."""
+        return self.sections().get(section, 0)
+
+    def iter_records(self) -> Iterator[Tuple[str, Dict[str, Any]]]:
+        """Stream every (section, record) pair in file order."""
+        with gzip.open(self.path, 'rt', encoding='utf-8') as f:
+            for line in f:
+                if line.strip():
+                    entry = json.loads(line)
+                    yield entry['section'], entry['record']
+
+    def iter_section(self, section: str) -> Iterator[Dict[str, Any]]:
+        """Stream the records of one section, seeking directly to its members when indexed."""
+        if not self.index:
+            for name, record in self.iter_records():
+                if name == section:
+                    yield record
+            return
+
+        with open(self.path, 'rb') as raw:
+            for member in self.index['sections'].get(section, []):
+                raw.seek(member['offset'])
+                for line in self._iter_member_lines(raw, member['length']):
+                    yield json.loads(line)['record']
+
+    @staticmethod
+    def _iter_member_lines(raw, length: int) -> Iterator[bytes]:
+        """Decompress one gzip member chunk by chunk, yielding complete lines."""
+        decompressor = zlib.decompressobj(wbits=31)
+        pending = b''
+        remaining = length
+        while remaining > 0:
+            chunk = raw.read(min(_CHUNK_SIZE, remaining))
+            if not chunk:
+                break
+            remaining -= len(chunk)
+            pending += decompressor.decompress(chunk)
+            *lines, pending = pending.split(b'\n')
+            for line in lines:
+                if line:
+                    yield line
+        pending += decompressor.flush()
+        if pending.strip():
+            yield pending
+
+
+class LegacyJSONSnapshot:
+    """Read a pre-snapshot ``*_data_<ts>.json`` dump through the reader interface."""
+
+    def __init__(self, path: str):
+        """Open a legacy JSON dump (loaded lazily on first use)."""
+        self.path = path
+        self._data: Optional[Dict[str, List[Dict[str, Any]]]] = None
+
+    def _load(self) -> Dict[str, List[Dict[str, Any]]]:
+        """Load the whole JSON document once."""
+        if self._data is None:
+            with open(self.path, 'r') as f:
+                self._data = json.load(f)
+        return self._data
+
+    def sections(self) -> Dict[str, int]:
+        """Return record counts per section."""
+        return {name: len(records) for name, records in self._load().items() if isinstance(records, list)}
+
+    def count(self, section: str) -> int:
+        """Return the number of records in a section."""
+        return len(self._load().get(section, []))
+
+    def iter_records(self) -> Iterator[Tuple[str, Dict[str, Any]]]:
+        """Yield every (section, record) pair."""
+        for name, records in self._load().items():
+            if isinstance(records, list):
+                for record in records:
+                    yield name, record
+
+    def iter_section(self, section: str) -> Iterator[Dict[str, Any]]:
+        """Yield the records of one section."""
+        yield from self._load().get(section, [])
+
+
+def open_snapshot(path: str):
+    """Open a snapshot or legacy JSON dump with the matching reader."""
+    if path.endswith('.json'):
+        return LegacyJSONSnapshot(path)
+    return SnapshotReader(path)
+
+
+def find_snapshots(data_dir: str, prefix: str) -> List[str]:
+    """List snapshot and legacy dump paths for a prefix (e.g. 'house_data_'), oldest first."""
+    if not os.path.isdir(data_dir):
+        return []
+
+    paths = [
+        os.path.join(data_dir, name) for name in os.listdir(data_dir)
+        if name.startswith(prefix) and not name.endswith(INDEX_EXTENSION)
+        and (name.endswith(SNAPSHOT_EXTENSION) or name.endswith('.json'))
+    ]
+
+    def timestamp(path):
+        match = _TIMESTAMP_RE.search(os.path.basename(path))
+        return (match.group(1) if match else '', path.endswith(SNAPSHOT_EXTENSION))
+
+    return sorted(paths, key=timestamp)
+
+
+def latest_snapshot(data_dir: str, prefix: str) -> Optional[str]:
+    """Return the newest snapshot path for a prefix, preferring JSONL over legacy JSON."""
+    paths = find_snapshots(data_dir, prefix)
+    return paths[-1] if paths else None
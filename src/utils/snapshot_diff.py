@@ -0,0 +1,146 @@
+"""
+Streaming diff between two snapshots (or two database states).
+
+Records are keyed by URL and compared by a digest of their content, so memory
+holds one small key-to-digest entry per record plus the records that actually
+changed. Each side is read at most twice, keeping the diff linear in the size
+of the inputs.
+"""
+import hashlib
+import json
+import os
+from typing import Dict, Any, Iterable, Iterator, List, Optional, Callable
+
+from src.database.database import CongressVideoDatabase
+from src.database.models import embed_code_hash
+from src.utils.snapshot import open_snapshot
+
+
+DIFF_SECTIONS = ('committees', 'subcommittees', 'hearings', 'video_formats')
+
+# Fields that differ between runs without the record itself changing
+VOLATILE_FIELDS = frozenset({
+    'id', 'created_at', 'updated_at', 'hearing_id', 'committee_id',
+    'subcommittee_id', 'parent_committee_id', 'embed_code'
+})
+
+
+def _video_format_identity(record: Dict[str, Any]) -> str:
+    """Identify a video format by its stream URL, falling back to video ID or embed hash."""
+    if record.get('streaming_url') or record.get('video_id') or record.get('embed_hash'):
+        return record.get('streaming_url') or record.get('video_id') or record.get('embed_hash')
+    return embed_code_hash(record['embed_code']) if record.get('embed_code') else ''
+
+
+SECTION_KEYS: Dict[str, Callable[[Dict[str, Any]], str]] = {
+    'committees': lambda r: r.get('official_url') or f"{r.get('chamber')}:{r.get('name')}",
+    'subcommittees': lambda r: r.get('official_url') or r.get('name', ''),
+    'hearings': lambda r: r.get('hearing_url') or f"{r.get('title')}@{r.get('hearing_date')}",
+    'video_formats': lambda r: f"{r.get('platform')}|{_video_format_identity(r)}",
+}
+
+
+def normalize_record(section: str, record: Dict[str, Any]) -> Dict[str, Any]:
+    """Return the comparable fields of a record."""
+    normalized = {k: v for k, v in record.items() if k not in VOLATILE_FIELDS}
+    if section == 'video_formats' and record.get('embed_code') and not record.get('embed_hash'):
+        normalized['embed_hash'] = embed_code_hash(record['embed_code'])
+    return normalized
+
+
+def record_digest(section: str, record: Dict[str, Any]) -> bytes:
+    """Digest of a record's comparable content."""
+    payload = json.dumps(normalize_record(section, record), sort_keys=True, default=str)
+    return hashlib.blake2b(payload.encode('utf-8'), digest_size=16).digest()
+
+
+def _keyed(section: str, records: Iterable[Dict[str, Any]]) -> Iterator[tuple]:
+    """Yield (key, record), numbering repeated keys so duplicates stay distinct."""
+    key_for = SECTION_KEYS[section]
+    occurrences: Dict[str, int] = {}
+    for record in records:
+        key = key_for(record)
+        seen = occurrences.get(key, 0)
+        occurrences[key] = seen + 1
+        yield (f"{key}#{seen}" if seen else key), record
+
+
+class SnapshotSource:
+    """One side of a diff: snapshot files (e.g. House + Senate) read as one."""
+
+    def __init__(self, paths: List[str]):
+        """Open the snapshot files."""
+        self.paths = paths
+        self.snapshots = [open_snapshot(path) for path in paths]
+
+    def iter_section(self, section: str) -> Iterator[Dict[str, Any]]:
+        """Stream a section across every file."""
+        for snapshot in self.snapshots:
+            yield from snapshot.iter_section(section)
+
+    def __str__(self):
+        return ', '.join(self.paths)
+
+
+class DatabaseSource:
+    """One side of a diff: the current state of a database file."""
+
+    def __init__(self, db_path: str):
+        """Open the database read-only, so a diff never creates or migrates the file."""
+        if not os.path.exists(db_path):
+            raise FileNotFoundError(f"Database not found: {db_path}")
+
+        self.db_path = db_path
+        self.db = CongressVideoDatabase(db_path, read_only=True)
+
+    def iter_section(self, section: str) -> Iterator[Dict[str, Any]]:
+        """Stream a table's rows."""
+        return self.db.iter_rows(section)
+
+    def __str__(self):
+        return self.db_path
+
+
+def diff_section(old, new, section: str) -> Iterator[Dict[str, Any]]:
+    """Yield added, removed and changed events for one section."""
+    old_digests: Dict[str, bytes] = {
+        key: record_digest(section, record) for key, record in _keyed(section, old.iter_section(section))
+    }
+
+    changed: Dict[str, Dict[str, Any]] = {}
+    for key, record in _keyed(section, new.iter_section(section)):
+        old_digest = old_digests.pop(key, None)
+        if old_digest is None:
+            yield {'op': 'added', 'section': section, 'key': key, 'record': record}
+        elif old_digest != record_digest(section, record):
+            changed[key] = record
+
+    # Whatever was not matched on the new side has been removed
+    removed = old_digests
+    if not removed and not changed:
+        return
+
+    for key, record in _keyed(section, old.iter_section(section)):
+        if key in removed:
+            yield {'op': 'removed', 'section': section, 'key': key, 'record': record}
+        elif key in changed:
+            new_record = changed.pop(key)
+            before = normalize_record(section, record)
+            after = normalize_record(section, new_record)
+            yield {
+                'op': 'changed',
+                'section': section,
+                'key': key,
+                'record': new_record,
+                'changes': {
+                    field: [before.get(field), after.get(field)]
+                    for field in sorted(set(before) | set(after))
+                    if before.get(field) != after.get(field)
+                }
+            }
+
+
+def diff_sources(old, new, sections: Optional[Iterable[str]] = None) -> Iterator[Dict[str, Any]]:
+    """Yield diff events for every section, in section order."""
+    for section in sections or DIFF_SECTIONS:
+        yield from diff_section(old, new, section)
@@ -0,0 +1,90 @@
+"""
+Tests for the read-only query API's hearing date filters.
+"""
+import asyncio
+import sqlite3
+from datetime import datetime
+
+from aiohttp.test_utils import TestClient, TestServer
+
+from src.api.server import IndexQueryAPI
+from src.database.database import CongressVideoDatabase
+from src.database.models import Committee, Hearing, embed_code_hash
+
+
+def build_database(path: str):
+    """A database with hearings on 3, 4 (at 14:00) and 5 July 2025."""
+    db = CongressVideoDatabase(path)
+    committee_id = db.insert_committee(Committee(name='Committee on Oversight', chamber='house',
+                                                 official_url='https://oversight.house.gov'))
+    for title, hearing_date in (('Before', datetime(2025, 7, 3, 10, 0)),
+                                ('Same day', datetime(2025, 7, 4, 14, 0)),
+                                ('After', datetime(2025, 7, 5, 9, 30))):
+        db.insert_hearing(Hearing(committee_id=committee_id, title=title, hearing_date=hearing_date,
+                                  hearing_url=f'https://oversight.house.gov/hearing/{title}', status='completed'))
+
+
+async def hearing_titles(path: str, query: str):
+    """Titles returned by GET /hearings?query."""
+    api = IndexQueryAPI(path)
+    async with TestClient(TestServer(api.create_app())) as client:
+        response = await client.get(f'/hearings?{query}')
+        assert response.status == 200
+        return sorted(hearing['title'] for hearing in await response.json())
+
+
+def test_date_only_end_includes_the_whole_day(tmp_path):
+    path = str(tmp_path / 'index.db')
+    build_database(path)
+    titles = asyncio.run(hearing_titles(path, 'start=2025-07-04&end=2025-07-04'))
+    assert titles == ['Same day']
+
+
+def test_datetime_end_is_inclusive(tmp_path):
+    path = str(tmp_path / 'index.db')
+    build_database(path)
+    assert asyncio.run(hearing_titles(path, 'end=2025-07-04T14:00:00')) == ['Before', 'Same day']
+    assert asyncio.run(hearing_titles(path, 'end=2025-07-04T13:59:59')) == ['Before']
+
+
+def downgrade_to_inline_embed_codes(path: str):
+    """Rebuild video_formats without embed_hash and drop embed_blobs, as before that migration."""
+    conn = sqlite3.connect(path)
+    columns = [row[1] for row in conn.execute('PRAGMA table_info(video_formats)') if row[1] != 'embed_hash']
+    conn.execute(f"CREATE TABLE legacy_formats AS SELECT {', '.join(columns)} FROM video_formats")
+    conn.execute('DROP TABLE video_formats')
+    conn.execute('DROP TABLE embed_blobs')
+    conn.execute('ALTER TABLE legacy_formats RENAME TO video_formats')
+    conn.execute("INSERT INTO video_formats (id, hearing_id, platform, video_id, embed_code, player_type) "
+                 "VALUES (1, 2, 'youtube', 'abc123', '<iframe src=\"https://www.youtube.com/embed/abc123\">', "
+                 "'embedded')")
+    conn.commit()
+    conn.close()
+
+
+async def formats_response(path: str):
+    """Status and body of GET /formats."""
+    api = IndexQueryAPI(path)
+    async with TestClient(TestServer(api.create_app())) as client:
+        response = await client.get('/formats')
+        return response.status, await response.json()
+
+
+def test_read_only_open_of_pre_migration_database(tmp_path):
+    path = str(tmp_path / 'index.db')
+    build_database(path)
+    downgrade_to_inline_embed_codes(path)
+
+    db = CongressVideoDatabase(path, read_only=True)
+    [video_format] = db.get_video_formats()
+    assert video_format.embed_code.startswith('<iframe')
+    assert video_format.embed_hash == embed_code_hash(video_format.embed_code)
+
+    status, body = asyncio.run(formats_response(path))
+    assert status == 200
+    assert [(record['platform'], record['hearing']['title']) for record in body] == [('youtube', 'Same day')]
+
+    # The read-only open left the schema alone
+    conn = sqlite3.connect(path)
+    assert 'embed_hash' not in [row[1] for row in conn.execute('PRAGMA table_info(video_formats)')]
+    conn.close()
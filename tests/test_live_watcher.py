@@ -0,0 +1,114 @@
+"""
+Tests for LiveHearingWatcher body reads against a local aiohttp server.
+"""
+import asyncio
+
+import aiohttp
+from aiohttp import web
+
+from src.monitoring.live_watcher import LiveHearingWatcher, WatchTarget
+
+
+SEGMENTS = 4000
+
+
+def vod_playlist() -> bytes:
+    """A finished HLS media playlist well over one read chunk (~150 KB)."""
+    lines = ['#EXTM3U', '#EXT-X-VERSION:3', '#EXT-X-TARGETDURATION:6']
+    for index in range(SEGMENTS):
+        lines.extend(['#EXTINF:6.000,', f'segment_{index:06d}.ts'])
+    lines.append('#EXT-X-ENDLIST')
+    return ('\n'.join(lines) + '\n').encode('utf-8')
+
+
+async def serve_playlist(request):
+    """Stream the playlist in small writes, so the client never has it all buffered at once."""
+    body = vod_playlist()
+    response = web.StreamResponse(headers={'Content-Type': 'application/vnd.apple.mpegurl'})
+    await response.prepare(request)
+    for offset in range(0, len(body), 8192):
+        await response.write(body[offset:offset + 8192])
+        await asyncio.sleep(0)
+    await response.write_eof()
+    return response
+
+
+async def fetch(path: str, **watcher_options):
+    """Fetch and probe one URL from a throwaway server; returns (body, verdict)."""
+    app = web.Application()
+    app.router.add_get('/vod.m3u8', serve_playlist)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, '127.0.0.1', 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+    url = f'http://127.0.0.1:{port}{path}'
+
+    watcher = LiveHearingWatcher(db=None, **watcher_options)
+    try:
+        async with aiohttp.ClientSession() as session:
+            watcher._session = session
+            _, body = await watcher._fetch(url)
+            verdict, _ = await watcher._probe(url)
+    finally:
+        await runner.cleanup()
+    return body, verdict
+
+
+def test_fetch_reads_body_larger_than_one_chunk():
+    body, verdict = asyncio.run(fetch('/vod.m3u8'))
+    expected = vod_playlist()
+    assert len(expected) > 64 * 1024
+    assert body.encode('utf-8') == expected
+    # The whole playlist, ENDLIST included, shows the hearing has finished
+    assert verdict is False
+
+
+def test_fetch_stops_at_max_body_bytes():
+    body, _ = asyncio.run(fetch('/vod.m3u8', max_body_bytes=100000))
+    assert len(body) == 100000
+    assert '#EXT-X-ENDLIST' not in body
+
+
+def test_unexpected_error_still_reschedules_the_target():
+    async def check():
+        watcher = LiveHearingWatcher(db=None)
+        target = WatchTarget(hearing_id=7, page_url='http://127.0.0.1:1/hearing')
+        watcher.targets[7] = target
+        watcher._in_flight.add(7)
+
+        async def broken_probe(url, depth=0):
+            raise ValueError('malformed player response')
+
+        watcher._probe = broken_probe
+        await watcher._check_target(target, asyncio.Semaphore(1))
+        return watcher, target
+
+    watcher, target = asyncio.run(check())
+    assert 7 not in watcher._in_flight
+    assert [hearing_id for _, hearing_id in watcher._heap] == [7]
+    assert watcher.stats['errors'] == 1 and target.failures == 1
+
+
+def test_validators_are_bounded():
+    async def fetch_many():
+        app = web.Application()
+        app.router.add_get('/{name}.m3u8', serve_playlist)
+        runner = web.AppRunner(app)
+        await runner.setup()
+        site = web.TCPSite(runner, '127.0.0.1', 0)
+        await site.start()
+        port = site._server.sockets[0].getsockname()[1]
+
+        watcher = LiveHearingWatcher(db=None, max_validators=3)
+        try:
+            async with aiohttp.ClientSession() as session:
+                watcher._session = session
+                for index in range(5):
+                    await watcher._fetch(f'http://127.0.0.1:{port}/{index}.m3u8')
+        finally:
+            await runner.cleanup()
+        return watcher
+
+    watcher = asyncio.run(fetch_many())
+    assert [url.rsplit('/', 1)[1] for url in watcher._validators] == ['2.m3u8', '3.m3u8', '4.m3u8']